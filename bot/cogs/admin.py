@@ -2,16 +2,26 @@
 로일(LoIl) - 관리자 Cog v2
 - /봇상태 : 봇 상태 + API 통계
 - /캐시초기화 : API 캐시 삭제
+- /로스터동기화 : 길드 로스터 일괄 갱신 (수요일 자동 갱신 후에도 실행)
+- /api지표 : API 텔레메트리 내보내기 (Prometheus 텍스트)
 ※ /설정확인은 setup.py의 패널 버튼으로 통합 (중복 제거)
 """
 
 import discord
 from discord.ext import commands
 from discord import app_commands
+import io
 import json
 import os
+import time
 from bot.utils.lostark_api import get_api_stats, clear_cache
+from bot.utils.api_metrics import metrics
+from bot.utils.ai_client import ai_client
+from bot.utils.ai_router import ai_router
+from bot.utils.roster import sync_guild_roster
+from bot.utils.permissions import require_admin
 from bot.config.settings import BOT_VERSION
+from bot.config.channels import CH_SETUP, get_channel
 
 SETTINGS_FILE = "bot/data/guild_settings.json"
 
@@ -81,7 +91,17 @@ class AdminCog(commands.Cog, name="AdminCog"):
         )
         embed.add_field(
             name="💾 캐시",
-            value=f"{api_stats['cache_size']}개 항목",
+            value=f"메모리 {api_stats['cache_size']}개 · 디스크 {api_stats['disk_cache_size']}개",
+            inline=True
+        )
+        circuit_label = {
+            "closed":    "🟢 정상",
+            "half_open": "🟡 복구 확인 중",
+            "open":      "🔴 점검/장애 (캐시 사용)",
+        }
+        embed.add_field(
+            name="🛰 로아 API",
+            value=circuit_label.get(api_stats['circuit_state'], api_stats['circuit_state']),
             inline=True
         )
         embed.add_field(
@@ -89,6 +109,53 @@ class AdminCog(commands.Cog, name="AdminCog"):
             value="✅ 연동됨" if sheet_ok else "❌ 미연동",
             inline=True
         )
+
+        m = api_stats['metrics']
+        if m['requests'] or any(m['cache'].values()):
+            errors = sum(n for code, n in m['statuses'].items() if code != 200)
+            budget = " / ".join(str(n) for n in api_stats['key_budget']) or "-"
+            embed.add_field(
+                name="📈 API 지표",
+                value=(
+                    f"요청 {m['requests']}회 · 오류 {errors} · 재시도 {m['retries']}\n"
+                    f"캐시 적중률 {m['cache_hit_ratio'] * 100:.0f}%\n"
+                    f"키별 남은 호출(분) {budget}"
+                ),
+                inline=False
+            )
+            slowest = sorted(m['endpoints'].items(), key=lambda e: e[1]['p95_ms'], reverse=True)[:3]
+            if slowest:
+                embed.add_field(
+                    name="⏱ 느린 엔드포인트 (p50 / p95)",
+                    value="\n".join(
+                        f"`{group}` {s['p50_ms']:.0f} / {s['p95_ms']:.0f}ms ({s['count']}회)"
+                        for group, s in slowest
+                    ),
+                    inline=False
+                )
+        ai_keys = ai_client.stats()["keys"]
+        if ai_keys:
+            embed.add_field(
+                name="🧠 AI 키 사용량",
+                value="\n".join(
+                    f"{'공용' if k['shared'] else '전용'} `{k['key']}` "
+                    f"요청 {k['requests']} · 토큰 ~{k['tokens']:,} · 429 {k['rate_limited']}회 · 남은 분당 {k['remaining']}"
+                    for k in ai_keys
+                ),
+                inline=False
+            )
+        router = ai_router.stats()
+        embed.add_field(
+            name="🔀 AI 제공자",
+            value="\n".join(
+                f"{'🟢' if p['healthy'] else '🔴'} **{p['name']}** "
+                + (f"p50 {p['p50_ms']:,.0f}ms · p95 {p['p95_ms']:,.0f}ms" if p['p50_ms'] is not None
+                   else f"표본 {p['samples']}건")
+                + f" · 성공 {p['successes']} · 실패 {p['errors']}"
+                for p in router["providers"]
+            ) + f"\n헤지 {router['hedged']}회 (헤지 응답 채택 {router['hedge_won']}회)",
+            inline=False
+        )
         embed.set_footer(text="설정 변경은 ⚙️ 로일-설정 채널에서 해주세요")
         await interaction.response.send_message(embed=embed, ephemeral=True)
 
@@ -115,6 +182,105 @@ class AdminCog(commands.Cog, name="AdminCog"):
         if isinstance(error, app_commands.MissingPermissions):
             await interaction.response.send_message("❌ 관리자만 사용 가능합니다.", ephemeral=True)
 
+    # ==================== /api지표 ====================
+
+    @app_commands.command(name="api지표", description="로아 API 지표를 파일로 내보냅니다 (관리자)")
+    async def export_metrics(self, interaction: discord.Interaction):
+        if not await require_admin(interaction): return
+        text = metrics.export_text()
+        file = discord.File(io.BytesIO(text.encode("utf-8")), filename="loil_api_metrics.txt")
+        await interaction.response.send_message("📈 API 지표 (Prometheus 텍스트 포맷)", file=file, ephemeral=True)
+
+    # ==================== 로스터 동기화 ====================
+
+    async def run_roster_sync(self, guild: discord.Guild) -> dict | None:
+        """
+        길드 로스터 동기화 + ⚙│봇설정 채널에 진행 상황 보고
+        진행 메시지는 2초 간격으로만 수정 (Discord 수정 제한)
+        """
+        channel = get_channel(guild, CH_SETUP)
+        msg     = None
+        if channel:
+            try:
+                msg = await channel.send(embed=discord.Embed(
+                    title="🔄 로스터 동기화 중...",
+                    description="연결된 길드원의 원정대를 조회하고 있습니다.",
+                    color=0x5865F2
+                ))
+            except Exception:
+                msg = None
+
+        last_edit = 0.0
+
+        async def progress(stage: str, done: int, total: int):
+            nonlocal last_edit
+            now = time.monotonic()
+            if not msg or (done < total and now - last_edit < 2):
+                return
+            last_edit = now
+            try:
+                await msg.edit(embed=discord.Embed(
+                    title="🔄 로스터 동기화 중...",
+                    description=f"**{stage}** 조회 {done}/{total}",
+                    color=0x5865F2
+                ))
+            except Exception:
+                pass
+
+        try:
+            result = await sync_guild_roster(guild.id, progress=progress)
+        except Exception as e:
+            print(f"[{guild.name}] 로스터 동기화 실패: {e}")
+            if msg:
+                try:
+                    await msg.edit(embed=discord.Embed(
+                        title="❌ 로스터 동기화 실패", description=str(e), color=0xED4245
+                    ))
+                except Exception:
+                    pass
+            return None
+
+        embed = discord.Embed(
+            title="✅ 로스터 동기화 완료",
+            description=(
+                f"길드원 **{result['members']}명** · 캐릭터 **{result['characters']}개**\n"
+                f"신규 {result['inserted']} · 변경 {result['updated']} · "
+                f"유지 {result['unchanged']} · 삭제 {result['removed']}"
+            ),
+            color=0x57F287 if not (result["failed"] or result["stale"]) else 0xFEE75C
+        )
+        if result["failed"]:
+            embed.add_field(
+                name="⚠️ 조회 실패",
+                value=", ".join(result["failed"][:20]),
+                inline=False
+            )
+        if result["stale"]:
+            embed.add_field(
+                name="💾 캐시 데이터 사용 (API 불가)",
+                value=", ".join(result["stale"][:20]),
+                inline=False
+            )
+        if msg:
+            try:
+                await msg.edit(embed=embed)
+            except Exception:
+                pass
+        return result
+
+    @app_commands.command(name="로스터동기화", description="길드원 캐릭터 정보를 일괄 갱신합니다 (관리자)")
+    async def roster_sync_cmd(self, interaction: discord.Interaction):
+        if not await require_admin(interaction): return
+        await interaction.response.defer(ephemeral=True)
+        result = await self.run_roster_sync(interaction.guild)
+        if result is None:
+            await interaction.followup.send("❌ 로스터 동기화에 실패했습니다.", ephemeral=True)
+        else:
+            await interaction.followup.send(
+                f"✅ 캐릭터 {result['characters']}개 동기화 완료 (변경 {result['inserted'] + result['updated']}개)",
+                ephemeral=True
+            )
+
 
 async def setup(bot):
     await bot.add_cog(AdminCog(bot))
\ No newline at end of file
@@ -9,13 +9,18 @@ from discord import app_commands
 import asyncio
 import json
 import os
-import random
 
-from bot.utils.gemini_ai import recommend_party
+from bot.utils.gemini_ai import recommend_party_structured, recommend_parties_structured
 from bot.utils.synergy_ui import SynergyClassSelectView
 from bot.utils.permissions import require_admin, is_admin
 from bot.utils.sheets import get_all_data, get_members, parse_raids, parse_all_raids, save_party_result
 from bot.utils.image_renderer import render_party_result
+from bot.utils.live_message import LiveMessage
+from bot.utils.optimizer_pool import optimizer_pool
+from bot.utils.week_model import WeekModel
+from bot.utils.week_scheduler import week_scheduler
+from bot.utils.clear_stats import clear_stats
+from bot.utils.eligibility import get_min_level, get_eligible_characters, validate_sheet_characters
 from bot.config.settings import GEMINI_API_KEY, RAIDS_DATA
 from bot.config.channels import CH_PARTY, CH_NOTICE, CH_SCHEDULE, CH_SUGGEST, get_channel
 
@@ -59,20 +64,21 @@ def is_support(char_name: str) -> bool:
 # ==================== 레이드 정렬 ====================
 
 CATEGORY_ORDER = {
-    "shadow_raids":  0,
-    "kazeros_raids": 1,
-    "legion_raids":  2,
-    "abyss_raids":   3,
-    "epic_raids":    4,
+    "shadow_raids":   0,
+    "kazeros_raids":  1,
+    "legion_raids":   2,
+    "abyss_dungeons": 3,
+    "epic_raids":     4,
 }
 KAZEROS_ORDER    = ['종막', '4막', '3막', '2막', '1막', '서막']
 LEGION_ORDER     = ['카멘', '일리아칸', '아브렐슈드', '쿠크세이튼', '비아키스', '발탄']
-DIFFICULTY_ORDER = {'nightmare':0,'나이트메어':0,'나메':0,'hard':1,'하드':1,'normal':2,'노말':2}
+DIFFICULTY_ORDER = {'nightmare':0,'나이트메어':0,'나메':0,'hard':1,'하드':1,'normal':2,'노말':2,'solo':3}
 
 def get_raid_sort_key(raid: dict) -> tuple:
+    # category/difficulty/act/raid_name은 sheets.parse_raids가 raid_meta로 채움
     cat        = raid.get('category', '')
-    name       = raid.get('name', '')
-    diff       = raid.get('difficulty', '').lower()
+    name       = raid.get('act') or raid.get('raid_name') or raid.get('name', '')
+    diff       = (raid.get('difficulty') or '').lower()
     cat_order  = CATEGORY_ORDER.get(cat, 99)
     diff_order = DIFFICULTY_ORDER.get(diff, 99)
     if cat == 'kazeros_raids':
@@ -89,24 +95,54 @@ def get_sorted_raids(raids: list) -> list:
 
 # ==================== 파티 편성 로직 ====================
 
-def build_party_groups(members: list, party_size: int = 4) -> list[list]:
-    supports = [m for m in members if m.get('is_support')]
-    dps      = [m for m in members if not m.get('is_support')]
-    parties  = []
-    dps_idx  = 0
-    for supp in supports:
-        party = []
-        while dps_idx < len(dps) and len(party) < party_size - 1:
-            party.append(dps[dps_idx])
-            dps_idx += 1
-        party.append(supp)
-        parties.append(party)
-    remaining = dps[dps_idx:]
-    while remaining:
-        parties.append(remaining[:party_size])
-        remaining = remaining[party_size:]
-    return parties
-
+def _format_synergy_notes(raid_name: str, ai_result, local_result=None) -> str | None:
+    """AI 편성 시너지 메모 → 메시지 본문 (AI 실패 시 로컬 최적화 결과 요약)"""
+    if not ai_result:
+        notes = (local_result or {}).get('notes') or []
+        return (f"⚙️ **{raid_name}** — AI 편성 실패, 시너지 최적화로 편성했습니다.\n"
+                + "\n".join(f"• {n}" for n in notes))[:2000]
+    notes = ai_result.get('synergy_notes') or []
+    if not notes:
+        return None
+    return (f"🤖 **{raid_name}**\n" + "\n".join(f"• {n}" for n in notes))[:2000]
+
+
+def _format_party_preview(preview: dict) -> str:
+    """스트리밍 중인 AI 편성 → 진행 메시지 본문 ({ 레이드명: [[이름, ...]] })"""
+    lines = ["🤖 **AI 파티 편성 중...**"]
+    for raid_name, parties in preview.items():
+        lines.append(f"\n**{raid_name}**")
+        for i, names in enumerate(parties, 1):
+            lines.append(f"{i}파티: {', '.join(names) or '…'}")
+    return "\n".join(lines)
+
+
+
+def _format_unassigned(model: WeekModel, unassigned: dict) -> str | None:
+    """주간 배정에서 빠진 길드원 → 메시지 본문 (레이드별 이름 + 사유)"""
+    lines = []
+    for col, entries in unassigned.items():
+        raid_name = model.raids[col].get('name', '')
+        lines.append(f"**{raid_name}**: " + ", ".join(f"{name}({reason})" for name, reason in entries))
+    if not lines:
+        return None
+    return ("⚠️ **중복 배정 방지로 제외된 길드원**\n" + "\n".join(lines))[:2000]
+
+def _check_levels(guild_id: int, raids: list, members: list) -> str | None:
+    """시트 캐릭터 아이템 레벨 사전 검증 → 경고 메시지 (로스터 동기화 전이면 None)"""
+    lines = []
+    for raid in raids:
+        issues = validate_sheet_characters(
+            guild_id, members, raid.get('raid_name') or raid.get('name', ''),
+            raid.get('difficulty') or "normal", col=raid.get('col'))
+        if issues:
+            lines.append(f"**{raid.get('name', '')}** ({issues[0]['min_level']:,.0f}+): " + ", ".join(
+                f"{i['member']}·{i['job']}({i['item_level']:,.0f})" if i['item_level']
+                else f"{i['member']}·{i['job']}(로스터 없음)"
+                for i in issues))
+    if not lines:
+        return None
+    return ("⚠️ **아이템 레벨 미달 캐릭터** (`/로스터동기화` 기준)\n" + "\n".join(lines))[:2000]
 
 # ==================== 고정 패널 임베드 ====================
 
@@ -157,7 +193,7 @@ class PartyPanelView(discord.ui.View):
             await interaction.followup.send("❌ 시트가 연동되지 않았습니다.", ephemeral=True)
             return
         data  = get_all_data(url)
-        raids = get_sorted_raids(parse_raids(data))
+        raids = get_sorted_raids(parse_raids(data, interaction.guild_id))
         if not raids:
             await interaction.followup.send("❌ 이번 주 예정된 레이드가 없습니다.", ephemeral=True)
             return
@@ -177,7 +213,7 @@ class PartyPanelView(discord.ui.View):
             await interaction.followup.send("❌ 시트가 연동되지 않았습니다.", ephemeral=True)
             return
         data  = get_all_data(url)
-        raids = get_sorted_raids(parse_raids(data))
+        raids = get_sorted_raids(parse_raids(data, interaction.guild_id))
         if not raids:
             await interaction.followup.send("❌ 이번 주 예정된 레이드가 없습니다.", ephemeral=True)
             return
@@ -336,40 +372,57 @@ class RaidChecklistView(discord.ui.View):
             auto_archive_duration=10080,
             type=discord.ChannelType.public_thread
         )
-        await thread.send("🤖 AI 파티 편성 중... 잠시만 기다려주세요!")
+        status = await thread.send("🤖 AI 파티 편성 중... 잠시만 기다려주세요!")
         await interaction.followup.send(f"✅ {thread.mention} 에서 확인하세요!", ephemeral=True)
 
-        all_results = {}
-        members_raw = get_members(self.data)
-
         from bot.utils.member_link import get_absences
-        absences = get_absences(self.guild_id)
-        if absences:
-            members_raw = [m for m in members_raw if m.get('name') not in absences]
+        # 선택한 레이드 전체를 한 번에 배정 (시간 겹침/같은 캐릭터 중복/주간 횟수 제약)
+        model    = WeekModel(selected_raids, get_members(self.data), absences=get_absences(self.guild_id),
+                             durations=clear_stats.expected_durations(self.guild_id, selected_raids))
+        schedule = await asyncio.to_thread(week_scheduler.solve, self.guild_id, model)
 
+        all_results = {}
         for raid in selected_raids:
-            raid_name = raid.get('name', '')
-            col       = raid.get('col')
-            members   = []
-            for m in members_raw:
-                if m.get('absent'):
-                    continue
-                char_info = m['characters'].get(col)
-                if not char_info:
-                    continue
-                members.append({
-                    'name':       m['name'],
-                    'character':  char_info['raw'],
-                    'is_support': char_info['is_support'],
-                })
+            members = schedule['assignments'].get(raid.get('col'), [])
             if not members:
                 continue
-            parties = build_party_groups(members, raid.get('party_size', 4))
-            all_results[raid_name] = {'raid': raid, 'members': members, 'parties': parties}
-
+            all_results[raid.get('name', '')] = {'raid': raid, 'members': members}
+
+        excluded = _format_unassigned(model, schedule['unassigned'])
+        if excluded:
+            await thread.send(excluded)
+        warning = await asyncio.to_thread(_check_levels, self.guild_id, selected_raids, get_members(self.data))
+        if warning:
+            await thread.send(warning)
+
+        # 선택한 레이드 전체를 AI 요청 1회로 (실패 시 레이드별 병렬 요청 → 그래도 실패면 로컬 편성)
+        # 응답은 스트리밍으로 받아 배치되는 대로 진행 메시지에 표시
+        live       = LiveMessage(status, render=_format_party_preview)
+        ai_results = await recommend_parties_structured(
+            [{'raid_name': name, 'members': r['members'], 'party_size': r['raid'].get('party_size', 4)}
+             for name, r in all_results.items()],
+            api_key=get_gemini_key(self.guild_id),
+            guild_id=self.guild_id,
+            on_progress=live.update,
+        )
+        await live.finish(f"✅ 파티 편성 완료 — 레이드 {len(all_results)}개")
+
+        # AI 실패 레이드는 로컬 최적화 (프로세스 풀에서 병렬)
+        failed = [name for name in all_results if not ai_results.get(name)]
+        locals_ = dict(zip(failed, await asyncio.gather(*(
+            optimizer_pool.optimize(self.guild_id, all_results[name]['members'],
+                                    all_results[name]['raid'].get('party_size', 4), owner=thread.id)
+            for name in failed
+        ))))
         for raid_name, result in all_results.items():
+            ai    = ai_results.get(raid_name)
+            local = locals_.get(raid_name)
+            if not ai and local is None:
+                continue
+            result['parties'] = ai['parties'] if ai else local['parties']
             buf      = render_party_result(raid_name, result['parties'])
             img_file = discord.File(fp=buf, filename=f"party_{raid_name}.png")
+            content  = _format_synergy_notes(raid_name, ai, local)
             confirm_view = PartyConfirmView(
                 thread=thread,
                 raid_name=raid_name,
@@ -377,7 +430,7 @@ class RaidChecklistView(discord.ui.View):
                 members=result['members'],
                 guild_id=interaction.guild_id,
             )
-            await thread.send(file=img_file, view=confirm_view)
+            await thread.send(content=content, file=img_file, view=confirm_view)
 
         asyncio.create_task(delete_thread_after(thread, 604800))
 
@@ -442,7 +495,9 @@ class IndividualRaidSelectView(discord.ui.View):
             members.append({
                 'name':       m['name'],
                 'character':  char_info['raw'],
+                'std_job':    char_info.get('std_job'),
                 'is_support': char_info['is_support'],
+                'is_alt':     char_info.get('is_alt', False),
             })
 
         if not members:
@@ -453,20 +508,40 @@ class IndividualRaidSelectView(discord.ui.View):
 
         await interaction.response.defer(ephemeral=True)
 
-        parties  = build_party_groups(members, raid.get('party_size', 4))
-        buf      = render_party_result(raid_name, parties)
-        img_file = discord.File(fp=buf, filename=f"party_{raid_name}.png")
-
         party_ch = get_channel(interaction.guild, CH_PARTY)
         if not party_ch:
             await interaction.followup.send("❌ 레이드편성 채널이 없습니다.", ephemeral=True)
             return
 
+        # 스레드를 먼저 만들고 AI 응답을 스트리밍으로 진행 메시지에 표시
         thread = await party_ch.create_thread(
             name=f"⚔️ {raid_name} 파티 편성",
             auto_archive_duration=10080,
             type=discord.ChannelType.public_thread
         )
+        status = await thread.send("🤖 AI 파티 편성 중... 잠시만 기다려주세요!")
+        await interaction.followup.send(f"✅ {thread.mention} 에서 확인하세요!", ephemeral=True)
+        warning = await asyncio.to_thread(_check_levels, interaction.guild_id, [raid], members_raw)
+        if warning:
+            await thread.send(warning)
+
+        party_size = raid.get('party_size', 4)
+        live       = LiveMessage(status, render=_format_party_preview)
+        ai         = await recommend_party_structured(
+            members, raid_name, party_size,
+            api_key=get_gemini_key(interaction.guild_id), guild_id=interaction.guild_id,
+            on_progress=live.update,
+        )
+        await live.finish("✅ 파티 편성 완료")
+        local    = None if ai else await optimizer_pool.optimize(
+            interaction.guild_id, members, party_size, owner=thread.id)
+        if not ai and local is None:
+            await interaction.followup.send(f"⏹ **{raid_name}** 파티 편성이 취소되었습니다.", ephemeral=True)
+            return
+        parties  = ai['parties'] if ai else local['parties']
+        buf      = render_party_result(raid_name, parties)
+        img_file = discord.File(fp=buf, filename=f"party_{raid_name}.png")
+
         confirm_view = PartyConfirmView(
             thread=thread,
             raid_name=raid_name,
@@ -474,8 +549,7 @@ class IndividualRaidSelectView(discord.ui.View):
             members=members,
             guild_id=interaction.guild_id,
         )
-        await thread.send(file=img_file, view=confirm_view)
-        await interaction.followup.send(f"✅ {thread.mention} 에서 확인하세요!", ephemeral=True)
+        await thread.send(content=_format_synergy_notes(raid_name, ai, local), file=img_file, view=confirm_view)
         asyncio.create_task(delete_thread_after(thread, 604800))
 
 
@@ -489,6 +563,54 @@ class PartyConfirmView(discord.ui.View):
         self.parties   = parties
         self.members   = members
         self.guild_id  = guild_id
+        self.locked: set[int]   = set()   # 재편성 시 고정할 파티 위치
+        self.swap_out: set[str] = set()   # 재편성 시 파티를 옮길 길드원
+        self.history: list      = []      # 지금까지 보여준 편성 (다른 안 요청 시 제외)
+
+        lock_select = discord.ui.Select(
+            placeholder="🔒 고정할 파티 (재편성 시 유지)",
+            options=[discord.SelectOption(label=f"{i}파티", value=str(i - 1)) for i in range(1, len(parties) + 1)][:25],
+            min_values=0,
+            max_values=min(len(parties), 25),
+            custom_id="party_lock",
+            row=1,
+        )
+        lock_select.callback = self._on_lock
+        swap_select = discord.ui.Select(
+            placeholder="🔁 파티를 옮길 길드원",
+            options=[discord.SelectOption(label=m['name'][:100], value=m['name'][:100],
+                                          description=m.get('character', '')[:100] or None)
+                     for m in members][:25],
+            min_values=0,
+            max_values=min(len(members), 25),
+            custom_id="party_swap_out",
+            row=2,
+        )
+        swap_select.callback = self._on_swap_out
+        if parties:
+            self.add_item(lock_select)
+        if members:
+            self.add_item(swap_select)
+
+    async def _on_lock(self, interaction: discord.Interaction):
+        select = discord.utils.get(self.children, custom_id="party_lock")
+        self.locked = {int(v) for v in select.values}
+        await interaction.response.defer()
+
+    async def _on_swap_out(self, interaction: discord.Interaction):
+        select = discord.utils.get(self.children, custom_id="party_swap_out")
+        self.swap_out = set(select.values)
+        await interaction.response.defer()
+
+    def _sync_selects(self):
+        """재전송 시 선택 상태를 드롭다운 기본값으로 표시"""
+        for item in self.children:
+            if getattr(item, 'custom_id', None) == "party_lock":
+                for option in item.options:
+                    option.default = int(option.value) in self.locked
+            elif getattr(item, 'custom_id', None) == "party_swap_out":
+                for option in item.options:
+                    option.default = option.value in self.swap_out
 
     @discord.ui.button(label="✅ 확정 + 시트 저장", style=discord.ButtonStyle.success, custom_id="party_confirm")
     async def confirm(self, interaction: discord.Interaction, button: discord.ui.Button):
@@ -511,23 +633,53 @@ class PartyConfirmView(discord.ui.View):
         except Exception:
             pass
 
-    @discord.ui.button(label="🔄 재편성", style=discord.ButtonStyle.primary, custom_id="party_retry")
-    async def retry(self, interaction: discord.Interaction, button: discord.ui.Button):
-        dps          = [m for m in self.members if not m.get('is_support')]
-        supps        = [m for m in self.members if m.get('is_support')]
-        random.shuffle(dps)
-        party_size   = max(len(self.parties[0]), 4) if self.parties else 4
-        self.parties = build_party_groups(dps + supps, party_size)
-        buf          = render_party_result(self.raid_name, self.parties)
-        img_file     = discord.File(fp=buf, filename=f"party_{self.raid_name}.png")
+    async def _reoptimize(self, interaction: discord.Interaction, diversity: bool):
+        """
+        현재 편성에서 출발해 국소 개선 (고정 파티 유지 / 지정 길드원 이동)
+        diversity=True → 지금까지 보여준 편성을 빼고 가장 좋은 다른 안 (점수가 내려갈 수 있음)
+        """
         await interaction.response.defer()
+        party_size = max(len(self.parties[0]), 4) if self.parties else 4
+        result = await optimizer_pool.reoptimize(
+            self.guild_id, self.members, self.parties, party_size, owner=self.thread.id,
+            locked=self.locked, swap_out=self.swap_out,
+            exclude=self.history if diversity else (), diversity=diversity,
+        )
+        if result is None:
+            await interaction.followup.send("⏹ 편성 작업이 취소되었습니다.", ephemeral=True)
+            return
+        self.swap_out = set()
+        self._sync_selects()
+
+        if not result['changed']:
+            await interaction.followup.send(
+                "ℹ️ 조건을 지키는 다른 편성이 없습니다." if diversity
+                else "ℹ️ 조건을 지키면서 더 나은 편성이 없습니다.", ephemeral=True)
+            return
+        self.history.append(self.parties)
+        self.parties = result['parties']
+        content = (f"🔄 **{self.raid_name}** 재편성 — 점수 {result['previous_score']} → {result['score']}\n"
+                   + "\n".join(f"• {n}" for n in result['notes']))[:2000]
+        buf      = render_party_result(self.raid_name, self.parties)
+        img_file = discord.File(fp=buf, filename=f"party_{self.raid_name}.png")
         await interaction.message.delete()
-        await interaction.channel.send(file=img_file, view=self)
+        await interaction.channel.send(content=content, file=img_file, view=self)
+
+    @discord.ui.button(label="🔄 재편성", style=discord.ButtonStyle.primary, custom_id="party_retry")
+    async def retry(self, interaction: discord.Interaction, button: discord.ui.Button):
+        # 점수가 내려가지 않는 개선만 (조건이 없고 개선도 없으면 그대로)
+        await self._reoptimize(interaction, diversity=False)
+
+    @discord.ui.button(label="🎲 다른 안", style=discord.ButtonStyle.secondary, custom_id="party_alternative")
+    async def alternative(self, interaction: discord.Interaction, button: discord.ui.Button):
+        # 지금까지 보여준 편성을 빼고 가장 좋은 안
+        await self._reoptimize(interaction, diversity=True)
 
     @discord.ui.button(label="🗑 삭제", style=discord.ButtonStyle.danger, custom_id="party_delete")
     async def delete(self, interaction: discord.Interaction, button: discord.ui.Button):
         if not await require_admin(interaction): return
         await interaction.response.send_message("🗑 삭제합니다...")
+        optimizer_pool.cancel(self.thread.id)
         try:
             await self.thread.delete()
         except Exception:
@@ -541,6 +693,16 @@ class PartyCog(commands.Cog, name="PartyCog"):
     def __init__(self, bot):
         self.bot = bot
         self.panel_messages: dict[int, int] = {}
+        self._warmup: asyncio.Task | None = None
+
+    async def cog_load(self):
+        # 태스크 참조 유지 (가비지 컬렉션으로 워밍업이 사라지지 않게)
+        self._warmup = asyncio.create_task(optimizer_pool.start())
+
+    async def cog_unload(self):
+        if self._warmup:
+            self._warmup.cancel()
+        optimizer_pool.shutdown()
 
     async def send_party_panel(self, channel: discord.TextChannel):
         embed = build_party_panel_embed()
@@ -596,6 +758,46 @@ class PartyCog(commands.Cog, name="PartyCog"):
         )
         await interaction.response.send_message(embed=embed, view=SynergyClassSelectView(), ephemeral=True)
 
+    @app_commands.command(name="참여가능", description="레이드에 갈 수 있는 길드원 캐릭터를 확인합니다")
+    @app_commands.describe(레이드="레이드 이름 (예: 카멘, 에기르)", 난이도="난이도")
+    @app_commands.choices(난이도=[
+        app_commands.Choice(name="나이트메어", value="nightmare"),
+        app_commands.Choice(name="하드",       value="hard"),
+        app_commands.Choice(name="노말",       value="normal"),
+        app_commands.Choice(name="싱글",       value="solo"),
+    ])
+    async def eligible_cmd(self, interaction: discord.Interaction, 레이드: str,
+                           난이도: app_commands.Choice[str]):
+        min_level = get_min_level(레이드, 난이도.value)
+        if min_level is None:
+            await interaction.response.send_message(
+                f"❌ **{레이드} {난이도.name}** 레이드 정보를 찾을 수 없습니다.", ephemeral=True)
+            return
+
+        by_owner = await asyncio.to_thread(
+            get_eligible_characters, interaction.guild.id, 레이드, 난이도.value)
+        if not by_owner:
+            await interaction.response.send_message(
+                f"📭 {min_level:,.0f} 이상 캐릭터가 없습니다. `/로스터동기화` 후 다시 시도해주세요.",
+                ephemeral=True)
+            return
+
+        lines = []
+        for owner, roles in sorted(by_owner.items()):
+            parts = [f"🛡 {c['name']}({c['item_level']:,.0f})" for c in roles["support"]]
+            parts += [f"⚔ {c['name']}({c['item_level']:,.0f})" for c in roles["dps"]]
+            lines.append(f"**{owner}** — " + ", ".join(parts))
+
+        supports = sum(len(r["support"]) for r in by_owner.values())
+        dps      = sum(len(r["dps"]) for r in by_owner.values())
+        embed = discord.Embed(
+            title=f"✅ {레이드} {난이도.name} 참여 가능 ({min_level:,.0f}+)",
+            description="\n".join(lines)[:4000],
+            color=0x57F287
+        )
+        embed.set_footer(text=f"길드원 {len(by_owner)}명 · 서폿 가능 {supports} · 딜러 {dps}")
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
 
 async def setup(bot):
     cog = PartyCog(bot)
@@ -6,7 +6,7 @@
 - 레이드 추가 (Modal)
 - 레이드 수정 (Select → Modal)
 - 레이드 삭제 (Select → 확인)
-- 클리어 처리 (Select)
+- 시작 / 클리어 처리 (Select) → 클리어 타임 기록
 - 시트 → 봇 새로고침
 """
 
@@ -16,10 +16,11 @@ from discord import app_commands
 import json, os
 
 from bot.utils.sheets import (
-    get_all_data, parse_all_raids,
+    get_all_data, parse_all_raids, get_members,
     add_raid, update_raid, delete_raid,
     set_scheduled, set_cleared
 )
+from bot.utils.clear_stats import clear_stats
 from bot.utils.permissions import require_admin
 from bot.config.channels import CH_PARTY, get_channel
 
@@ -33,6 +34,21 @@ def get_sheet_url(guild_id: int) -> str:
         return ""
 
 
+def get_raid_members(url: str, col: int) -> list[dict]:
+    """레이드 열 참여 길드원 (불참 제외) - 클리어 타임 구성 기록용"""
+    members = []
+    for m in get_members(get_all_data(url)):
+        char = m['characters'].get(col)
+        if char and not m['absent']:
+            members.append({'name': m['name'], 'std_job': char['std_job'], 'is_support': char['is_support']})
+    return members
+
+
+def _format_minutes(minutes: float) -> str:
+    minutes = round(minutes)
+    return f"{minutes // 60}시간 {minutes % 60}분" if minutes >= 60 else f"{minutes}분"
+
+
 # ==================== 요일 선택 ====================
 
 DAYS = ['수', '목', '금', '토', '일', '월', '화']
@@ -219,7 +235,7 @@ class EditRaidModal(discord.ui.Modal, title="레이드 수정"):
 class RaidSelectForAction(discord.ui.Select):
     def __init__(self, raids: list, action: str, url: str):
         self.raids  = raids
-        self.action = action  # "edit" | "delete" | "clear" | "toggle"
+        self.action = action  # "edit" | "delete" | "start" | "clear" | "toggle"
         self.url    = url
 
         options = [
@@ -247,16 +263,30 @@ class RaidSelectForAction(discord.ui.Select):
                 ephemeral=True
             )
 
+        elif self.action == "start":
+            await interaction.response.defer(ephemeral=True)
+            members = get_raid_members(self.url, raid['col'])
+            clear_stats.start_run(interaction.guild_id, raid, members)
+            await interaction.followup.send(
+                f"⏱ **{raid['name']}** 시작 기록! ({len(members)}명) 클리어 시 소요 시간이 기록됩니다.", ephemeral=True
+            )
+
         elif self.action == "clear":
             await interaction.response.defer(ephemeral=True)
             ok = set_cleared(self.url, raid['col'], True)
             if ok:
+                run = clear_stats.finish_run(interaction.guild_id, raid, get_raid_members(self.url, raid['col']))
                 schedule_cog = interaction.client.cogs.get("ScheduleCog")
                 if schedule_cog:
-                    await schedule_cog.update_weekly_channel(interaction.guild)
-                await interaction.followup.send(
-                    f"✅ **{raid['name']}** 클리어 처리되었습니다!", ephemeral=True
-                )
+                    await schedule_cog.update_weekly_channel(interaction.guild, record=True)
+                text = f"✅ **{raid['name']}** 클리어 처리되었습니다!"
+                if run['minutes'] is not None:
+                    text += f"\n⏱ 소요 {_format_minutes(run['minutes'])}" + (" (예정 시각 기준)" if run['estimated'] else "")
+                if run['raid']:
+                    s = run['raid']
+                    text += (f"\n📊 평균 {_format_minutes(s['mean'])} · 중앙 {_format_minutes(s['p50'])}"
+                             f" · 90%가 {_format_minutes(s['p90'])} 이내 ({s['count']}회)")
+                await interaction.followup.send(text, ephemeral=True)
             else:
                 await interaction.followup.send("❌ 처리에 실패했습니다.", ephemeral=True)
 
@@ -360,6 +390,14 @@ class RaidManageCog(commands.Cog, name="RaidManageCog"):
         view = RaidActionView(raids=raids, action="delete", url=url)
         await interaction.response.send_message("삭제할 레이드를 선택하세요:", view=view, ephemeral=True)
 
+    @app_commands.command(name="레이드시작", description="레이드 시작 시각을 기록합니다 (관리자)")
+    async def start_raid_cmd(self, interaction: discord.Interaction):
+        if not await require_admin(interaction): return
+        url, raids = await self._get_raids_or_error(interaction)
+        if not raids: return
+        view = RaidActionView(raids=raids, action="start", url=url)
+        await interaction.response.send_message("시작할 레이드를 선택하세요:", view=view, ephemeral=True)
+
     @app_commands.command(name="레이드클리어", description="레이드 클리어 처리합니다 (관리자)")
     async def clear_raid_cmd(self, interaction: discord.Interaction):
         if not await require_admin(interaction): return
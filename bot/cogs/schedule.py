@@ -3,6 +3,9 @@
 이미지 렌더러(image_renderer.py) 적용
 - 이번주-레이드: 이미지 전송
 - 개인 일정: 이미지 전송 (스타일 D 다크카드)
+- 주간 골드: 이번주-레이드 이미지 합계 + /골드 길드원별 임베드
+- 참여 기록: 주간 자동 갱신 / 클리어 처리 때만 주차별 스냅샷 (조회는 기록하지 않음) + /통계
+- 클리어 타임: 이미지에 실측 중앙값, /통계에 레이드별 평균/p50/p90
 """
 
 import discord
@@ -20,10 +23,18 @@ from bot.utils.sheets import (
     find_user_row,
 )
 from bot.utils.image_renderer import render_my_schedule, render_weekly_raids
+from bot.utils.week_model import WeekModel
+from bot.config.settings import WEEKLY_CHARACTER_RAID_LIMIT, HISTORY_DEFAULT_WEEKS
+from bot.utils.gold import get_gold_ledger
+from bot.utils.history import history_store
+from bot.utils.raid_meta import find_raid
+from bot.utils.clear_stats import clear_stats
 
 # ==================== 설정 ====================
 
 SETTINGS_FILE = "bot/data/guild_settings.json"
+GOLD_EMBED_MEMBERS = 20   # /골드 임베드에 표시할 길드원 수 (설명 4096자 제한)
+STATS_EMBED_ROWS   = 10   # /통계 필드별 표시 줄 수 (필드 1024자 제한)
 
 def get_sheet_url(guild_id: int) -> Optional[str]:
     if not os.path.exists(SETTINGS_FILE):
@@ -34,6 +45,38 @@ def get_sheet_url(guild_id: int) -> Optional[str]:
     except Exception:
         return None
 
+def get_weekly_gold(data: list, guild_id: int, summary: list, record: bool = False) -> dict:
+    """
+    이번 주 예정 레이드 기준 골드 요약 (길드 장부는 바뀐 셀만 재계산)
+
+    Args:
+        record: 같은 모델을 참여 기록에 스냅샷 (주간 자동 갱신 / 클리어 처리에서만)
+    """
+    model = WeekModel.from_sheet(data, guild_id, cols=[r['col'] for r in summary])
+    if record:
+        try:
+            history_store.snapshot(guild_id, model)
+        except Exception as e:
+            print(f"[schedule] 참여 기록 저장 실패: {e}")
+    return get_gold_ledger(guild_id, model).summary()
+
+def load_weekly(url: str, guild_id: int, record: bool = False) -> Optional[tuple[list, dict, dict]]:
+    """
+    시트 읽기 → (주간 요약, 골드 요약, 클리어 타임) - 시트 API / SQLite 블로킹 → asyncio.to_thread로 호출
+    시트를 읽지 못하면 None
+    """
+    data = get_all_data(url)
+    if not data:
+        return None
+    summary = get_weekly_summary(data, guild_id)
+    return summary, get_weekly_gold(data, guild_id, summary, record), clear_stats.raid_stats(guild_id, summary)
+
+def _raid_label(key: str, difficulty: Optional[str]) -> str:
+    """레이드 키 → 표시 이름 ("카멘 (hard)")"""
+    info = find_raid(key)
+    name = info['name'] if info else key
+    return f"{name} ({difficulty})" if difficulty else name
+
 async def delete_thread_after(thread: discord.Thread, seconds: int):
     await asyncio.sleep(seconds)
     try:
@@ -70,11 +113,13 @@ class WeeklyView(discord.ui.View):
             await interaction.followup.send("❌ 시트가 연동되지 않았습니다.", ephemeral=True)
             return
 
-        data    = get_all_data(url)
-        summary = get_weekly_summary(data)
+        weekly = await asyncio.to_thread(load_weekly, url, interaction.guild_id)
+        if not weekly:
+            await interaction.followup.send("❌ 시트를 읽을 수 없습니다.", ephemeral=True)
+            return
 
         # 이미지 생성
-        buf = render_weekly_raids(summary)
+        buf      = render_weekly_raids(*weekly)
         img_file = discord.File(fp=buf, filename="weekly.png")
 
         # 기존 메시지 이미지 교체 (새 메시지로 전송 후 기존 삭제)
@@ -154,18 +199,22 @@ class ScheduleCog(commands.Cog, name="ScheduleCog"):
         self.bot = bot
         self.weekly_messages: dict[int, int] = {}
 
-    async def update_weekly_channel(self, guild: discord.Guild) -> bool:
-        """이번주-레이드 채널 이미지 갱신"""
+    async def update_weekly_channel(self, guild: discord.Guild, record: bool = False) -> bool:
+        """
+        이번주-레이드 채널 이미지 갱신
+
+        Args:
+            record: 참여 기록 스냅샷 (주간 자동 갱신 / 클리어 처리)
+        """
         url = get_sheet_url(guild.id)
         if not url:
             return False
 
-        data = get_all_data(url)
-        if not data:
+        weekly = await asyncio.to_thread(load_weekly, url, guild.id, record)
+        if not weekly:
             return False
 
-        summary  = get_weekly_summary(data)
-        buf      = render_weekly_raids(summary)
+        buf      = render_weekly_raids(*weekly)
         img_file = discord.File(fp=buf, filename="weekly.png")
         view     = WeeklyView()
 
@@ -216,6 +265,94 @@ class ScheduleCog(commands.Cog, name="ScheduleCog"):
                 ephemeral=True
             )
 
+    # ── /골드 ──
+
+    @app_commands.command(name="골드", description="이번 주 길드원별 예상/획득 골드를 보여줍니다")
+    async def show_gold(self, interaction: discord.Interaction):
+        await interaction.response.defer(thinking=True, ephemeral=True)
+        url    = get_sheet_url(interaction.guild_id)
+        weekly = await asyncio.to_thread(load_weekly, url, interaction.guild_id) if url else None
+        if not weekly:
+            await interaction.followup.send("❌ 시트 연동 필요", ephemeral=True)
+            return
+
+        _, gold, _ = weekly
+
+        lines = []
+        for m in gold['members'][:GOLD_EMBED_MEMBERS]:
+            chars = "  ".join(
+                f"{'부' if ch['is_alt'] else '본'}·{ch['std_job'] or '?'} {ch['expected']:,}G"
+                for ch in m['characters'] if ch['expected']
+            )
+            lines.append(f"**{m['name']}** {m['expected']:,}G (획득 {m['earned']:,}G)\n└ {chars or '-'}")
+        if len(gold['members']) > GOLD_EMBED_MEMBERS:
+            lines.append(f"외 {len(gold['members']) - GOLD_EMBED_MEMBERS}명")
+
+        embed = discord.Embed(
+            title="💰 이번 주 골드",
+            description="\n".join(lines) or "이번 주 예정된 골드 레이드가 없습니다.",
+            color=0xFFD700
+        )
+        embed.add_field(name="길드 예상", value=f"{gold['expected']:,}G", inline=True)
+        embed.add_field(name="길드 획득", value=f"{gold['earned']:,}G", inline=True)
+        embed.set_footer(text=f"캐릭터당 주 {WEEKLY_CHARACTER_RAID_LIMIT}개 레이드 · 같은 레이드는 난이도 무관 1회 · "
+                              "관문별 골드, 더보기(셀 끝 +) 비용 차감")
+        await interaction.followup.send(embed=embed, ephemeral=True)
+
+    # ── /통계 ──
+
+    @app_commands.command(name="통계", description="최근 레이드 참여 기록 통계를 보여줍니다")
+    @app_commands.describe(weeks="조회 기간 (주, 기본 12)")
+    async def show_stats(self, interaction: discord.Interaction, weeks: app_commands.Range[int, 1, 52] = HISTORY_DEFAULT_WEEKS):
+        await interaction.response.defer(thinking=True, ephemeral=True)
+        gid        = interaction.guild_id
+        attendance = await asyncio.to_thread(history_store.attendance, gid, weeks)
+        clears     = await asyncio.to_thread(history_store.raid_clears, gid, weeks)
+        roles      = await asyncio.to_thread(history_store.role_share, gid, weeks)
+        times      = await asyncio.to_thread(clear_stats.scope_stats, gid)
+        if not attendance:
+            await interaction.followup.send("📭 아직 저장된 참여 기록이 없습니다.", ephemeral=True)
+            return
+
+        embed = discord.Embed(
+            title=f"📈 최근 {weeks}주 레이드 통계",
+            description=f"기록된 주: {attendance[0]['weeks']}주",
+            color=0x9B59B6
+        )
+        embed.add_field(
+            name="출석률",
+            value="\n".join(
+                f"**{r['member']}** {r['rate'] * 100:.0f}% ({r['attended']}/{r['weeks']}주 · 클리어 {r['clears']})"
+                for r in attendance[:STATS_EMBED_ROWS]
+            ),
+            inline=False
+        )
+        embed.add_field(
+            name="레이드별 클리어",
+            value="\n".join(
+                f"**{_raid_label(r['raid_key'], r['difficulty'])}** "
+                f"{r['cleared_runs']}/{r['runs']}회 · 참여 {r['clears']}건"
+                for r in clears[:STATS_EMBED_ROWS]
+            ) or "-",
+            inline=False
+        )
+        embed.add_field(
+            name="역할 비율",
+            value=f"💚 서폿 {roles['support']}건 · ⚔️ 딜러 {roles['dps']}건 (서폿 {roles['support_share'] * 100:.0f}%)",
+            inline=False
+        )
+        if times:
+            embed.add_field(
+                name="클리어 타임 (분, 전체 기간)",
+                value="\n".join(
+                    f"**{_raid_label(*r['scope'].split(':', 1))}** 평균 {r['mean']:.0f} · "
+                    f"p50 {r['p50']:.0f} · p90 {r['p90']:.0f} ({r['count']}회)"
+                    for r in times[:STATS_EMBED_ROWS]
+                ),
+                inline=False
+            )
+        await interaction.followup.send(embed=embed, ephemeral=True)
+
     # ── /이번주갱신 (관리자) ──
 
     @app_commands.command(name="이번주갱신", description="이번주-레이드 채널을 수동 갱신합니다 (관리자)")
@@ -37,11 +37,14 @@ GUILD_ALIASES_JSON    = DATA_DIR / 'guild_aliases.json'  # 봇이 자동 생성
 
 # ── 런타임 데이터 ──
 GUILD_SETTINGS_JSON   = DATA_DIR / 'guild_settings.json'
+ROSTER_DB             = DATA_DIR / 'roster.sqlite3'      # 길드 로스터 (봇이 자동 생성)
+HISTORY_DB            = DATA_DIR / 'history.sqlite3'     # 주차별 레이드 참여 기록 (봇이 자동 생성)
 
 # ==================== API Keys ====================
 
 DISCORD_BOT_TOKEN      = os.getenv('DISCORD_BOT_TOKEN')
 GEMINI_API_KEY         = os.getenv('GEMINI_API_KEY')
+GROQ_API_KEY           = os.getenv('GROQ_API_KEY')   # 백업 AI
 
 LOSTARK_API_KEYS_RAW   = os.getenv('LOSTARK_API_KEYS', '')
 LOSTARK_API_KEYS       = [k.strip() for k in LOSTARK_API_KEYS_RAW.split(',') if k.strip()]
@@ -87,8 +90,85 @@ LOSTARK_API_BASE_URL    = 'https://developer-lostark.game.onstove.com'
 LOSTARK_API_RATE_LIMIT  = 100
 LOSTARK_API_CACHE_MINUTES = 5
 
+# ── 디스크 캐시 (SQLite, 재시작 후에도 유지) ──
+LOSTARK_API_CACHE_DB                = CACHE_DIR / 'lostark_api.sqlite3'
+LOSTARK_API_STALE_MINUTES           = 30  # 신선 기간 이후 이 시간까지는 즉시 반환 + 백그라운드 갱신
+LOSTARK_API_MAINTENANCE_STALE_HOURS = 72  # 점검(503) 중에는 이 시간 이내 캐시를 대신 반환
+
+# ── 네거티브 캐시 (없는 캐릭터 / 빈 응답) ──
+LOSTARK_API_NOT_FOUND_TTL_MINUTES = 10
+LOSTARK_API_EMPTY_TTL_MINUTES     = 2
+
+# ── 재시도 / 서킷 브레이커 ──
+LOSTARK_API_MAX_RETRIES       = 3    # 429/5xx/타임아웃 재시도 횟수
+LOSTARK_API_BACKOFF_BASE      = 0.5  # 지수 백오프 시작값(초)
+LOSTARK_API_BACKOFF_MAX       = 4    # 백오프 최대값(초)
+LOSTARK_API_CIRCUIT_THRESHOLD = 5    # 연속 실패 N회 → 서킷 오픈
+LOSTARK_API_CIRCUIT_COOLDOWN  = 60   # 서킷 오픈 유지 시간(초) 후 프로브 1건 허용
+
+ROSTER_SYNC_CONCURRENCY = 4  # 로스터 동기화 동시 요청 수 (키 예산은 APIKeyManager가 별도 관리)
+
+# ── 주간 로스터 동기화 (정기 점검 이후) ──
+ROSTER_SYNC_WEEKDAY       = 2    # 수요일
+ROSTER_SYNC_HOUR          = 10   # 정기 점검(06:00~10:00 KST) 이후 시작 시각
+ROSTER_SYNC_RETRY_MINUTES = 30   # 실패한 길드 재시도 간격 (분) - 점검 연장 대비
+ROSTER_SYNC_MAX_ATTEMPTS  = 4    # 길드별 주간 최대 시도 횟수
+ROSTER_SYNC_GUILDS        = 2    # 동시에 동기화할 길드 수
+
 GEMINI_MODEL      = 'gemini-2.0-flash'
 GEMINI_MAX_TOKENS = 1000
+GEMINI_PROMPT_TOKEN_BUDGET = GEMINI_MAX_TOKENS * 2  # 프롬프트 컨텍스트 상한 (응답 토큰의 2배)
+GEMINI_BATCH_MAX_TOKENS    = 8000  # 여러 레이드 일괄 추천 응답 토큰 상한
+GEMINI_CONCURRENCY         = 4   # 전체 동시 AI 요청 수
+GEMINI_GUILD_CONCURRENCY   = 2   # 길드당 동시 AI 요청 수
+GEMINI_TIMEOUT             = 30  # AI 요청 타임아웃(초)
+GEMINI_KEY_RPM             = 15  # 키당 분당 요청 수 (무료 티어 기준)
+GEMINI_SHARED_GUILD_RPM    = 5   # 공용 키를 쓰는 길드당 분당 요청 수
+GEMINI_QUEUE_TIMEOUT       = 90  # 키 예산 대기 최대 시간(초)
+GEMINI_RATE_LIMIT_COOLDOWN = 20  # 429 수신 시 해당 키 사용 중지 시간(초)
+AI_STREAM_EDIT_INTERVAL    = 1.2  # 스트리밍 응답 메시지 수정 간격(초) - 디스코드 수정 한도(5초 5회) 이내
+
+# ── AI 제공자 라우팅 (Gemini 메인 / Groq 백업) ──
+GROQ_MODEL       = os.getenv('GROQ_MODEL', 'llama-3.3-70b-versatile')
+GROQ_CONCURRENCY = 4
+# 로컬 대역 서버 (오프라인 테스트용, 비우면 실제 API)
+GEMINI_API_ENDPOINT = os.getenv('GEMINI_API_ENDPOINT')  # gRPC host:port
+GROQ_BASE_URL       = os.getenv('GROQ_BASE_URL')        # OpenAI 호환 서버 (/openai/v1/chat/completions)
+
+AI_PROVIDER_ORDER          = ('gemini', 'groq')  # 지연 시간 표본이 부족할 때의 우선순위
+AI_LATENCY_WINDOW          = 50   # 제공자별 최근 N건으로 p50/p95 계산
+AI_LATENCY_MIN_SAMPLES     = 5    # 이보다 적으면 지연 시간으로 순위를 매기지 않음
+AI_HEDGE_ENABLED           = True # 1순위가 p95를 넘기면 2순위에 동시 요청 (먼저 온 응답 사용)
+AI_HEDGE_MIN_DELAY         = 1.0  # 헤지 요청 전 최소 대기(초)
+AI_PROVIDER_FAIL_THRESHOLD = 3    # 연속 실패 N회 → 제공자 제외
+AI_PROVIDER_COOLDOWN       = 60   # 제외 유지 시간(초) 후 다시 시도
+
+# ── 로컬 파티 최적화 (AI 없이 시너지 점수 기반) ──
+PARTY_OPTIMIZER_BUDGET_MS = 50   # 탐색 시간 상한(ms)
+PARTY_OPTIMIZER_RESTARTS  = 12   # 무작위 재시작 횟수 (입력 기반 시드 → 결과 결정적)
+PARTY_OPTIMIZER_TOP_K     = 3    # 최적안 외 대안 개수 (재편성 버튼용)
+
+# ── 주간 스케줄러 (레이드 간 중복 배정 방지) ──
+WEEKLY_CHARACTER_RAID_LIMIT = 3    # 캐릭터당 주간 클리어(골드) 레이드 수
+SCHEDULER_RAID_CAPACITY     = 8    # 정원 정보가 없는 레이드의 최대 인원
+SCHEDULER_BUDGET_MS         = 200  # 탐색 시간 상한(ms)
+
+HISTORY_DEFAULT_WEEKS       = 12   # 통계 기본 조회 기간(주)
+
+# ── 클리어 타임 통계 ──
+CLEAR_STATS_ACCURACY    = 0.02  # 분위수 상대 오차 (로그 버킷 스케치)
+CLEAR_STATS_MIN_SAMPLES = 3     # 길드 표본이 이보다 적으면 전체 길드 병합 통계 사용 / 스케줄링 반영 최소 표본
+CLEAR_MAX_MINUTES       = 360   # 이보다 긴 소요 시간은 시작 누락으로 보고 통계에서 제외
+
+# ── 최적화 프로세스 풀 (이벤트 루프 밖에서 파티 탐색) ──
+OPTIMIZER_WORKERS           = int(os.getenv('OPTIMIZER_WORKERS', '0')) or min(4, os.cpu_count() or 1)
+OPTIMIZER_DEADLINE          = 5.0  # 작업 1건 대기+실행 상한(초), 넘으면 인라인 계산
+OPTIMIZER_GUILD_CONCURRENCY = 2    # 길드당 동시에 풀에 올리는 작업 수 (한 길드가 풀을 독점하지 않게)
+
+# ── AI 응답 캐시 (같은 입력 → 같은 응답, 할당량 절약) ──
+AI_CACHE_DB          = CACHE_DIR / 'ai_responses.sqlite3'
+AI_CACHE_TTL_HOURS   = 24
+AI_CACHE_MAX_ENTRIES = 256   # 메모리 LRU 크기
 
 # ==================== 검증 ====================
 
@@ -124,6 +204,7 @@ def print_config():
     print("=" * 50)
     print(f"Discord Token : {'✅' if DISCORD_BOT_TOKEN else '❌'}")
     print(f"Gemini API    : {'✅' if GEMINI_API_KEY else '❌'}")
+    print(f"Groq API      : {'✅' if GROQ_API_KEY else '➖'} (백업)")
     print(f"로아 API Keys : {len(LOSTARK_API_KEYS)}개")
     print(f"credentials   : {'✅' if GOOGLE_CREDENTIALS_PATH.exists() else '❌'}")
     print()
@@ -14,6 +14,11 @@ from bot.config.settings import (
     DISCORD_BOT_TOKEN,
     BOT_NAME,
     BOT_VERSION,
+    ROSTER_SYNC_WEEKDAY,
+    ROSTER_SYNC_HOUR,
+    ROSTER_SYNC_RETRY_MINUTES,
+    ROSTER_SYNC_MAX_ATTEMPTS,
+    ROSTER_SYNC_GUILDS,
     validate_config,
     print_config,
 )
@@ -230,6 +235,10 @@ async def on_ready():
         weekly_update_scheduler.start()
         print("✅ 수요일 자동 갱신 스케줄러 시작!")
 
+    if not weekly_roster_sync.is_running():
+        weekly_roster_sync.start()
+        print("✅ 주간 로스터 동기화 스케줄러 시작!")
+
     await bot.change_presence(
         activity=discord.Game(name="로스트아크 길드 관리 | /도움말")
     )
@@ -269,7 +278,7 @@ async def weekly_update_scheduler():
         success = 0
         for guild in bot.guilds:
             try:
-                ok = await schedule_cog.update_weekly_channel(guild)
+                ok = await schedule_cog.update_weekly_channel(guild, record=True)
                 if ok:
                     success += 1
                     patchnote_ch = get_channel(guild, CH_PATCHNOTE)
@@ -291,6 +300,73 @@ async def before_scheduler():
     await bot.wait_until_ready()
 
 
+# ==================== 주간 로스터 동기화 ====================
+
+# 길드 ID → (주차 키, 시도 횟수, 완료 여부)
+_roster_sync_state: dict[int, tuple[str, int, bool]] = {}
+
+
+async def _sync_roster(guild: discord.Guild) -> bool:
+    """길드 1개 로스터 동기화 (AdminCog가 있으면 봇설정 채널에 진행 보고)"""
+    admin_cog = bot.cogs.get("AdminCog")
+    try:
+        if admin_cog:
+            result = await admin_cog.run_roster_sync(guild)
+        else:
+            from bot.utils.roster import sync_guild_roster
+            result = await sync_guild_roster(guild.id)
+    except Exception as e:
+        print(f"  [{guild.name}] 로스터 동기화 실패: {e}")
+        return False
+    if result is None:
+        return False
+    # 전원 조회 실패 = 점검 연장 등 → 재시도 (캐시 데이터로 대신한 길드원은 실패로 세지 않음)
+    return not result["members"] or len(result["failed"]) < result["members"]
+
+
+@tasks.loop(minutes=ROSTER_SYNC_RETRY_MINUTES)
+async def weekly_roster_sync():
+    """
+    수요일 정기 점검 이후 로스터 동기화 (아이템 레벨 변동 반영)
+    실패한 길드만 다음 주기에 재시도 (주당 ROSTER_SYNC_MAX_ATTEMPTS회까지)
+    """
+    from bot.utils.history import week_key
+
+    now = datetime.now(KST)
+    if now.weekday() != ROSTER_SYNC_WEEKDAY or now.hour < ROSTER_SYNC_HOUR:
+        return
+
+    week    = week_key(now.timestamp())
+    pending = []
+    for guild in bot.guilds:
+        state = _roster_sync_state.get(guild.id)
+        if state is None or state[0] != week:
+            state = _roster_sync_state[guild.id] = (week, 0, False)
+        if not state[2] and state[1] < ROSTER_SYNC_MAX_ATTEMPTS:
+            pending.append(guild)
+    if not pending:
+        return
+
+    print(f"[로스터] 주간 동기화 시작 {now.strftime('%Y-%m-%d %H:%M')} - {len(pending)}개 서버")
+    slots = asyncio.Semaphore(ROSTER_SYNC_GUILDS)
+
+    async def _one(guild: discord.Guild) -> bool:
+        async with slots:
+            ok = await _sync_roster(guild)
+        _, attempts, _ = _roster_sync_state[guild.id]
+        _roster_sync_state[guild.id] = (week, attempts + 1, ok)
+        return ok
+
+    results = await asyncio.gather(*(_one(g) for g in pending))
+    print(f"[로스터] 완료 {sum(results)}/{len(pending)}개 서버"
+          + ("" if all(results) else f" (실패 서버는 {ROSTER_SYNC_RETRY_MINUTES}분 후 재시도)"))
+
+
+@weekly_roster_sync.before_loop
+async def before_roster_sync():
+    await bot.wait_until_ready()
+
+
 # ==================== 실행 ====================
 
 if __name__ == "__main__":
@@ -0,0 +1,136 @@
+"""
+AI 제공자 라우터 테스트 (가짜 제공자, 네트워크 없음)
+- 순위: 표본 부족 → 기본 우선순위, 표본 충분 → p50 낮은 순
+- 대체: 1순위 실패 → 2순위, 연속 실패 → 제외
+- 헤지: 1순위가 p95를 넘기면 2순위 동시 요청 → 먼저 온 응답
+- 스트리밍: 첫 조각 전 실패만 대체
+
+실행: python -m pytest -q bot/tests/test_ai_router.py (저장소 루트)
+"""
+
+import asyncio
+
+import pytest
+
+from bot.config.settings import AI_LATENCY_MIN_SAMPLES, AI_PROVIDER_FAIL_THRESHOLD
+from bot.utils import ai_router as router_module
+from bot.utils.ai_client import AIError
+from bot.utils.ai_router import AIRouter, Provider
+
+
+class FakeProvider(Provider):
+    """지연 시간 / 실패를 지정하는 가짜 제공자"""
+
+    def __init__(self, name: str, delay: float = 0.0, fail: bool = False, chunks=("응", "답")):
+        super().__init__()
+        self.name   = name
+        self.delay  = delay
+        self.fail   = fail
+        self.chunks = chunks
+        self.calls  = 0
+
+    def available(self, api_key, guild_id) -> bool:
+        return True
+
+    async def generate(self, prompt, api_key=None, guild_id=0, timeout=None, max_output_tokens=None) -> str:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError(f"{self.name} down")
+        return f"{self.name}:{prompt}"
+
+    async def stream(self, prompt, api_key=None, guild_id=0, timeout=None, max_output_tokens=None):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError(f"{self.name} down")
+        for chunk in self.chunks:
+            await asyncio.sleep(self.delay)
+            yield chunk
+
+
+def _warm(provider: Provider, ms: float):
+    """순위 / 헤지 계산용 지연 시간 표본 채우기"""
+    for _ in range(AI_LATENCY_MIN_SAMPLES):
+        provider.latency.observe(ms)
+
+
+@pytest.fixture(autouse=True)
+def fast_hedge(monkeypatch):
+    monkeypatch.setattr(router_module, "AI_HEDGE_MIN_DELAY", 0.01)
+
+
+def test_provider_is_abstract():
+    with pytest.raises(TypeError):
+        Provider()
+
+
+def test_default_order_without_samples():
+    gemini, groq = FakeProvider("gemini"), FakeProvider("groq")
+    router = AIRouter([groq, gemini], hedge=False)
+    assert asyncio.run(router.generate("p")) == "gemini:p"
+    assert groq.calls == 0
+
+
+def test_order_by_p50_latency():
+    gemini, groq = FakeProvider("gemini"), FakeProvider("groq")
+    _warm(gemini, 900)
+    _warm(groq, 100)
+    router = AIRouter([gemini, groq], hedge=False)
+    assert asyncio.run(router.generate("p")) == "groq:p"
+    assert gemini.calls == 0
+
+
+def test_failover_to_next_provider():
+    gemini, groq = FakeProvider("gemini", fail=True), FakeProvider("groq")
+    router = AIRouter([gemini, groq], hedge=False)
+    assert asyncio.run(router.generate("p")) == "groq:p"
+    assert gemini.health.errors == 1 and groq.health.successes == 1
+
+
+def test_failing_provider_is_disabled():
+    gemini, groq = FakeProvider("gemini", fail=True), FakeProvider("groq")
+    router = AIRouter([gemini, groq], hedge=False)
+    for _ in range(AI_PROVIDER_FAIL_THRESHOLD):
+        asyncio.run(router.generate("p"))
+    calls = gemini.calls
+    assert [p.name for p in router._order(None, 0)] == ["groq", "gemini"]
+    asyncio.run(router.generate("p"))
+    assert gemini.calls == calls
+
+
+def test_all_providers_fail_raises_last_error():
+    router = AIRouter([FakeProvider("gemini", fail=True), FakeProvider("groq", fail=True)], hedge=False)
+    with pytest.raises(RuntimeError, match="groq down"):
+        asyncio.run(router.generate("p"))
+
+
+def test_no_provider_raises_ai_error():
+    with pytest.raises(AIError):
+        asyncio.run(AIRouter([]).generate("p"))
+
+
+def test_hedge_uses_faster_backup():
+    gemini, groq = FakeProvider("gemini", delay=0.5), FakeProvider("groq", delay=0.0)
+    _warm(gemini, 10)   # p95 10ms → 최소 대기 후 헤지
+    router = AIRouter([gemini, groq], hedge=True)
+    assert asyncio.run(router.generate("p")) == "groq:p"
+    assert router.hedged == 1 and router.hedge_won == 1
+
+
+def test_no_hedge_when_primary_is_fast():
+    gemini, groq = FakeProvider("gemini"), FakeProvider("groq")
+    _warm(gemini, 1000)
+    router = AIRouter([gemini, groq], hedge=True)
+    assert asyncio.run(router.generate("p")) == "gemini:p"
+    assert router.hedged == 0 and groq.calls == 0
+
+
+def test_stream_fails_over_before_first_chunk():
+    gemini, groq = FakeProvider("gemini", fail=True), FakeProvider("groq", chunks=("a", "b"))
+    router = AIRouter([gemini, groq], hedge=False)
+
+    async def collect():
+        return [chunk async for chunk in router.stream("p")]
+
+    assert asyncio.run(collect()) == ["a", "b"]
+    assert gemini.health.errors == 1
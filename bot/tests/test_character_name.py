@@ -0,0 +1,42 @@
+"""
+캐릭터명 정규화 테스트 (API 요청 전 처리)
+- NFC 결합, 제로폭 문자 / 공백 제거
+- 캐릭터명에 쓸 수 없는 문자 → 빈 문자열 (요청하지 않음)
+
+실행: python -m pytest -q bot/tests/test_character_name.py (저장소 루트)
+"""
+
+import unicodedata
+
+import pytest
+
+from bot.utils.lostark_api import _character_endpoint, normalize_character_name
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("빛쟁인거니",               "빛쟁인거니"),
+    (" 빛쟁인거니 ",             "빛쟁인거니"),
+    ("빛쟁인\u200b거니",        "빛쟁인거니"),
+    ("\ufeff빛쟁인거니\u00ad",  "빛쟁인거니"),
+    ("빛쟁인 거니",              "빛쟁인거니"),
+    ("빛쟁인\t거니\n",           "빛쟁인거니"),
+    ("Lostark123",               "Lostark123"),
+])
+def test_cleans_name(raw, expected):
+    assert normalize_character_name(raw) == expected
+
+
+def test_joins_decomposed_hangul():
+    decomposed = unicodedata.normalize("NFD", "거니")
+    assert decomposed != "거니"
+    assert normalize_character_name(decomposed) == "거니"
+
+
+@pytest.mark.parametrize("raw", ["", None, "   ", "거니!", "../거니", "거니/armories", "a" * 21])
+def test_rejects_invalid(raw):
+    assert normalize_character_name(raw) == ""
+
+
+def test_endpoint_uses_normalized_name():
+    assert _character_endpoint("/armories/characters/{name}", " 거\u200b니 ") == "/armories/characters/거니"
+    assert _character_endpoint("/armories/characters/{name}", "거니?x=1") is None
@@ -0,0 +1,162 @@
+"""
+로스트아크 API 서킷 브레이커 테스트
+- 연속 실패 threshold회 → OPEN, 점검(503)은 즉시 OPEN
+- cooldown 후 HALF_OPEN 프로브 1건만 허용 → 성공 CLOSED / 실패 다시 OPEN
+
+실행: python -m pytest -q bot/tests/test_circuit_breaker.py (저장소 루트)
+"""
+
+import asyncio
+
+import pytest
+
+from bot.utils import lostark_api
+from bot.utils.lostark_api import CircuitBreaker
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(lostark_api.time, "monotonic", clock)
+    return clock
+
+
+def test_opens_after_threshold(clock):
+    breaker = CircuitBreaker(failure_threshold=3, cooldown=60)
+    for _ in range(2):
+        breaker.record_failure()
+        assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+
+def test_success_resets_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=3, cooldown=60)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_maintenance_opens_immediately(clock):
+    breaker = CircuitBreaker(failure_threshold=5, cooldown=60)
+    breaker.record_failure(maintenance=True)
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+
+def test_half_open_allows_single_probe(clock):
+    breaker = CircuitBreaker(failure_threshold=1, cooldown=60)
+    breaker.record_failure()
+    clock.now += 59
+    assert not breaker.allow()
+    clock.now += 1
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()   # 프로브 진행 중에는 차단
+
+
+def test_probe_success_closes(clock):
+    breaker = CircuitBreaker(failure_threshold=1, cooldown=60)
+    breaker.record_failure()
+    clock.now += 60
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow() and breaker.allow()
+
+
+def test_probe_failure_reopens(clock):
+    breaker = CircuitBreaker(failure_threshold=5, cooldown=60)
+    breaker.record_failure(maintenance=True)
+    clock.now += 60
+    assert breaker.allow()
+    breaker.record_failure()   # threshold 미만이어도 프로브 실패면 즉시 OPEN
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+    clock.now += 60
+    assert breaker.allow()
+
+
+def test_release_returns_probe(clock):
+    breaker = CircuitBreaker(failure_threshold=1, cooldown=60)
+    breaker.record_failure()
+    clock.now += 60
+    assert breaker.allow()
+    breaker.release()   # 판정 없이 끝난 프로브
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow()
+
+
+def test_release_outside_half_open_is_noop(clock):
+    breaker = CircuitBreaker(failure_threshold=1, cooldown=60)
+    breaker.release()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    breaker.release()
+    assert breaker.state == CircuitBreaker.OPEN and not breaker.allow()
+
+
+class Budget:
+    """첫 요청은 키 예산 소진, 이후 정상"""
+    keys = ["key"]
+
+    def __init__(self):
+        self.calls = 0
+
+    def acquire(self):
+        self.calls += 1
+        if self.calls == 1:
+            raise TimeoutError("예산 소진")
+        return "key"
+
+
+class Response:
+    status_code = 200
+    headers: dict = {}
+
+    def json(self):
+        return {"CharacterName": "a"}
+
+
+@pytest.mark.parametrize("first", ["rate_limit", "key_budget"])
+def test_half_open_probe_rate_limited_keeps_api_usable(clock, monkeypatch, first):
+    """HALF_OPEN 프로브가 429 / 키 예산 소진으로 끝나도 다음 요청은 허용"""
+    breaker = CircuitBreaker(failure_threshold=1, cooldown=60)
+    monkeypatch.setattr(lostark_api, "circuit", breaker)
+    monkeypatch.setattr(lostark_api, "LOSTARK_API_MAX_RETRIES", 0)
+    if first == "rate_limit":
+        responses = [(429, None, 1.0), (200, {"CharacterName": "a"}, None)]
+        monkeypatch.setattr(lostark_api, "_fetch", lambda endpoint: responses.pop(0))
+    else:
+        monkeypatch.setattr(lostark_api, "key_manager", Budget())
+        monkeypatch.setattr(lostark_api.requests, "get", lambda *a, **kw: Response())
+        monkeypatch.setattr(lostark_api.metrics, "record_request", lambda *a: None)
+        monkeypatch.setattr(lostark_api.metrics, "record_key_remaining", lambda *a: None)
+
+    breaker.record_failure(maintenance=True)
+    clock.now += 60
+    result = lostark_api._request_network("/x", store=False)
+    assert result.status == lostark_api.APIStatus.RATE_LIMITED
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+    result = lostark_api._request_network("/x", store=False)
+    assert result.ok and breaker.state == CircuitBreaker.CLOSED
+
+
+def test_blocking_call_refused_on_event_loop():
+    async def call():
+        return lostark_api._request_network("/x", store=False)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(call())
@@ -0,0 +1,131 @@
+"""
+클리어 타임 분포 스케치 테스트
+- 분위수: 정확한 nearest-rank 값 대비 상대 오차 CLEAR_STATS_ACCURACY 이내, 최소/최대 범위 안
+- 병합: 나눠 쌓은 스케치를 합치면 한 번에 쌓은 것과 같음
+- 저장 형식 왕복
+- 클리어 기록: 시작 기록이 있을 때만 분포에 반영 (예정 시각 추정치는 표시용)
+
+실행: python -m pytest -q bot/tests/test_clear_stats.py (저장소 루트)
+"""
+
+import math
+import random
+from datetime import datetime
+
+import pytest
+
+from bot.config.settings import CLEAR_STATS_ACCURACY, CLEAR_STATS_MIN_SAMPLES
+from bot.utils.clear_stats import ClearStats, DurationSketch
+from bot.utils.history import KST
+
+QUANTILES = (0.0, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99, 1.0)
+
+
+def _exact(values: list[float], q: float) -> float:
+    """nearest-rank 분위수"""
+    ordered = sorted(max(v, 1.0) for v in values)
+    return ordered[max(math.ceil(q * len(ordered)) - 1, 0)]
+
+
+def _sketch(values) -> DurationSketch:
+    sketch = DurationSketch()
+    for v in values:
+        sketch.add(v)
+    return sketch
+
+
+def _samples(seed: int, n: int) -> list[float]:
+    rng = random.Random(seed)
+    return [rng.lognormvariate(math.log(45), 0.4) for _ in range(n)]
+
+
+@pytest.mark.parametrize("seed, n", [(1, 1), (2, 3), (3, 10), (4, 200), (5, 5000)])
+def test_quantiles_within_relative_accuracy(seed, n):
+    values = _samples(seed, n)
+    sketch = _sketch(values)
+    for q in QUANTILES:
+        exact = _exact(values, q)
+        assert sketch.quantile(q) == pytest.approx(exact, rel=CLEAR_STATS_ACCURACY + 1e-9)
+        assert sketch.low <= sketch.quantile(q) <= sketch.high
+
+
+def test_nearest_rank_for_small_samples():
+    sketch = _sketch([30, 40, 90])
+    assert sketch.quantile(0.9) == pytest.approx(90, rel=CLEAR_STATS_ACCURACY)
+    assert sketch.quantile(0.5) == pytest.approx(40, rel=CLEAR_STATS_ACCURACY)
+
+
+def test_empty_and_clamped():
+    sketch = DurationSketch()
+    assert sketch.quantile(0.5) is None and sketch.mean is None
+    sketch.add(0.2)   # 1분 미만은 1분
+    assert sketch.quantile(0.5) == 1.0 and sketch.mean == 1.0
+
+
+def test_merge_equals_single_sketch():
+    values = _samples(9, 1000)
+    whole  = _sketch(values)
+    merged = DurationSketch()
+    for start in range(0, len(values), 137):
+        merged.merge(_sketch(values[start:start + 137]))
+
+    assert merged.buckets == whole.buckets
+    assert merged.count == whole.count
+    assert (merged.low, merged.high) == (whole.low, whole.high)
+    assert merged.total == pytest.approx(whole.total)
+    for q in QUANTILES:
+        assert merged.quantile(q) == whole.quantile(q)
+
+
+def test_merge_with_empty():
+    sketch = _sketch([20, 30])
+    before = sketch.summary()
+    assert sketch.merge(DurationSketch()).summary() == before
+    assert DurationSketch().merge(sketch).summary() == before
+
+
+def test_dumps_loads_roundtrip():
+    sketch   = _sketch(_samples(3, 50))
+    restored = DurationSketch.loads(sketch.dumps())
+    assert restored.buckets == sketch.buckets
+    assert restored.summary() == sketch.summary()
+
+
+# ==================== 클리어 기록 ====================
+
+RAID    = {'col': 4, 'name': "카멘 1팀", 'difficulty': "hard", 'day': '수', 'hour': 20, 'minute': 0}
+MEMBERS = [{'name': "a", 'std_job': "바드"}, {'name': "b", 'std_job': "워로드"}]
+WEDNESDAY_20 = datetime(2026, 10, 14, 20, tzinfo=KST).timestamp()
+WEEK = 7 * 86400
+
+
+def test_estimated_duration_not_sampled(tmp_path):
+    """/레이드시작 없이 예정 5시간 뒤 클리어 → 표시만, 스케줄링 소요 시간은 그대로"""
+    stats = ClearStats(tmp_path / "history.sqlite3")
+    for week in range(CLEAR_STATS_MIN_SAMPLES):
+        result = stats.finish_run(1, RAID, MEMBERS, now=WEDNESDAY_20 + week * WEEK + 300 * 60)
+        assert result['estimated'] and result['minutes'] == 300
+        assert result['raid'] is None
+    assert stats.raid_stats(1, [RAID]) == {}
+    assert stats.expected_durations(1, [RAID]) == {}
+
+
+def test_started_run_is_sampled(tmp_path):
+    stats = ClearStats(tmp_path / "history.sqlite3")
+    for week in range(CLEAR_STATS_MIN_SAMPLES):
+        start = WEDNESDAY_20 + week * WEEK + 3600   # 예정보다 1시간 늦게 시작
+        stats.start_run(1, RAID, MEMBERS, now=start)
+        result = stats.finish_run(1, RAID, MEMBERS, now=start + 50 * 60)
+        assert not result['estimated'] and result['minutes'] == 50
+    assert stats.raid_stats(1, [RAID])[4]['count'] == CLEAR_STATS_MIN_SAMPLES
+    assert stats.expected_durations(1, [RAID]) == {4: 60}
+
+    again = stats.finish_run(1, RAID, MEMBERS, now=start + 60 * 60)   # 중복 클리어는 다시 세지 않음
+    assert again['minutes'] is None and again['raid']['count'] == CLEAR_STATS_MIN_SAMPLES
+
+
+def test_estimated_run_row_keeps_minutes_only(tmp_path):
+    stats = ClearStats(tmp_path / "history.sqlite3")
+    stats.finish_run(1, RAID, MEMBERS, now=WEDNESDAY_20 + 90 * 60)
+    row = stats._connect().execute("SELECT started_at, minutes FROM runs").fetchone()
+    assert row["started_at"] is None and row["minutes"] == 90
@@ -0,0 +1,165 @@
+"""
+주간 골드 장부 테스트
+- 관문별 골드 / 부분 클리어 / 더보기 비용
+- 캐릭터별 규칙: 같은 레이드(팀 무관) 1회, 골드 높은 순 WEEKLY_CHARACTER_RAID_LIMIT개
+- 셀 / 클리어 증분 갱신 결과 = 새로 만든 장부
+
+실행: python -m pytest -q bot/tests/test_gold.py (저장소 루트)
+"""
+
+import random
+
+from bot.config.settings import WEEKLY_CHARACTER_RAID_LIMIT
+from bot.utils.gold import GoldLedger
+from bot.utils.week_model import WeekModel
+
+KAMEN  = [(3000, 1000), (4000, 1500), (6000, 2000)]
+AEGIR  = [(7500, 2400), (15500, 5100)]
+VALTAN = [(700, 450), (1100, 600)]
+
+
+def _raid(col, name, rewards=None, gold=0, cleared=False, gates=0):
+    return {'col': col, 'name': name, 'day': None, 'rewards': rewards, 'gold': gold,
+            'cleared': cleared, 'cleared_gates': gates}
+
+
+def _char(job, alt=False, bonus=False):
+    return {'raw': job + ("+" if bonus else ""), 'std_job': job, 'is_support': False,
+            'is_alt': alt, 'bonus': bonus}
+
+
+def _member(name, chars):
+    return {'name': name, 'absent': False, 'characters': chars}
+
+
+def _ledger(raids, members) -> GoldLedger:
+    return GoldLedger(WeekModel(raids, members))
+
+
+# ==================== 관문 / 클리어 ====================
+
+def test_gate_gold_expected_and_earned():
+    ledger = _ledger([_raid(4, "카멘", KAMEN, gates=2)], [_member("a", {4: _char("워로드")})])
+    assert ledger.expected == 13000
+    assert ledger.earned == 7000
+    assert ledger.raid_gold == {4: 13000}
+
+
+def test_set_gates_and_cleared():
+    ledger = _ledger([_raid(4, "카멘", KAMEN)], [_member("a", {4: _char("워로드")})])
+    assert ledger.earned == 0
+    ledger.set_gates(4, 1)
+    assert ledger.earned == 3000
+    ledger.set_gates(4, 99)           # 관문 수로 잘림
+    assert ledger.earned == 13000
+    ledger.set_cleared(4, False)
+    assert ledger.earned == 0
+    ledger.set_cleared(4, True)
+    assert ledger.earned == ledger.expected == 13000
+
+
+def test_gold_without_gate_rewards():
+    ledger = _ledger([_raid(4, "모르는 레이드", gold=1234, cleared=True)], [_member("a", {4: _char("워로드")})])
+    assert ledger.expected == ledger.earned == 1234
+
+
+def test_bonus_costs_every_gate():
+    ledger = _ledger([_raid(4, "카멘", KAMEN, gates=1)], [_member("a", {4: _char("워로드", bonus=True)})])
+    assert ledger.expected == 13000 - 4500
+    assert ledger.earned == 3000 - 1000
+
+
+def test_bonus_costs_without_gold():
+    raids = [_raid(4, "카멘", KAMEN), _raid(5, "에기르", AEGIR), _raid(6, "발탄", VALTAN),
+             _raid(7, "베히모스", [(9000, 3000)])]
+    chars = {col: _char("워로드") for col in (4, 5, 6, 7)}
+    chars[6] = _char("워로드", bonus=True)
+    ledger = _ledger(raids, [_member("a", chars)])
+    # 골드 3개 = 에기르, 카멘, 베히모스 → 발탄은 골드 없이 더보기 비용만
+    assert ledger.raid_gold[6] == -1050
+    assert ledger.expected == 23000 + 13000 + 9000 - 1050
+
+
+# ==================== 캐릭터별 규칙 ====================
+
+def test_same_raid_once_per_character():
+    raids  = [_raid(4, "카멘 하드 1팀", KAMEN), _raid(5, "카멘 하드 2팀", KAMEN)]
+    ledger = _ledger(raids, [_member("a", {4: _char("워로드"), 5: _char("워로드")})])
+    assert ledger.expected == 13000
+    ledger = _ledger(raids, [_member("a", {4: _char("워로드"), 5: _char("워로드", alt=True)})])
+    assert ledger.expected == 26000
+
+
+def test_weekly_limit_keeps_highest_gold():
+    raids = [_raid(4, "카멘", KAMEN), _raid(5, "에기르", AEGIR), _raid(6, "발탄", VALTAN),
+             _raid(7, "베히모스", [(9000, 3000)])]
+    ledger = _ledger(raids, [_member("a", {col: _char("워로드") for col in (4, 5, 6, 7)})])
+    assert WEEKLY_CHARACTER_RAID_LIMIT == 3
+    assert ledger.expected == 23000 + 13000 + 9000
+    assert ledger.raid_gold[6] == 0
+    (member,) = ledger.summary()['members']
+    assert member['characters'][0]['raids'] == ["에기르", "카멘", "베히모스"]
+
+
+def test_cleared_raid_keeps_gold():
+    raids = [_raid(4, "카멘", KAMEN), _raid(5, "에기르", AEGIR), _raid(6, "발탄", VALTAN, cleared=True),
+             _raid(7, "베히모스", [(9000, 3000)])]
+    ledger = _ledger(raids, [_member("a", {col: _char("워로드") for col in (4, 5, 6, 7)})])
+    assert ledger.earned == 1800
+    assert ledger.raid_gold[6] == 1800 and ledger.raid_gold[7] == 0
+
+
+# ==================== 증분 갱신 ====================
+
+def _state(ledger: GoldLedger):
+    members = {m['name']: (m['expected'], m['earned'],
+                           sorted((ch['std_job'], ch['is_alt'], ch['expected'], ch['earned'], ch['raids'])
+                                  for ch in m['characters']))
+               for m in ledger.summary()['members']}
+    return ledger.expected, ledger.earned, ledger.raid_gold, members
+
+
+def test_incremental_matches_fresh_build():
+    rng   = random.Random(7)
+    raids = [_raid(4, "카멘 1팀", KAMEN), _raid(5, "카멘 2팀", KAMEN), _raid(6, "에기르", AEGIR),
+             _raid(7, "발탄", VALTAN), _raid(8, "모르는 레이드", gold=500)]
+    jobs  = ["워로드", "바드", "소서리스"]
+    cells = {}
+    ledger = _ledger(raids, [])
+    for _ in range(300):
+        name, col = f"m{rng.randrange(4)}", rng.choice([4, 5, 6, 7, 8])
+        action = rng.random()
+        if action < 0.6:
+            char = _char(rng.choice(jobs), alt=rng.random() < 0.3, bonus=rng.random() < 0.3)
+            cells[(name, col)] = char
+            ledger.set_cell(name, col, char)
+        elif action < 0.8:
+            cells.pop((name, col), None)
+            ledger.set_cell(name, col, None)
+        else:
+            gates = rng.randrange(4)
+            for r in raids:
+                if r['col'] == col:
+                    r['cleared_gates'] = gates
+            ledger.set_gates(col, gates)
+
+        members: dict[str, dict] = {}
+        for (n, c), char in cells.items():
+            members.setdefault(n, {})[c] = char
+        fresh = _ledger(raids, [_member(n, chars) for n, chars in members.items()])
+        assert _state(ledger) == _state(fresh)
+
+
+def test_sync_applies_changes_and_detects_new_raids():
+    raids  = [_raid(4, "카멘", KAMEN), _raid(5, "에기르", AEGIR)]
+    before = WeekModel(raids, [_member("a", {4: _char("워로드")})])
+    ledger = GoldLedger(before)
+
+    raids[1]['cleared'] = True
+    after = WeekModel(raids, [_member("a", {4: _char("워로드"), 5: _char("워로드")}),
+                              _member("b", {5: _char("바드", bonus=True)})])
+    assert ledger.sync(after)
+    assert _state(ledger) == _state(GoldLedger(after))
+
+    changed = WeekModel(raids + [_raid(6, "발탄", VALTAN)], [])
+    assert not ledger.sync(changed)
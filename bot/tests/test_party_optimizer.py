@@ -0,0 +1,139 @@
+"""
+시너지 기반 파티 최적화 테스트
+- 전체 최적화: 인원 분배, 파티당 서폿 1명, 같은 입력이면 같은 결과
+- 재편성(locked / swap_out / 로스터 변경)은 입력 편성보다 나빠지지 않음
+- 고정 파티 유지, 지정 길드원 이동, 제외 분할 / 다른 안
+
+실행: python -m pytest -q bot/tests/test_party_optimizer.py (저장소 루트)
+"""
+
+import pytest
+
+from bot.utils.party_optimizer import optimize_parties, reoptimize_parties
+from bot.utils.synergy_kernel import PartyKernel
+
+DEALERS = ["워로드(고기)", "디스트로이어", "소서리스", "블레이드", "슬레이어", "블래스터"]
+SUPPORTS = ["바드", "홀나(폿)"]
+JOBS = {"워로드(고기)": "워로드", "홀나(폿)": "홀리나이트"}
+
+
+def _member(name, label, support=False):
+    return {"name": name, "character": label, "std_job": JOBS.get(label, label), "is_support": support}
+
+
+@pytest.fixture
+def members():
+    return ([_member(f"딜{i}", label) for i, label in enumerate(DEALERS)]
+            + [_member(f"폿{i}", label, True) for i, label in enumerate(SUPPORTS)])
+
+
+def _names(parties) -> list[set]:
+    return [{m["name"] for m in party} for party in parties]
+
+
+def _score(members, parties) -> float:
+    kernel = PartyKernel(members)
+    index  = {m["name"]: i for i, m in enumerate(members)}
+    return round(sum(kernel.score(sum(1 << index[m["name"]] for m in p)) for p in parties), 2)
+
+
+def _worst(members) -> list[list[dict]]:
+    """서폿 둘을 한 파티에 몰아넣은 편성"""
+    supports = [m for m in members if m["is_support"]]
+    dealers  = [m for m in members if not m["is_support"]]
+    return [supports + dealers[:2], dealers[2:]]
+
+
+# ==================== 전체 최적화 ====================
+
+def test_optimize_splits_supports(members):
+    result = optimize_parties(members, 4)
+    assert sorted(len(p) for p in result["parties"]) == [4, 4]
+    assert [sum(m["is_support"] for m in p) for p in result["parties"]] == [1, 1]
+    assert result["score"] == _score(members, result["parties"])
+    assert all(alt["score"] <= result["score"] for alt in result["alternatives"])
+
+
+def test_optimize_is_deterministic(members):
+    first, second = optimize_parties(members, 4), optimize_parties([dict(m) for m in members], 4)
+    assert _names(first["parties"]) == _names(second["parties"])
+    assert first["score"] == second["score"]
+
+
+def test_optimize_uneven_count(members):
+    result = optimize_parties(members[:6], 4)
+    assert sorted(len(p) for p in result["parties"]) == [3, 3]
+
+
+def test_optimize_empty():
+    assert optimize_parties([], 4)["parties"] == []
+
+
+# ==================== 재편성 ====================
+
+def test_reoptimize_never_worse(members):
+    start  = _worst(members)
+    result = reoptimize_parties(members, start, 4)
+    assert result["previous_score"] == _score(members, start)
+    assert result["score"] >= result["previous_score"]
+    assert result["changed"]
+
+
+def test_reoptimize_keeps_optimum(members):
+    best   = optimize_parties(members, 4)
+    result = reoptimize_parties(members, best["parties"], 4)
+    assert not result["changed"]
+    assert result["score"] == result["previous_score"] == best["score"]
+
+
+def test_locked_party_untouched(members):
+    start  = _worst(members)
+    result = reoptimize_parties(members, start, 4, locked={1})
+    assert _names(result["parties"])[1] == _names(start)[1]
+    assert result["score"] >= result["previous_score"]
+
+
+def test_all_locked_is_noop(members):
+    start  = _worst(members)
+    result = reoptimize_parties(members, start, 4, locked={0, 1})
+    assert not result["changed"] and _names(result["parties"]) == _names(start)
+
+
+def test_swap_out_moves_member(members):
+    best   = optimize_parties(members, 4)["parties"]
+    target = best[0][0]["name"]
+    result = reoptimize_parties(members, best, 4, swap_out={target})
+    assert target not in _names(result["parties"])[0]
+    assert result["changed"]
+
+
+def test_swap_out_respects_lock(members):
+    best   = optimize_parties(members, 4)["parties"]
+    target = best[0][0]["name"]
+    result = reoptimize_parties(members, best, 4, locked={0}, swap_out={target})
+    assert target in _names(result["parties"])[0]
+
+
+def test_roster_change_places_new_member(members):
+    start  = _worst(members[:-1])
+    result = reoptimize_parties(members, start, 4)
+    placed = set().union(*_names(result["parties"]))
+    assert placed == {m["name"] for m in members}
+    assert result["score"] >= result["previous_score"]
+
+
+def test_roster_change_drops_missing_member(members):
+    best   = optimize_parties(members, 4)["parties"]
+    result = reoptimize_parties(members[1:], best, 4)
+    assert members[0]["name"] not in set().union(*_names(result["parties"]))
+
+
+def test_diversity_and_exclude_give_new_partition(members):
+    best  = optimize_parties(members, 4)["parties"]
+    seen  = {frozenset(map(frozenset, _names(best)))}
+    other = reoptimize_parties(members, best, 4, diversity=True)
+    assert frozenset(map(frozenset, _names(other["parties"]))) not in seen
+    seen.add(frozenset(map(frozenset, _names(other["parties"]))))
+
+    third = reoptimize_parties(members, other["parties"], 4, exclude=[best], diversity=True)
+    assert frozenset(map(frozenset, _names(third["parties"]))) not in seen
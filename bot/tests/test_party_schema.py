@@ -0,0 +1,162 @@
+"""
+AI 파티 편성 JSON 파서 테스트
+- JSON 추출: 코드블록 / 앞뒤 설명 / 끝 쉼표 / 스마트·작은따옴표, 깨진 응답은 None
+- 검증: 모르는 이름 / 중복 제외, 빠진 길드원 / 인원 초과 보정, 인식 절반 미만이면 None
+- 서폿 분배: 한 파티에 몰린 서폿을 나눔 (입력 is_support 기준)
+- 일괄 응답 index, 스트리밍 미리보기
+
+실행: python -m pytest -q bot/tests/test_party_schema.py (저장소 루트)
+"""
+
+import json
+
+import pytest
+
+from bot.utils.party_schema import (
+    extract_json,
+    normalize_parties,
+    parse_batch_response,
+    parse_party_response,
+    preview_batch,
+    preview_parties,
+)
+
+DEALERS  = [("딜0", "워로드"), ("딜1", "소서리스"), ("딜2", "블레이드"),
+            ("딜3", "슬레이어"), ("딜4", "블래스터"), ("딜5", "디스트로이어")]
+SUPPORTS = [("폿0", "바드"), ("폿1", "홀리나이트")]
+
+
+@pytest.fixture
+def members():
+    return ([{"name": n, "character": j, "std_job": j, "is_support": False} for n, j in DEALERS]
+            + [{"name": n, "character": j, "std_job": j, "is_support": True} for n, j in SUPPORTS])
+
+
+def _response(*parties, notes=("노트",)) -> str:
+    return json.dumps({"parties": [{"members": [{"name": n} for n in p]} for p in parties],
+                      "synergy_notes": list(notes)}, ensure_ascii=False)
+
+
+def _names(result) -> list[list[str]]:
+    return [[m["name"] for m in party] for party in result["parties"]]
+
+
+def _support_counts(result) -> list[int]:
+    return [sum(m["is_support"] for m in party) for party in result["parties"]]
+
+
+# ==================== JSON 추출 ====================
+
+def test_extract_from_code_fence_with_prose():
+    text = '설명입니다\n```json\n{"parties": [], "synergy_notes": ["a"]}\n```\n끝'
+    assert extract_json(text) == {"parties": [], "synergy_notes": ["a"]}
+
+
+def test_extract_repairs_trailing_comma_and_quotes():
+    assert extract_json('{“parties”: [{"members": [{"name": "A"},]},],}') == {"parties": [{"members": [{"name": "A"}]}]}
+    assert extract_json("{'parties': [['A', 'B']]}") == {"parties": [["A", "B"]]}
+
+
+def test_extract_wraps_top_level_list():
+    assert extract_json('[["A"], ["B"]]') == {"parties": [["A"], ["B"]]}
+
+
+@pytest.mark.parametrize("text", [None, "", "편성할 수 없습니다", '{"parties": [', '{"a": "b" "c"}', "42"])
+def test_extract_malformed_returns_none(text):
+    assert extract_json(text) is None
+
+
+def test_parse_rejects_non_dict(members):
+    assert parse_party_response(None, members) is None
+    assert parse_party_response({"parties": "A,B"}, members) is None
+
+
+# ==================== 이름 / 인원 ====================
+
+def test_valid_response_unrepaired(members):
+    text   = _response(["딜0", "딜1", "딜2", "폿0"], ["딜3", "딜4", "딜5", "폿1"])
+    result = parse_party_response(extract_json(text), members, 4)
+    assert not result["repaired"]
+    assert _names(result) == [["딜0", "딜1", "딜2", "폿0"], ["딜3", "딜4", "딜5", "폿1"]]
+    assert result["synergy_notes"] == ["노트"]
+
+
+def test_unknown_and_duplicate_names_dropped(members):
+    text   = _response(["딜0", "누구", "딜1", "딜0", "폿0"], ["딜2", "딜3", "딜4", "딜5", "폿1"])
+    result = parse_party_response(extract_json(text), members, 4)
+    assert result["repaired"]
+    flat = [n for party in _names(result) for n in party]
+    assert sorted(flat) == sorted(m["name"] for m in members)
+    assert "누구" not in flat
+
+
+def test_character_label_accepted_as_name(members):
+    text   = _response(["워로드", "소서리스", "블레이드", "바드"], ["딜3", "딜4", "딜5", "폿1"])
+    result = parse_party_response(extract_json(text), members, 4)
+    assert _names(result)[0] == ["딜0", "딜1", "딜2", "폿0"]
+
+
+def test_missing_and_overflow_members_filled(members):
+    text   = _response(["딜0", "딜1", "딜2", "딜3", "딜4", "폿0"], ["폿1"])
+    result = parse_party_response(extract_json(text), members, 4)
+    assert result["repaired"]
+    assert sorted(len(p) for p in result["parties"]) == [4, 4]
+    assert sorted(n for p in _names(result) for n in p) == sorted(m["name"] for m in members)
+
+
+def test_too_few_recognised_returns_none(members):
+    assert parse_party_response(extract_json(_response(["딜0", "누구", "아무개"])), members, 4) is None
+
+
+# ==================== 서폿 분배 ====================
+
+def test_supports_in_one_party_are_split(members):
+    text   = _response(["딜0", "딜1", "폿0", "폿1"], ["딜2", "딜3", "딜4", "딜5"])
+    result = parse_party_response(extract_json(text), members, 4)
+    assert result["repaired"]
+    assert _support_counts(result) == [1, 1]
+    assert sorted(len(p) for p in result["parties"]) == [4, 4]
+
+
+def test_support_moves_into_free_slot(members):
+    result = normalize_parties([["딜0", "딜1", "폿0", "폿1"], ["딜2", "딜3", "딜4"]], members[:5] + members[6:], 4)
+    assert _support_counts(result) == [1, 1]
+    assert sorted(len(p) for p in result["parties"]) == [3, 4]
+
+
+def test_role_mismatch_marks_repaired(members):
+    data = {"parties": [
+        {"members": [{"name": "딜0", "role": "support"}, {"name": "딜1"}, {"name": "딜2"}, {"name": "폿0"}]},
+        {"members": [{"name": "딜3"}, {"name": "딜4"}, {"name": "딜5"}, {"name": "폿1", "role": "support"}]},
+    ]}
+    result = parse_party_response(data, members, 4)
+    assert result["repaired"] and _support_counts(result) == [1, 1]
+
+
+def test_uneven_supports_allowed_within_one(members):
+    extra  = members + [{"name": "폿2", "character": "도화가", "std_job": "도화가", "is_support": True}]
+    result = normalize_parties([["딜0", "딜1", "폿0", "폿2"], ["딜2", "딜3", "딜4", "폿1"], ["딜5"]], extra, 4)
+    assert sorted(_support_counts(result)) == [1, 1, 1]
+
+
+# ==================== 일괄 / 미리보기 ====================
+
+def test_batch_uses_index_and_skips_invalid(members):
+    raids = [{"raid_name": "카멘", "members": members[:4] + members[6:7]},
+             {"raid_name": "에기르", "members": members[4:6] + members[7:]}]
+    data = {"raids": [
+        {"index": 2, "parties": [{"members": [{"name": "딜4"}, {"name": "딜5"}, {"name": "폿1"}]}]},
+        {"index": 1, "parties": [{"members": [{"name": "누구"}]}]},
+        {"index": 9, "parties": []},
+    ]}
+    results = parse_batch_response(data, raids)
+    assert list(results) == [1]
+    assert _names(results[1]) == [["딜4", "딜5", "폿1"]]
+    assert parse_batch_response({"parties": []}, raids) == {}
+
+
+def test_preview_partial_json():
+    assert preview_parties('{"parties": [{"members": [{"name": "A"}, {"name": "B"}]}, {"members": [{"na') \
+        == [["A", "B"], []]
+    assert preview_batch('{"raids": [{"index": 1, "parties": [{"members": [{"name": "A"}]}]}, {"index": 2, "par') \
+        == {0: [["A"]], 1: []}
@@ -0,0 +1,70 @@
+"""
+레이드 메타데이터 해석 테스트 (raids.json 연결)
+- find_raid: 한글명 / 영문명 / 키 / 막 이름 / 약칭
+- resolve_raid: 난이도 토큰, 괄호 약어, 팀 번호, 붙여 쓴 한 글자 난이도("하기르")
+
+실행: python -m pytest -q bot/tests/test_raid_meta.py (저장소 루트)
+"""
+
+import pytest
+
+from bot.utils.raid_meta import find_raid, gate_rewards, resolve_raid
+
+
+@pytest.mark.parametrize("name, key", [
+    ("카멘",          "kamen"),
+    ("Kamen",         "kamen"),
+    ("ivory_tower",   "ivory_tower"),
+    ("혼돈의 상아탑", "ivory_tower"),
+    ("1막",           "aegir"),
+    ("아브렐 슈드",   "abrel_shud"),   # 카제로스 2막 (띄어쓰기 그대로)
+    ("아브렐슈드",    "brelshaza"),    # 군단장
+    ("아브렐",        "brelshaza"),
+    ("쿠크",          "kakul_saydon"),
+    ("베히",          "behemoth"),
+])
+def test_find_raid(name, key):
+    assert find_raid(name)["key"] == key
+
+
+def test_find_raid_unknown():
+    assert find_raid("없는레이드") is None
+    assert find_raid("") is None
+
+
+@pytest.mark.parametrize("name, key, difficulty", [
+    ("종막(노)",         "kazeros",      "normal"),
+    ("카멘 하드 2팀",    "kamen",        "hard"),
+    ("4막 하드",         "armoche",      "hard"),
+    ("세르카 나메",      "serca",        "nightmare"),
+    ("아브렐 하드",      "brelshaza",    "hard"),
+    ("아브렐(하)",       "brelshaza",    "hard"),
+    ("하기르",           "aegir",        "hard"),
+    ("노기르",           "aegir",        "normal"),
+    ("하기르 2팀",       "aegir",        "hard"),
+    ("노브",             "brelshaza",    "normal"),
+    ("하멘",             "kamen",        "hard"),
+    ("하탄",             "valtan",       "hard"),
+    ("하2막",            "abrel_shud",   "hard"),
+    ("하상아탑",         "ivory_tower",  "hard"),
+])
+def test_resolve_raid_difficulty(name, key, difficulty):
+    meta = resolve_raid(name)
+    assert (meta["key"], meta["difficulty"]) == (key, difficulty)
+
+
+def test_resolve_raid_defaults_to_normal():
+    assert resolve_raid("카멘")["difficulty"] == "normal"
+
+
+def test_resolve_raid_fields():
+    meta = resolve_raid("카멘 하드")
+    assert meta["capacity"] == 8 and meta["party_size"] == 4
+    assert meta["gold"] == sum(g for g, _ in meta["rewards"])
+    assert len(meta["rewards"]) == meta["gates"]
+
+
+def test_gate_rewards_order():
+    assert gate_rewards(find_raid("발탄")["difficulties"]["hard"]) == [(700, 450), (1100, 600)]
+    assert gate_rewards({"gold_total": 1000}) == [(1000, 0)]
+    assert gate_rewards({}) == []
@@ -0,0 +1,109 @@
+"""
+시너지 점수 커널 테스트
+- 직업/각인 → 시너지 마스크 (각인 필드 / 표시명 괄호 약어 / 홀나(폿)·(딜) 역할)
+- 사멸 딜러 + 선호 제공자 페어링
+- 파티 점수: 커버리지 가중치, 중복 감점, 서폿 수 감점
+
+실행: python -m pytest -q bot/tests/test_synergy_kernel.py (저장소 루트)
+"""
+
+import pytest
+
+from bot.utils.synergy_kernel import (
+    DUPLICATE_PENALTY,
+    SMITE_BONUS,
+    SUPPORT_PENALTY,
+    PartyKernel,
+    bits_of,
+    get_synergy_model,
+    popcount,
+)
+
+MODEL = get_synergy_model()
+
+
+def _member(name, job, character=None, support=False, **extra):
+    return {"name": name, "character": character or job, "std_job": job, "is_support": support, **extra}
+
+
+def _keys(member: dict) -> set:
+    return set(MODEL.keys_of(MODEL.features(member).mask))
+
+
+# ==================== 각인 / 역할 → 마스크 ====================
+
+@pytest.mark.parametrize("character, support", [("홀나(폿)", True), ("홀나", True), ("홀리나이트(은총)", True)])
+def test_holyknight_support_label_gets_aura(character, support):
+    keys = _keys(_member("a", "홀리나이트", character, support))
+    assert {"attack_power", "damage_amplification", "movement_speed"} <= keys
+    assert "crit_damage" not in keys
+
+
+@pytest.mark.parametrize("character", ["홀나(딜)", "홀리나이트(딜홀)"])
+def test_holyknight_dealer_label_gets_crit_damage(character):
+    member = _member("a", "홀리나이트", character)
+    feats  = MODEL.features(member)
+    assert _keys(member) == {"crit_damage"}
+    assert (feats.smite, feats.smite_weight) == ("back", 1.0)
+
+
+def test_engraving_field_overrides_label():
+    member = _member("a", "홀리나이트", "홀나(딜)", engraving="은총의 오라")
+    assert "crit_damage" not in _keys(member)
+
+
+def test_bard_role_split():
+    assert _keys(_member("a", "바드", "바드(딜)")) == {"attack_power"}
+    assert {"attack_power", "damage_amplification"} <= _keys(_member("a", "바드", "바드", True))
+
+
+def test_engraving_abbreviation_in_label():
+    assert _keys(_member("a", "워로드", "워로드(고기)")) == {"head_back_damage"}
+    assert "defense_reduction" in _keys(_member("a", "워로드", "워로드(전태)"))
+
+
+def test_unknown_engraving_falls_back_to_job_mask():
+    feats = MODEL.features(_member("a", "워로드"))
+    assert feats.mask == MODEL.job_mask["워로드"]
+    assert feats.smite_weight == 0.5   # 각인 모름 → 사멸 페어링 절반
+
+
+def test_unknown_job_has_no_synergy():
+    assert MODEL.features(_member("a", "없는직업")).mask == 0
+
+
+# ==================== 파티 점수 ====================
+
+def test_smite_pair_bonus():
+    members = [_member("고기", "워로드", "워로드(고기)"), _member("디트", "디스트로이어", "디스트로이어(중수)")]
+    kernel  = PartyKernel(members)
+    assert kernel.feats[1].smite == "head"
+    assert kernel.smite_pairs(0b11) == [1]
+    assert kernel.score(0b11) == pytest.approx(
+        kernel.score(0b01) + kernel.score(0b10) + SUPPORT_PENALTY + SMITE_BONUS * kernel.feats[1].smite_weight
+        - DUPLICATE_PENALTY * kernel.duplicates(0b11)
+    )
+
+
+def test_duplicate_penalty():
+    members = [_member("b1", "바드", support=True), _member("b2", "바드", support=True)]
+    kernel  = PartyKernel(members)
+    assert kernel.duplicates(0b11) == kernel.counts[0]
+    assert kernel.score(0b11) == pytest.approx(
+        MODEL.mask_weight[kernel.masks[0]] - DUPLICATE_PENALTY * kernel.counts[0] - SUPPORT_PENALTY
+    )
+
+
+def test_support_count_penalty():
+    members = [_member("딜1", "소서리스"), _member("딜2", "블래스터"), _member("폿", "바드", support=True)]
+    kernel  = PartyKernel(members)
+    without, with_support = kernel.score(0b011), kernel.score(0b111)
+    assert with_support > without
+    assert without <= MODEL.mask_weight[kernel.coverage(0b011)] - SUPPORT_PENALTY
+
+
+def test_score_many_and_bits():
+    members = [_member(f"m{i}", job) for i, job in enumerate(["워로드", "바드", "소서리스", "홀리나이트"])]
+    kernel  = PartyKernel(members)
+    assert kernel.score_many([0b0011, 0b1100]) == [kernel.score(0b0011), kernel.score(0b1100)]
+    assert bits_of(0b1010) == [1, 3] and popcount(0b1011) == 3
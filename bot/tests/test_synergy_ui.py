@@ -0,0 +1,41 @@
+"""
+시너지 체크박스 선택 → 시너지 분류 테스트
+- 각인 분리 직업은 선택값 각인 키(holyknight:judgment)로 각인별 마스크
+- 표시명 괄호가 각인 약어가 아닌 홀나(폿)/(딜)도 직업 전체 마스크로 떨어지지 않음
+
+실행: python -m pytest -q bot/tests/test_synergy_ui.py (저장소 루트)
+"""
+
+import pytest
+
+pytest.importorskip("discord")
+
+from bot.utils.synergy_ui import get_synergies_for_selection
+
+
+def test_holyknight_support_only_aura():
+    """홀나(폿) → 공증/피증/이속, 치피 없음"""
+    synergies = get_synergies_for_selection(["holyknight:blessing_aura"])
+    assert {"attack_power", "damage_amplification", "movement_speed"} <= set(synergies)
+    assert "crit_damage" not in synergies
+    assert synergies["attack_power"]["jobs"] == ["홀나(폿)"]
+
+
+def test_holyknight_dealer_only_crit_damage():
+    """홀나(딜) → 치피만"""
+    synergies = get_synergies_for_selection(["holyknight:judgment"])
+    assert set(synergies) == {"crit_damage"}
+    assert synergies["crit_damage"]["jobs"] == ["홀나(딜)"]
+
+
+def test_engraving_keys_split_masks():
+    """각인 약어로 구분되던 직업도 그대로 각인별"""
+    assert set(get_synergies_for_selection(["warlord:lonely_knight"])) == {"head_back_damage"}
+    assert "defense_reduction" in get_synergies_for_selection(["warlord:combat_readiness"])
+
+
+def test_both_holyknight_labels_kept_apart():
+    """홀나(폿)/(딜) 같이 선택 → 시너지별로 해당 표시명만"""
+    synergies = get_synergies_for_selection(["holyknight:judgment", "holyknight:blessing_aura"])
+    assert synergies["crit_damage"]["jobs"] == ["홀나(딜)"]
+    assert synergies["movement_speed"]["jobs"] == ["홀나(폿)"]
@@ -0,0 +1,125 @@
+"""
+주간 멀티 레이드 배정 테스트
+- 시간 겹침 / 같은 레이드(팀 번호 무시) 중복 / 주간 횟수 / 정원 제약을 어기지 않음
+- 불참 길드원 제외, 배정 못 한 사유
+- 입력이 같으면 이전 결과 재사용, 바뀌면 변경분 보고
+
+실행: python -m pytest -q bot/tests/test_week_scheduler.py (저장소 루트)
+"""
+
+from bot.config.settings import WEEKLY_CHARACTER_RAID_LIMIT
+from bot.utils.week_model import WeekModel
+from bot.utils.week_scheduler import WeekScheduler
+
+BUDGET_MS = 50
+
+
+def _raid(col, name, day, hour, duration=60, capacity=8, key=None):
+    raid = {'col': col, 'name': name, 'day': day, 'hour': hour, 'minute': 0,
+            'duration': duration, 'capacity': capacity}
+    if key:
+        raid['raid_key'] = key
+    return raid
+
+
+def _char(job, support=False, alt=False):
+    return {'raw': job, 'job': job, 'std_job': job, 'is_support': support, 'is_alt': alt}
+
+
+def _member(name, chars, absent=False):
+    return {'name': name, 'absent': absent, 'characters': chars}
+
+
+def _check_constraints(model: WeekModel, result: dict):
+    per_member: dict[str, list] = {}
+    per_char: dict[tuple, list] = {}
+    for col, members in result['assignments'].items():
+        assert len(members) <= model.raids[col]['capacity']
+        for m in members:
+            per_member.setdefault(m['name'], []).append(col)
+            per_char.setdefault(model.character_key(m['name'], col), []).append(col)
+    for cols in per_member.values():
+        for a in cols:
+            for b in cols:
+                assert a == b or not model.overlaps(a, b)
+    for cols in per_char.values():
+        assert len(cols) <= WEEKLY_CHARACTER_RAID_LIMIT
+        keys = [model.raids[c]['key'] for c in cols]
+        assert len(keys) == len(set(keys))
+
+
+def test_no_double_booking_in_overlapping_raids():
+    raids = [_raid(4, "카멘 하드 1팀", '수', 20, 120), _raid(5, "에기르", '수', 21)]
+    members = [_member(f"m{i}", {4: _char("워로드"), 5: _char("바드", support=True)}) for i in range(6)]
+    model  = WeekModel(raids, members)
+    result = WeekScheduler().solve(1, model, BUDGET_MS)
+
+    _check_constraints(model, result)
+    assigned = sum(len(m) for m in result['assignments'].values())
+    unassigned = [text for rows in result['unassigned'].values() for _, text in rows]
+    assert assigned == 6
+    assert all(text.startswith("시간 겹침") for text in unassigned)
+
+
+def test_same_raid_once_per_character_across_teams():
+    raids = [_raid(4, "카멘 하드 1팀", '수', 20), _raid(5, "카멘 하드 2팀", '목', 20)]
+    members = [_member("m0", {4: _char("워로드"), 5: _char("워로드")})]
+    model  = WeekModel(raids, members)
+    result = WeekScheduler().solve(1, model, BUDGET_MS)
+
+    _check_constraints(model, result)
+    assert sum(len(m) for m in result['assignments'].values()) == 1
+    (_, text), = [row for rows in result['unassigned'].values() for row in rows]
+    assert text.startswith("같은 레이드 중복")
+
+
+def test_alt_character_can_join_the_other_team():
+    raids = [_raid(4, "카멘 하드 1팀", '수', 20), _raid(5, "카멘 하드 2팀", '목', 20)]
+    members = [_member("m0", {4: _char("워로드"), 5: _char("워로드", alt=True)})]
+    result = WeekScheduler().solve(1, WeekModel(raids, members), BUDGET_MS)
+    assert [len(m) for m in result['assignments'].values()] == [1, 1]
+
+
+def test_weekly_limit_per_character():
+    names   = ["카멘", "에기르", "베히모스", "아브렐슈드", "카제로스", "모르둠"][:WEEKLY_CHARACTER_RAID_LIMIT + 1]
+    raids   = [_raid(4 + i, name, '수', 10 + 2 * i) for i, name in enumerate(names)]
+    members = [_member("m0", {r['col']: _char("워로드") for r in raids})]
+    model   = WeekModel(raids, members)
+    result  = WeekScheduler().solve(1, model, BUDGET_MS)
+
+    _check_constraints(model, result)
+    assert sum(len(m) for m in result['assignments'].values()) == WEEKLY_CHARACTER_RAID_LIMIT
+
+
+def test_capacity_and_absences():
+    raids   = [_raid(4, "베히모스", '목', 20, capacity=4)]
+    members = [_member(f"m{i}", {4: _char("바드" if i % 4 == 0 else "워로드", support=i % 4 == 0)})
+               for i in range(6)]
+    members.append(_member("away", {4: _char("워로드")}, absent=True))
+    model  = WeekModel(raids, members, absences={"m5"})
+    result = WeekScheduler().solve(1, model, BUDGET_MS)
+
+    names = [m['name'] for m in result['assignments'][4]]
+    assert len(names) == 4
+    assert "away" not in names and "m5" not in names
+    assert "m0" in names   # 서폿 1명 유지
+    assert {n for n, _ in result['unassigned'][4]} == {"m1", "m2", "m3", "m4"} - set(names)
+
+
+def test_reuse_and_incremental_changes():
+    raids   = [_raid(4, "카멘", '수', 20), _raid(5, "에기르", '목', 20)]
+    members = [_member(f"m{i}", {4: _char("워로드"), 5: _char("소서리스")}) for i in range(4)]
+    scheduler = WeekScheduler()
+    first = scheduler.solve(1, WeekModel(raids, members), BUDGET_MS)
+    assert not first['reused']
+
+    again = scheduler.solve(1, WeekModel(raids, members), BUDGET_MS)
+    assert again['reused'] and again['assignments'] == first['assignments']
+
+    members[0]['characters'].pop(4)
+    changed = scheduler.solve(1, WeekModel(raids, members), BUDGET_MS)
+    assert not changed['reused']
+    assert changed['changes'] == {4: {'added': [], 'removed': ["m0"]}}
+
+    scheduler.forget(1)
+    assert not scheduler.solve(1, WeekModel(raids, members), BUDGET_MS)['reused']
@@ -0,0 +1,91 @@
+"""
+로일(LoIl) - AI 응답 캐시
+입력(레이드 + 정렬된 길드원/직업/역할, 또는 정렬된 직업 목록)의 정규화 해시 → 응답 텍스트
+- 1차: 메모리 LRU (AI_CACHE_MAX_ENTRIES개)
+- 2차: SQLite 디스크 (api_cache.PersistentCache 재사용, 재시작 후에도 유지)
+- TTL(AI_CACHE_TTL_HOURS) 지나면 무시
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from bot.config.settings import AI_CACHE_DB, AI_CACHE_TTL_HOURS, AI_CACHE_MAX_ENTRIES
+from bot.utils.api_cache import PersistentCache
+
+
+def make_cache_key(kind: str, payload) -> str:
+    """
+    정규화된 입력 → 캐시 키
+    호출 측에서 목록을 정렬해 넘기면 순서가 달라도 같은 키
+
+    Example:
+        >>> make_cache_key("synergy", sorted(["바드", "리퍼"]))
+        'synergy:3f0c...'
+    """
+    raw = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return f"{kind}:{hashlib.sha256(raw.encode('utf-8')).hexdigest()}"
+
+
+class AIResponseCache:
+    """메모리 LRU + 디스크 2단 캐시"""
+
+    def __init__(self, db_path=AI_CACHE_DB, ttl_seconds: float = AI_CACHE_TTL_HOURS * 3600,
+                 max_entries: int = AI_CACHE_MAX_ENTRIES):
+        self.ttl         = ttl_seconds
+        self.max_entries = max_entries
+        self._memory: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._lock  = threading.Lock()
+        self._disk  = PersistentCache(db_path)
+        self.hits   = 0
+        self.misses = 0
+
+    def _remember(self, key: str, text: str, stored_at: float):
+        with self._lock:
+            self._memory[key] = (text, stored_at)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[str]:
+        """캐시된 응답 (없거나 만료 시 None)"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry and now - entry[1] < self.ttl:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry:
+                del self._memory[key]
+
+        stored = self._disk.get(key, max_age=self.ttl)
+        if stored:
+            text, age = stored
+            self._remember(key, text, now - age)
+            self.hits += 1
+            return text
+
+        self.misses += 1
+        return None
+
+    def set(self, key: str, text: str):
+        now = time.time()
+        self._remember(key, text, now)
+        self._disk.set(key, text, fetched_at=now)
+
+    def clear(self) -> int:
+        """전체 삭제. 삭제 개수 반환"""
+        with self._lock:
+            self._memory.clear()
+        return self._disk.clear()
+
+    def stats(self) -> dict:
+        return {"memory": len(self._memory), "disk": self._disk.size(),
+                "hits": self.hits, "misses": self.misses}
+
+
+ai_cache = AIResponseCache()
@@ -0,0 +1,338 @@
+"""
+로일(LoIl) - 비동기 Gemini 클라이언트
+- API 키별 GenerativeModel 재사용 (genai.configure 반복 호출 제거)
+- generate_content_async 사용 → 이벤트 루프 블로킹 없음
+- 전체 동시 요청 수 제한 + 길드별 상한 (한 길드가 슬롯 독점 방지)
+- 요청별 타임아웃
+- stream(): 응답을 생성되는 대로 조각 단위로 전달 (디스코드 메시지 점진 수정용)
+
+키 라우팅:
+- 길드 전용 키(guild_settings.json의 gemini_api_key)가 있으면 우선 사용
+- 없거나 전용 키가 한도에 걸리면 공용 키(GEMINI_API_KEY) 사용 - 길드당 분당 상한 적용
+- 키별 분당 요청 수(GEMINI_KEY_RPM) 초과 / 429 응답 → 실패 대신 대기열에서 대기 후 재시도
+"""
+
+import asyncio
+import re
+import threading
+import time
+from collections import deque
+from typing import AsyncIterator, Optional
+
+import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
+from google.generativeai import client as genai_client
+
+from bot.config.settings import (
+    GEMINI_API_KEY,
+    GEMINI_API_ENDPOINT,
+    GEMINI_MODEL,
+    GEMINI_MAX_TOKENS,
+    GEMINI_CONCURRENCY,
+    GEMINI_GUILD_CONCURRENCY,
+    GEMINI_TIMEOUT,
+    GEMINI_KEY_RPM,
+    GEMINI_SHARED_GUILD_RPM,
+    GEMINI_QUEUE_TIMEOUT,
+    GEMINI_RATE_LIMIT_COOLDOWN,
+)
+from bot.utils.member_link import load_settings
+
+_RATE_LIMIT_ERRORS = (google_exceptions.ResourceExhausted, google_exceptions.TooManyRequests)
+
+
+class AIError(Exception):
+    """AI 호출 실패 (키 미설정 등)"""
+
+
+# ==================== 토큰 추정 ====================
+
+_HANGUL = re.compile(r"[가-힣ㄱ-ㅎㅏ-ㅣ]")
+
+
+def estimate_tokens(text: str) -> int:
+    """토큰 수 추정 (한글 ≈ 글자당 1토큰, 그 외 ≈ 4글자당 1토큰)"""
+    if not text:
+        return 0
+    hangul = len(_HANGUL.findall(text))
+    return hangul + (len(text) - hangul + 3) // 4
+
+
+# ==================== 키별 사용량 ====================
+
+class KeyQuota:
+    """키 1개의 분당 요청 예산 + 누적 사용량"""
+
+    def __init__(self, rpm: int):
+        self.rpm           = rpm
+        self.calls         = deque()
+        self.blocked_until = 0.0
+        self.requests      = 0
+        self.tokens        = 0
+        self.rate_limited  = 0
+
+    def wait_time(self, now: float) -> float:
+        """지금 요청하려면 기다려야 하는 시간(초). 0이면 즉시 가능"""
+        while self.calls and now - self.calls[0] >= 60:
+            self.calls.popleft()
+        wait = max(self.blocked_until - now, 0.0)
+        if len(self.calls) >= self.rpm:
+            wait = max(wait, 60 - (now - self.calls[0]))
+        return wait
+
+    def take(self, now: float):
+        self.calls.append(now)
+        self.requests += 1
+
+    def block(self, seconds: float):
+        """429 수신 → seconds 동안 이 키 사용 중지"""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+        self.rate_limited += 1
+
+    def remaining(self, now: float) -> int:
+        self.wait_time(now)
+        return max(self.rpm - len(self.calls), 0)
+
+
+def _mask(key: str) -> str:
+    return f"…{key[-4:]}" if key else "-"
+
+
+def _chunk_text(chunk) -> str:
+    """스트림 조각 텍스트 (안전 필터 / 종료 조각처럼 텍스트가 없으면 빈 문자열)"""
+    try:
+        return chunk.text
+    except ValueError:
+        return ""
+
+
+# ==================== 클라이언트 ====================
+
+class GeminiClient:
+    """키별 모델 캐시 + 동시성 제한 + 키 라우팅"""
+
+    def __init__(self, model_name: str = GEMINI_MODEL, concurrency: int = GEMINI_CONCURRENCY,
+                 per_guild: int = GEMINI_GUILD_CONCURRENCY, timeout: float = GEMINI_TIMEOUT,
+                 endpoint: Optional[str] = GEMINI_API_ENDPOINT):
+        self.model_name  = model_name
+        self.endpoint    = endpoint   # 로컬 대역 서버 (None이면 실제 API)
+        self.concurrency = concurrency
+        self.per_guild   = per_guild
+        self.timeout     = timeout
+        self._models: dict[str, genai.GenerativeModel] = {}
+        self._model_lock = threading.Lock()
+        self._global: Optional[asyncio.Semaphore] = None
+        self._guilds: dict[int, asyncio.Semaphore] = {}
+        self._quotas: dict[str, KeyQuota] = {}
+        self._shared_usage: dict[int, KeyQuota] = {}   # 공용 키의 길드별 상한
+
+    def _model(self, api_key: str) -> genai.GenerativeModel:
+        """
+        키별 모델 (최초 1회 생성)
+        genai.configure는 전역 설정이라, 생성 직후 해당 키의 클라이언트를 모델에 고정
+        """
+        model = self._models.get(api_key)
+        if model is not None:
+            return model
+        with self._model_lock:
+            model = self._models.get(api_key)
+            if model is None:
+                genai.configure(
+                    api_key=api_key,
+                    client_options={"api_endpoint": self.endpoint} if self.endpoint else None,
+                )
+                model = genai.GenerativeModel(
+                    self.model_name,
+                    generation_config={"max_output_tokens": GEMINI_MAX_TOKENS},
+                )
+                model._async_client = genai_client.get_default_generative_async_client()
+                self._models[api_key] = model
+        return model
+
+    def _slots(self, guild_id: int) -> tuple[asyncio.Semaphore, asyncio.Semaphore]:
+        """(길드 세마포어, 전체 세마포어) - 이벤트 루프 안에서 생성"""
+        if self._global is None:
+            self._global = asyncio.Semaphore(self.concurrency)
+        guild = self._guilds.get(guild_id)
+        if guild is None:
+            guild = self._guilds[guild_id] = asyncio.Semaphore(self.per_guild)
+        return guild, self._global
+
+    def _quota(self, api_key: str) -> KeyQuota:
+        quota = self._quotas.get(api_key)
+        if quota is None:
+            quota = self._quotas[api_key] = KeyQuota(GEMINI_KEY_RPM)
+        return quota
+
+    def _candidates(self, api_key: Optional[str], guild_id: int) -> list[tuple[str, bool]]:
+        """사용할 키 후보 [(키, 공용 여부)] - 전용 키 우선"""
+        own = api_key or load_settings().get(str(guild_id), {}).get("gemini_api_key", "")
+        candidates = []
+        if own and own != GEMINI_API_KEY:
+            candidates.append((own, False))
+        if GEMINI_API_KEY:
+            candidates.append((GEMINI_API_KEY, True))
+        return candidates
+
+    def has_key(self, api_key: Optional[str] = None, guild_id: int = 0) -> bool:
+        """이 길드가 쓸 수 있는 키가 있는지"""
+        return bool(self._candidates(api_key, guild_id))
+
+    def _wait_time(self, key: str, shared: bool, guild_id: int, now: float) -> float:
+        wait = self._quota(key).wait_time(now)
+        if shared:
+            usage = self._shared_usage.get(guild_id)
+            if usage is None:
+                usage = self._shared_usage[guild_id] = KeyQuota(GEMINI_SHARED_GUILD_RPM)
+            wait = max(wait, usage.wait_time(now))
+        return wait
+
+    async def _acquire_key(self, candidates: list, guild_id: int, deadline: float) -> tuple[str, bool]:
+        """예산이 남은 키가 생길 때까지 대기 (대기열). deadline 초과 시 TimeoutError"""
+        while True:
+            now = time.monotonic()
+            waits = [(self._wait_time(k, shared, guild_id, now), i)
+                     for i, (k, shared) in enumerate(candidates)]
+            wait, i = min(waits)
+            if wait <= 0:
+                key, shared = candidates[i]
+                self._quota(key).take(now)
+                if shared:
+                    self._shared_usage[guild_id].take(now)
+                return key, shared
+            if now + wait > deadline:
+                raise asyncio.TimeoutError()
+            await asyncio.sleep(wait)
+
+    def _prepare(self, api_key: Optional[str], guild_id: int, timeout: Optional[float],
+                 max_output_tokens: Optional[int]) -> tuple[list, dict, float]:
+        """요청 공통 준비 → (키 후보, generate 옵션, 타임아웃)"""
+        candidates = self._candidates(api_key, guild_id)
+        if not candidates:
+            raise AIError("Gemini API 키가 설정되지 않았습니다.")
+
+        options = {}
+        timeout = timeout or self.timeout
+        if max_output_tokens:
+            options["generation_config"] = {"max_output_tokens": max_output_tokens}
+            # 긴 응답은 그만큼 오래 걸림
+            timeout *= min(max(max_output_tokens / GEMINI_MAX_TOKENS, 1), 4)
+        return candidates, options, timeout
+
+    async def generate(self, prompt: str, api_key: Optional[str] = None, guild_id: int = 0,
+                       timeout: Optional[float] = None, max_output_tokens: Optional[int] = None) -> str:
+        """
+        프롬프트 → 응답 텍스트
+
+        길드 슬롯을 먼저 잡고 전체 슬롯을 기다림
+        → 한 길드의 대기 요청이 전체 대기열을 채우지 않음
+        429(할당량 초과)는 해당 키를 잠시 막고 대기열로 돌아가 재시도
+
+        Args:
+            api_key: 길드 전용 키 (None이면 길드 설정에서 조회)
+            guild_id: 길드 ID (키 라우팅 / 동시성 제한 단위)
+            timeout: 응답 대기 시간(초)
+            max_output_tokens: 응답 토큰 상한 (기본 GEMINI_MAX_TOKENS)
+
+        Raises:
+            AIError:              API 키 없음
+            asyncio.TimeoutError: 대기열(GEMINI_QUEUE_TIMEOUT) 또는 응답 timeout 초과
+        """
+        candidates, options, timeout = self._prepare(api_key, guild_id, timeout, max_output_tokens)
+
+        deadline = time.monotonic() + GEMINI_QUEUE_TIMEOUT
+        guild_slot, global_slot = self._slots(guild_id)
+        async with guild_slot:
+            while True:
+                key, shared = await self._acquire_key(candidates, guild_id, deadline)
+                model = self._model(key)
+                try:
+                    async with global_slot:
+                        response = await asyncio.wait_for(
+                            model.generate_content_async(prompt, **options), timeout
+                        )
+                except _RATE_LIMIT_ERRORS:
+                    print(f"[ai_client] 할당량 초과 - 대기 후 재시도 (키 {_mask(key)})")
+                    self._quota(key).block(GEMINI_RATE_LIMIT_COOLDOWN)
+                    continue
+                text = response.text
+                self._quota(key).tokens += estimate_tokens(prompt) + estimate_tokens(text)
+                return text
+
+    async def stream(self, prompt: str, api_key: Optional[str] = None, guild_id: int = 0,
+                     timeout: Optional[float] = None,
+                     max_output_tokens: Optional[int] = None) -> AsyncIterator[str]:
+        """
+        프롬프트 → 응답 텍스트 조각 (생성되는 대로)
+
+        키 라우팅 / 슬롯 / 대기열은 generate와 동일, 슬롯은 스트림이 끝날 때까지 유지
+        → 끝까지 소비하지 않을 거면 aclose() 호출
+        timeout은 조각 사이 최대 대기 시간 (전체 생성 시간이 아님)
+        첫 조각 전 429는 재시도, 조각을 보낸 뒤의 오류는 그대로 전달 (이어 붙일 수 없음)
+
+        Example:
+            >>> parts = []
+            >>> async for chunk in ai_client.stream(prompt, guild_id=guild_id):
+            ...     parts.append(chunk)
+            ...     await live.update("".join(parts))
+        """
+        candidates, options, timeout = self._prepare(api_key, guild_id, timeout, max_output_tokens)
+
+        deadline = time.monotonic() + GEMINI_QUEUE_TIMEOUT
+        guild_slot, global_slot = self._slots(guild_id)
+        async with guild_slot:
+            while True:
+                key, shared = await self._acquire_key(candidates, guild_id, deadline)
+                model = self._model(key)
+                received = []
+                try:
+                    async with global_slot:
+                        response = await asyncio.wait_for(
+                            model.generate_content_async(prompt, stream=True, **options), timeout
+                        )
+                        chunks = response.__aiter__()
+                        while True:
+                            try:
+                                chunk = await asyncio.wait_for(chunks.__anext__(), timeout)
+                            except StopAsyncIteration:
+                                break
+                            text = _chunk_text(chunk)
+                            if text:
+                                received.append(text)
+                                yield text
+                except _RATE_LIMIT_ERRORS:
+                    self._quota(key).block(GEMINI_RATE_LIMIT_COOLDOWN)
+                    if received:
+                        raise
+                    print(f"[ai_client] 할당량 초과 - 대기 후 재시도 (키 {_mask(key)})")
+                    continue
+                self._quota(key).tokens += estimate_tokens(prompt) + estimate_tokens("".join(received))
+                return
+
+    def stats(self) -> dict:
+        """
+        현재 상태
+
+        Returns:
+            {
+                'models': int, 'in_use': int, 'limit': int,
+                'keys': [{ key, shared, requests, tokens, rate_limited, remaining }]
+            }
+        """
+        now    = time.monotonic()
+        in_use = self.concurrency - self._global._value if self._global else 0
+        keys   = [
+            {
+                "key":          _mask(key),
+                "shared":       key == GEMINI_API_KEY,
+                "requests":     q.requests,
+                "tokens":       q.tokens,
+                "rate_limited": q.rate_limited,
+                "remaining":    q.remaining(now),
+            }
+            for key, q in self._quotas.items()
+        ]
+        return {"models": len(self._models), "in_use": in_use, "limit": self.concurrency, "keys": keys}
+
+
+ai_client = GeminiClient()
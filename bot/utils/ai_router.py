@@ -0,0 +1,374 @@
+"""
+로일(LoIl) - AI 제공자 라우팅
+Gemini(메인) / Groq(백업)를 같은 인터페이스(generate / stream)로 감싸고
+제공자별 상태와 최근 지연 시간(p50/p95)을 기준으로 요청을 보냄
+
+- 순위: 정상 제공자 중 p50이 낮은 순 (표본 부족 시 AI_PROVIDER_ORDER 순)
+- 실패 시 다음 제공자로 대체, 연속 실패 AI_PROVIDER_FAIL_THRESHOLD회 → AI_PROVIDER_COOLDOWN초 제외
+- 헤지: 1순위 응답이 자기 p95를 넘기면 2순위에 같은 요청 → 먼저 온 응답 사용, 나머지 취소
+- 스트리밍은 헤지하지 않음 (첫 조각 전 실패만 다음 제공자로 대체)
+- 로컬 대역 서버: GEMINI_API_ENDPOINT / GROQ_BASE_URL (오프라인 테스트)
+"""
+
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import TYPE_CHECKING, AsyncIterator, Optional
+
+from bot.config.settings import (
+    GEMINI_MAX_TOKENS,
+    GEMINI_TIMEOUT,
+    GROQ_API_KEY,
+    GROQ_MODEL,
+    GROQ_BASE_URL,
+    GROQ_CONCURRENCY,
+    AI_PROVIDER_ORDER,
+    AI_LATENCY_WINDOW,
+    AI_LATENCY_MIN_SAMPLES,
+    AI_HEDGE_ENABLED,
+    AI_HEDGE_MIN_DELAY,
+    AI_PROVIDER_FAIL_THRESHOLD,
+    AI_PROVIDER_COOLDOWN,
+)
+from bot.utils.ai_client import AIError, ai_client
+
+if TYPE_CHECKING:
+    from groq import AsyncGroq
+
+
+# ==================== 지연 시간 / 상태 ====================
+
+class LatencyWindow:
+    """최근 N건 지연 시간(ms) - 분위수는 조회 시 정렬 (N이 작아 충분히 빠름)"""
+
+    def __init__(self, size: int = AI_LATENCY_WINDOW):
+        self.samples = deque(maxlen=size)
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    def observe(self, ms: float):
+        self.samples.append(ms)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """근사 분위수 (ms). 표본 AI_LATENCY_MIN_SAMPLES개 미만이면 None"""
+        if len(self.samples) < AI_LATENCY_MIN_SAMPLES:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+class ProviderHealth:
+    """연속 실패 기반 제외 (쿨다운이 지나면 다시 시도, 또 실패하면 바로 제외)"""
+
+    def __init__(self):
+        self.failures       = 0
+        self.disabled_until = 0.0
+        self.successes      = 0
+        self.errors         = 0
+        self.last_error     = ""
+
+    def healthy(self, now: float) -> bool:
+        return now >= self.disabled_until
+
+    def success(self):
+        self.failures  = 0
+        self.successes += 1
+
+    def failure(self, error: Exception):
+        self.failures   += 1
+        self.errors     += 1
+        self.last_error = f"{type(error).__name__}: {error}"[:200]
+        if self.failures >= AI_PROVIDER_FAIL_THRESHOLD:
+            self.disabled_until = time.monotonic() + AI_PROVIDER_COOLDOWN
+
+
+# ==================== 제공자 ====================
+
+class Provider(ABC):
+    """
+    제공자 공통 (상태 / 지연 시간 기록)
+    하위 클래스: available / generate / stream 구현
+    """
+
+    name = ""
+
+    def __init__(self):
+        self.latency = LatencyWindow()
+        self.health  = ProviderHealth()
+
+    @abstractmethod
+    def available(self, api_key: Optional[str], guild_id: int) -> bool:
+        """이 요청(길드 키 여부)에 쓸 수 있는지"""
+
+    @abstractmethod
+    async def generate(self, prompt: str, api_key: Optional[str] = None, guild_id: int = 0,
+                       timeout: Optional[float] = None, max_output_tokens: Optional[int] = None) -> str:
+        """프롬프트 → 응답 텍스트"""
+
+    @abstractmethod
+    def stream(self, prompt: str, api_key: Optional[str] = None, guild_id: int = 0,
+               timeout: Optional[float] = None, max_output_tokens: Optional[int] = None) -> AsyncIterator[str]:
+        """프롬프트 → 응답 텍스트 조각 (async generator)"""
+
+    def hedge_delay(self) -> Optional[float]:
+        """헤지 요청까지 대기 시간(초) = p95 (표본 부족이면 None → 헤지 안 함)"""
+        p95 = self.latency.quantile(0.95)
+        return None if p95 is None else max(p95 / 1000, AI_HEDGE_MIN_DELAY)
+
+    def record_success(self, elapsed_ms: float):
+        self.latency.observe(elapsed_ms)
+        self.health.success()
+
+    def record_failure(self, error: Exception):
+        self.health.failure(error)
+        print(f"[ai_router] {self.name} 실패: {error}")
+
+    def stats(self) -> dict:
+        return {
+            "name":       self.name,
+            "healthy":    self.health.healthy(time.monotonic()),
+            "samples":    len(self.latency),
+            "p50_ms":     self.latency.quantile(0.5),
+            "p95_ms":     self.latency.quantile(0.95),
+            "successes":  self.health.successes,
+            "errors":     self.health.errors,
+            "last_error": self.health.last_error,
+        }
+
+
+class GeminiProvider(Provider):
+    """ai_client(GeminiClient) 어댑터 - 키 라우팅 / 할당량 대기열은 ai_client가 처리"""
+
+    name = "gemini"
+
+    def __init__(self, client=ai_client):
+        super().__init__()
+        self.client = client
+
+    def available(self, api_key: Optional[str], guild_id: int) -> bool:
+        return self.client.has_key(api_key, guild_id)
+
+    async def generate(self, prompt, api_key=None, guild_id=0, timeout=None, max_output_tokens=None) -> str:
+        return await self.client.generate(prompt, api_key, guild_id, timeout, max_output_tokens)
+
+    def stream(self, prompt, api_key=None, guild_id=0, timeout=None, max_output_tokens=None):
+        return self.client.stream(prompt, api_key, guild_id, timeout, max_output_tokens)
+
+
+class GroqProvider(Provider):
+    """
+    Groq 어댑터 (공용 키 1개, 길드 키 없음)
+    base_url을 지정하면 OpenAI 호환 로컬 서버로 요청
+    groq 패키지는 첫 요청 때 import (백업 제공자라 설치되지 않아도 봇은 동작)
+    """
+
+    name = "groq"
+
+    def __init__(self, api_key: Optional[str] = GROQ_API_KEY, model: str = GROQ_MODEL,
+                 base_url: Optional[str] = GROQ_BASE_URL, concurrency: int = GROQ_CONCURRENCY,
+                 timeout: float = GEMINI_TIMEOUT):
+        super().__init__()
+        self.api_key     = api_key
+        self.model       = model
+        self.base_url    = base_url
+        self.concurrency = concurrency
+        self.timeout     = timeout
+        self._client: Optional["AsyncGroq"] = None
+        self._slot: Optional[asyncio.Semaphore] = None
+
+    def available(self, api_key: Optional[str], guild_id: int) -> bool:
+        return bool(self.api_key)
+
+    def _connect(self) -> tuple["AsyncGroq", asyncio.Semaphore]:
+        """클라이언트 / 세마포어 (이벤트 루프 안에서 최초 1회 생성, 재시도는 라우터가 담당)"""
+        if self._client is None:
+            from groq import AsyncGroq
+            self._client = AsyncGroq(api_key=self.api_key, base_url=self.base_url, max_retries=0)
+            self._slot   = asyncio.Semaphore(self.concurrency)
+        return self._client, self._slot
+
+    def _request(self, prompt: str, max_output_tokens: Optional[int], **extra) -> dict:
+        return {
+            "model":      self.model,
+            "messages":   [{"role": "user", "content": prompt}],
+            "max_tokens": max_output_tokens or GEMINI_MAX_TOKENS,
+            **extra,
+        }
+
+    async def generate(self, prompt, api_key=None, guild_id=0, timeout=None, max_output_tokens=None) -> str:
+        client, slot = self._connect()
+        async with slot:
+            response = await asyncio.wait_for(
+                client.chat.completions.create(**self._request(prompt, max_output_tokens)),
+                timeout or self.timeout,
+            )
+        return response.choices[0].message.content or ""
+
+    async def stream(self, prompt, api_key=None, guild_id=0, timeout=None, max_output_tokens=None):
+        client, slot = self._connect()
+        timeout = timeout or self.timeout
+        async with slot:
+            response = await asyncio.wait_for(
+                client.chat.completions.create(**self._request(prompt, max_output_tokens, stream=True)),
+                timeout,
+            )
+            chunks = response.__aiter__()
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(chunks.__anext__(), timeout)
+                except StopAsyncIteration:
+                    break
+                text = chunk.choices[0].delta.content if chunk.choices else None
+                if text:
+                    yield text
+
+
+# ==================== 라우터 ====================
+
+class AIRouter:
+    """제공자 순위 결정 + 대체 + 헤지"""
+
+    def __init__(self, providers: list[Provider], hedge: bool = AI_HEDGE_ENABLED):
+        self.providers = providers
+        self.hedge     = hedge
+        self.hedged    = 0   # 헤지 요청 수
+        self.hedge_won = 0   # 헤지 요청이 먼저 응답한 수
+
+    def _order(self, api_key: Optional[str], guild_id: int) -> list[Provider]:
+        """
+        쓸 수 있는 제공자 시도 순서
+        정상 제공자(p50 오름차순, 표본 부족이면 기본 우선순위) → 제외 중인 제공자(복귀 임박 순, 최후 수단)
+        """
+        now  = time.monotonic()
+        rank = {name: i for i, name in enumerate(AI_PROVIDER_ORDER)}
+        usable = [p for p in self.providers if p.available(api_key, guild_id)]
+
+        def key(p: Provider):
+            p50 = p.latency.quantile(0.5)
+            return (float("inf") if p50 is None else p50, rank.get(p.name, len(rank)))
+
+        healthy  = sorted((p for p in usable if p.health.healthy(now)), key=key)
+        disabled = sorted((p for p in usable if not p.health.healthy(now)),
+                          key=lambda p: p.health.disabled_until)
+        return healthy + disabled
+
+    def available(self, api_key: Optional[str] = None, guild_id: int = 0) -> bool:
+        return any(p.available(api_key, guild_id) for p in self.providers)
+
+    async def _call(self, provider: Provider, prompt: str, kwargs: dict) -> str:
+        start = time.perf_counter()
+        try:
+            text = await provider.generate(prompt, **kwargs)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            provider.record_failure(e)
+            raise
+        provider.record_success((time.perf_counter() - start) * 1000)
+        return text
+
+    async def _race(self, primary: Provider, backup: Optional[Provider], prompt: str,
+                    kwargs: dict, tried: list) -> str:
+        """
+        primary 요청, p95 안에 응답이 없으면 backup에도 요청 → 먼저 성공한 응답
+        둘 다 실패하면 마지막 예외를 그대로 올림
+        """
+        tasks = {asyncio.create_task(self._call(primary, prompt, kwargs)): primary}
+        tried.append(primary)
+        delay = primary.hedge_delay() if backup else None
+        error: Optional[BaseException] = None
+        try:
+            while tasks:
+                done, _ = await asyncio.wait(
+                    tasks, timeout=delay if backup not in tried else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    print(f"[ai_router] {primary.name} p95({delay:.1f}초) 초과 → {backup.name} 헤지 요청")
+                    self.hedged += 1
+                    tasks[asyncio.create_task(self._call(backup, prompt, kwargs))] = backup
+                    tried.append(backup)
+                    continue
+                for task in done:
+                    provider = tasks.pop(task)
+                    if task.exception() is None:
+                        if provider is backup:
+                            self.hedge_won += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def generate(self, prompt: str, api_key: Optional[str] = None, guild_id: int = 0,
+                       timeout: Optional[float] = None, max_output_tokens: Optional[int] = None) -> str:
+        """
+        프롬프트 → 응답 텍스트 (ai_client.generate와 같은 인터페이스)
+
+        Raises:
+            AIError: 쓸 수 있는 제공자 없음
+            마지막 제공자의 예외 (전부 실패)
+        """
+        remaining = self._order(api_key, guild_id)
+        if not remaining:
+            raise AIError("AI API 키가 설정되지 않았습니다.")
+
+        kwargs = {"api_key": api_key, "guild_id": guild_id,
+                  "timeout": timeout, "max_output_tokens": max_output_tokens}
+        error: Optional[BaseException] = None
+        while remaining:
+            tried   = []
+            primary = remaining[0]
+            backup  = remaining[1] if self.hedge and len(remaining) > 1 else None
+            try:
+                return await self._race(primary, backup, prompt, kwargs, tried)
+            except Exception as e:
+                error = e
+            remaining = [p for p in remaining if p not in tried]
+        raise error
+
+    async def stream(self, prompt: str, api_key: Optional[str] = None, guild_id: int = 0,
+                     timeout: Optional[float] = None,
+                     max_output_tokens: Optional[int] = None) -> AsyncIterator[str]:
+        """
+        프롬프트 → 응답 텍스트 조각 (ai_client.stream과 같은 인터페이스)
+        첫 조각 전 실패는 다음 제공자로 대체, 이후 실패는 그대로 전달
+        """
+        order = self._order(api_key, guild_id)
+        if not order:
+            raise AIError("AI API 키가 설정되지 않았습니다.")
+
+        for i, provider in enumerate(order):
+            start    = time.perf_counter()
+            received = False
+            chunks   = provider.stream(prompt, api_key, guild_id, timeout, max_output_tokens)
+            try:
+                async for chunk in chunks:
+                    received = True
+                    yield chunk
+            except Exception as e:
+                provider.record_failure(e)
+                if received or i == len(order) - 1:
+                    raise
+                continue
+            finally:
+                await chunks.aclose()
+            provider.record_success((time.perf_counter() - start) * 1000)
+            return
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            { 'providers': [Provider.stats()], 'hedged': int, 'hedge_won': int }
+        """
+        return {
+            "providers": [p.stats() for p in self.providers],
+            "hedged":    self.hedged,
+            "hedge_won": self.hedge_won,
+        }
+
+
+ai_router = AIRouter([GeminiProvider(), GroqProvider()])
@@ -0,0 +1,131 @@
+"""
+로일(LoIl) - 로스트아크 API 디스크 캐시
+SQLite 기반 영구 캐시 (봇 재시작/배포 후에도 유지)
+- 응답 본문 + 조회 시각(fetched_at) 저장
+- 신선/스테일 판단은 호출 측(lostark_api)에서 age 기준으로 처리
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+
+# ==================== SQLite 응답 캐시 ====================
+
+class PersistentCache:
+    """엔드포인트 → 응답 본문 영구 캐시"""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._lock   = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """최초 사용 시 DB 생성 (import 시점엔 파일을 만들지 않음)"""
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "  endpoint   TEXT PRIMARY KEY,"
+                "  body       TEXT NOT NULL,"
+                "  fetched_at REAL NOT NULL"
+                ")"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str, max_age: Optional[float] = None) -> Optional[tuple]:
+        """
+        캐시 조회
+
+        Args:
+            key:     엔드포인트
+            max_age: 허용 최대 경과 시간(초). None이면 제한 없음
+
+        Returns:
+            (data, age_seconds) 또는 None
+        """
+        try:
+            with self._lock:
+                row = self._connect().execute(
+                    "SELECT body, fetched_at FROM responses WHERE endpoint = ?", (key,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            print(f"[api_cache] 조회 오류: {e}")
+            return None
+
+        if not row:
+            return None
+
+        body, fetched_at = row
+        age = time.time() - fetched_at
+        if max_age is not None and age > max_age:
+            return None
+        try:
+            return json.loads(body), age
+        except json.JSONDecodeError:
+            return None
+
+    def set(self, key: str, data, fetched_at: Optional[float] = None):
+        """응답 저장 (같은 엔드포인트는 덮어쓰기)"""
+        try:
+            body = json.dumps(data, ensure_ascii=False)
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (endpoint, body, fetched_at) VALUES (?, ?, ?)",
+                    (key, body, fetched_at or time.time())
+                )
+                conn.commit()
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            print(f"[api_cache] 저장 오류: {e}")
+
+    def delete(self, key: str):
+        """단일 항목 삭제"""
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute("DELETE FROM responses WHERE endpoint = ?", (key,))
+                conn.commit()
+        except sqlite3.Error as e:
+            print(f"[api_cache] 삭제 오류: {e}")
+
+    def purge(self, max_age: float) -> int:
+        """max_age(초)보다 오래된 항목 삭제. 삭제 개수 반환"""
+        try:
+            with self._lock:
+                conn = self._connect()
+                cur  = conn.execute(
+                    "DELETE FROM responses WHERE fetched_at < ?", (time.time() - max_age,)
+                )
+                conn.commit()
+                return cur.rowcount
+        except sqlite3.Error as e:
+            print(f"[api_cache] 정리 오류: {e}")
+            return 0
+
+    def clear(self) -> int:
+        """전체 삭제. 삭제 개수 반환"""
+        try:
+            with self._lock:
+                conn = self._connect()
+                cur  = conn.execute("DELETE FROM responses")
+                conn.commit()
+                return cur.rowcount
+        except sqlite3.Error as e:
+            print(f"[api_cache] 초기화 오류: {e}")
+            return 0
+
+    def size(self) -> int:
+        """저장된 항목 수"""
+        try:
+            with self._lock:
+                return self._connect().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        except sqlite3.Error:
+            return 0
@@ -0,0 +1,180 @@
+"""
+로일(LoIl) - 로스트아크 API 텔레메트리
+프로세스 내 집계 (외부 의존성 없음, 요청당 O(버킷 수) 갱신)
+- 엔드포인트 그룹별 지연 시간 히스토그램
+- HTTP 상태 코드 / 재시도 횟수
+- 캐시 계층별 적중률 (메모리 / 디스크 / 스테일 / 네거티브)
+- 키별 남은 호출 수 (응답 헤더 X-RateLimit-Remaining)
+"""
+
+import re
+import threading
+import time
+from collections import Counter
+from typing import Optional
+
+# 지연 시간 버킷 상한 (ms) - 마지막은 +Inf
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+CACHE_LAYERS = ("memory", "disk", "stale", "negative", "miss")
+
+_CHARACTER_SEGMENT = re.compile(r"^(/(?:armories/)?characters)/[^/?]+")
+
+
+def endpoint_group(endpoint: str) -> str:
+    """
+    엔드포인트 → 집계 그룹 (캐릭터명 제거)
+    /armories/characters/빛쟁인거니/profiles     → /armories/characters/{name}/profiles
+    /armories/characters/빛쟁인거니?filters=a+b → /armories/characters/{name}?filters
+    """
+    path, _, query = (endpoint or "").partition("?")
+    path = _CHARACTER_SEGMENT.sub(r"\1/{name}", path)
+    return f"{path}?filters" if query else path
+
+
+# ==================== 히스토그램 ====================
+
+class Histogram:
+    """고정 버킷 지연 시간 히스토그램"""
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count   = 0
+        self.total   = 0.0
+
+    def observe(self, ms: float):
+        i = 0
+        while i < len(LATENCY_BUCKETS_MS) and ms > LATENCY_BUCKETS_MS[i]:
+            i += 1
+        self.buckets[i] += 1
+        self.count += 1
+        self.total += ms
+
+    def quantile(self, q: float) -> float:
+        """버킷 상한 기준 근사 분위수 (ms). 관측 없으면 0"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen   = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= target:
+                return float(LATENCY_BUCKETS_MS[i]) if i < len(LATENCY_BUCKETS_MS) else float("inf")
+        return float("inf")
+
+    def summary(self) -> dict:
+        return {
+            "count":  self.count,
+            "avg_ms": round(self.total / self.count, 1) if self.count else 0.0,
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": self.quantile(0.95),
+        }
+
+
+# ==================== 집계기 ====================
+
+class APIMetrics:
+    """API 호출 지표 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started_at    = time.time()
+            self.latency: dict[str, Histogram] = {}
+            self.statuses      = Counter()   # {status_code: n}
+            self.retries       = 0
+            self.cache         = Counter()   # {layer: n}
+            self.key_remaining: dict[int, tuple] = {}  # {key_index: (remaining, 기록 시각)}
+
+    def record_request(self, endpoint: str, status_code: int, elapsed_ms: float):
+        group = endpoint_group(endpoint)
+        with self._lock:
+            hist = self.latency.get(group)
+            if hist is None:
+                hist = self.latency[group] = Histogram()
+            hist.observe(elapsed_ms)
+            self.statuses[status_code] += 1
+
+    def record_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def record_cache(self, layer: str):
+        with self._lock:
+            self.cache[layer] += 1
+
+    def record_key_remaining(self, key_index: int, remaining: Optional[int]):
+        if remaining is None:
+            return
+        with self._lock:
+            self.key_remaining[key_index] = (remaining, time.time())
+
+    def cache_hit_ratio(self) -> float:
+        with self._lock:
+            total = sum(self.cache.values())
+            return (total - self.cache["miss"]) / total if total else 0.0
+
+    def snapshot(self) -> dict:
+        """
+        현재 지표
+
+        Returns:
+            {
+                'uptime_seconds': float,
+                'requests': int,
+                'statuses': {code: n},
+                'retries': int,
+                'cache': {layer: n},
+                'cache_hit_ratio': float,
+                'endpoints': {group: {count, avg_ms, p50_ms, p95_ms}},
+                'key_remaining': {key_index: remaining}
+            }
+        """
+        ratio = self.cache_hit_ratio()
+        with self._lock:
+            return {
+                "uptime_seconds":  time.time() - self.started_at,
+                "requests":        sum(self.statuses.values()),
+                "statuses":        dict(self.statuses),
+                "retries":         self.retries,
+                "cache":           {layer: self.cache[layer] for layer in CACHE_LAYERS},
+                "cache_hit_ratio": ratio,
+                "endpoints":       {g: h.summary() for g, h in sorted(self.latency.items())},
+                "key_remaining":   {i: r for i, (r, _) in sorted(self.key_remaining.items())},
+            }
+
+    def export_text(self) -> str:
+        """Prometheus 텍스트 포맷 내보내기"""
+        lines = []
+        with self._lock:
+            lines.append("# TYPE loil_api_request_duration_ms histogram")
+            for group, hist in sorted(self.latency.items()):
+                cumulative = 0
+                for i, n in enumerate(hist.buckets):
+                    cumulative += n
+                    le = LATENCY_BUCKETS_MS[i] if i < len(LATENCY_BUCKETS_MS) else "+Inf"
+                    lines.append(f'loil_api_request_duration_ms_bucket{{endpoint="{group}",le="{le}"}} {cumulative}')
+                lines.append(f'loil_api_request_duration_ms_sum{{endpoint="{group}"}} {hist.total:.1f}')
+                lines.append(f'loil_api_request_duration_ms_count{{endpoint="{group}"}} {hist.count}')
+
+            lines.append("# TYPE loil_api_responses_total counter")
+            for code, n in sorted(self.statuses.items()):
+                lines.append(f'loil_api_responses_total{{status="{code}"}} {n}')
+
+            lines.append("# TYPE loil_api_retries_total counter")
+            lines.append(f"loil_api_retries_total {self.retries}")
+
+            lines.append("# TYPE loil_api_cache_lookups_total counter")
+            for layer in CACHE_LAYERS:
+                lines.append(f'loil_api_cache_lookups_total{{layer="{layer}"}} {self.cache[layer]}')
+
+            lines.append("# TYPE loil_api_key_remaining gauge")
+            for i, (remaining, _) in sorted(self.key_remaining.items()):
+                lines.append(f'loil_api_key_remaining{{key="{i}"}} {remaining}')
+        return "\n".join(lines) + "\n"
+
+
+metrics = APIMetrics()
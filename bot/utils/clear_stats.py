@@ -0,0 +1,316 @@
+"""
+로일(LoIl) - 클리어 타임 기록 / 통계
+레이드 시작·클리어 시각 + 참여 구성 저장, 레이드별·구성별 소요 시간 분포를 누적
+
+- 분포 = 병합 가능한 로그 버킷 스케치 (상대 오차 CLEAR_STATS_ACCURACY)
+  → 클리어 1건마다 버킷 1칸만 증가, 기록 전체를 다시 읽지 않음
+  → 길드 표본이 부족하면 전체 길드 스케치를 병합해 사용
+- 범위: 'raid' = "레이드키:난이도", 'comp' = "레이드키:난이도|직업,직업,..." (정렬한 직업 구성)
+- 시작 기록이 없으면 이번 주 예정 시작 시각으로 추정 → runs 행에 표시용으로만 저장, 분포에는 넣지 않음
+  (/레이드시작 없이 늦게 클리어 처리하면 몇 시간짜리 표본이 쌓여 스케줄링 소요 시간이 부풀려짐)
+- 스케줄링: 표본이 충분하면 p90을 30분 블록으로 올림해 레이드 소요 시간으로 사용
+"""
+
+import json
+import math
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterable, Optional
+
+from bot.config.settings import HISTORY_DB, CLEAR_STATS_ACCURACY, CLEAR_STATS_MIN_SAMPLES, CLEAR_MAX_MINUTES
+from bot.utils.history import KST, RESET_HOUR, week_key
+from bot.utils.week_model import raid_key
+
+DAY_OFFSET = {'수': 0, '목': 1, '금': 2, '토': 3, '일': 4, '월': 5, '화': 6}
+BLOCK_MINUTES = 30
+
+
+# ==================== 스케치 ====================
+
+class DurationSketch:
+    """
+    소요 시간(분) 분포 - 로그 버킷 히스토그램 (DDSketch 방식)
+
+    버킷 i = (γ^(i-1), γ^i], γ = (1+α)/(1-α) → 분위수 상대 오차 α 이내
+    두 스케치는 버킷 개수를 더하는 것만으로 병합
+    """
+
+    def __init__(self, accuracy: float = CLEAR_STATS_ACCURACY):
+        self.accuracy = accuracy
+        self.gamma    = (1 + accuracy) / (1 - accuracy)
+        self._log_g   = math.log(self.gamma)
+        self.buckets: dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.low   = math.inf
+        self.high  = 0.0
+
+    def add(self, minutes: float):
+        minutes = max(minutes, 1.0)
+        i = math.ceil(math.log(minutes) / self._log_g)
+        self.buckets[i] = self.buckets.get(i, 0) + 1
+        self.count += 1
+        self.total += minutes
+        self.low    = min(self.low, minutes)
+        self.high   = max(self.high, minutes)
+
+    def merge(self, other: "DurationSketch") -> "DurationSketch":
+        for i, n in other.buckets.items():
+            self.buckets[i] = self.buckets.get(i, 0) + n
+        self.count += other.count
+        self.total += other.total
+        self.low    = min(self.low, other.low)
+        self.high   = max(self.high, other.high)
+        return self
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank, seen = math.ceil(q * self.count) - 1, 0   # nearest-rank (표본이 적을 때 p90이 낮게 나오지 않게)
+        for i in sorted(self.buckets):
+            seen += self.buckets[i]
+            if seen > rank:
+                value = 2 * self.gamma ** i / (self.gamma + 1)
+                return min(max(value, self.low), self.high)
+        return self.high
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    def summary(self) -> dict:
+        return {
+            'count': self.count,
+            'mean':  round(self.mean, 1),
+            'p50':   round(self.quantile(0.5), 1),
+            'p90':   round(self.quantile(0.9), 1),
+        }
+
+    def dumps(self) -> str:
+        return json.dumps({'a': self.accuracy, 'b': self.buckets, 'n': self.count,
+                           's': self.total, 'lo': self.low, 'hi': self.high})
+
+    @classmethod
+    def loads(cls, raw: str) -> "DurationSketch":
+        d = json.loads(raw)
+        sketch = cls(d['a'])
+        sketch.buckets = {int(i): n for i, n in d['b'].items()}
+        sketch.count, sketch.total, sketch.low, sketch.high = d['n'], d['s'], d['lo'], d['hi']
+        return sketch
+
+
+def raid_scope(raid: dict) -> str:
+    """레이드 통계 키 "레이드키:난이도" (raids.json에 없으면 팀 번호를 뗀 이름)"""
+    return f"{raid.get('raid_key') or raid.get('key') or raid_key(raid.get('name', ''))}:{raid.get('difficulty') or ''}"
+
+
+def composition_key(members: Iterable[dict]) -> str:
+    """참여 구성 → 정렬한 직업 목록 ("바드,블레이드,홀나,...")"""
+    return ",".join(sorted(m.get('std_job') or m.get('character') or '?' for m in members))
+
+
+def scheduled_start(raid: dict, now: Optional[float] = None) -> Optional[float]:
+    """이번 주 레이드 예정 시작 시각 (요일 미정이면 None)"""
+    offset = DAY_OFFSET.get(raid.get('day'))
+    if offset is None:
+        return None
+    wednesday = datetime.strptime(week_key(now), "%Y-%m-%d").replace(tzinfo=KST)
+    start = wednesday + timedelta(days=offset, hours=raid.get('hour', 0), minutes=raid.get('minute', 0))
+    if start.hour < RESET_HOUR and offset == 0:
+        start += timedelta(days=7)   # 수요일 새벽(초기화 전)은 그 주의 마지막
+    return start.timestamp()
+
+
+# ==================== 기록 / 통계 ====================
+
+class ClearStats:
+    """레이드 진행 기록 + 길드별 소요 시간 스케치 (SQLite, 메모리 캐시)"""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._lock   = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._sketches: dict[str, dict[tuple[str, str], DurationSketch]] = {}   # 길드 → (범위, 키) → 스케치
+        self._global: dict[tuple[str, str], DurationSketch] = {}
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS runs ("
+                "  guild_id    TEXT NOT NULL,"
+                "  week        TEXT NOT NULL,"
+                "  raid_col    INTEGER NOT NULL,"
+                "  raid_scope  TEXT NOT NULL,"
+                "  composition TEXT NOT NULL,"
+                "  members     TEXT NOT NULL,"
+                "  started_at  REAL,"
+                "  cleared_at  REAL,"
+                "  minutes     REAL,"
+                "  PRIMARY KEY (guild_id, week, raid_col)"
+                ") WITHOUT ROWID"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS duration_stats ("
+                "  guild_id    TEXT NOT NULL,"
+                "  scope       TEXT NOT NULL,"
+                "  key         TEXT NOT NULL,"
+                "  sketch      TEXT NOT NULL,"
+                "  updated_at  REAL NOT NULL,"
+                "  PRIMARY KEY (guild_id, scope, key)"
+                ") WITHOUT ROWID"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_duration_key ON duration_stats (scope, key)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _guild(self, gid: str) -> dict[tuple[str, str], DurationSketch]:
+        """길드 스케치 (처음 한 번만 DB에서 읽음) - _lock 안에서 호출"""
+        sketches = self._sketches.get(gid)
+        if sketches is None:
+            rows = self._connect().execute(
+                "SELECT scope, key, sketch FROM duration_stats WHERE guild_id = ?", (gid,)
+            ).fetchall()
+            sketches = self._sketches[gid] = {(r["scope"], r["key"]): DurationSketch.loads(r["sketch"]) for r in rows}
+        return sketches
+
+    # ==================== 진행 기록 ====================
+
+    def start_run(self, guild_id: int, raid: dict, members: list[dict], now: Optional[float] = None):
+        """레이드 시작 (같은 주 같은 열을 다시 시작하면 새 진행으로 덮어씀)"""
+        now = time.time() if now is None else now
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT INTO runs (guild_id, week, raid_col, raid_scope, composition, members, started_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (guild_id, week, raid_col) DO UPDATE SET "
+                "  raid_scope = excluded.raid_scope, composition = excluded.composition, "
+                "  members = excluded.members, started_at = excluded.started_at, cleared_at = NULL, minutes = NULL",
+                (str(guild_id), week_key(now), raid['col'], raid_scope(raid), composition_key(members),
+                 json.dumps([m['name'] for m in members], ensure_ascii=False), now)
+            )
+            conn.commit()
+
+    def finish_run(self, guild_id: int, raid: dict, members: list[dict], now: Optional[float] = None) -> dict:
+        """
+        레이드 클리어 → 소요 시간 기록 + 레이드/구성 스케치에 1건 추가 (실제 시작 기록이 있을 때만)
+
+        Returns:
+            { minutes (없으면 None), estimated (예정 시각 기준 여부), raid: 통계, comp: 통계 }
+        """
+        gid   = str(guild_id)
+        now   = time.time() if now is None else now
+        week  = week_key(now)
+        scope = raid_scope(raid)
+        comp  = composition_key(members)
+
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT started_at, cleared_at FROM runs WHERE guild_id = ? AND week = ? AND raid_col = ?",
+                (gid, week, raid['col'])
+            ).fetchone()
+            if row and row["cleared_at"] is not None:
+                # 이미 클리어 처리된 진행 → 다시 세지 않음
+                return {'minutes': None, 'estimated': False, **self._stats_locked(gid, scope, comp)}
+
+            started   = row["started_at"] if row else None
+            estimated = started is None
+            if estimated:
+                started = scheduled_start(raid, now)
+            minutes = (now - started) / 60 if started is not None else None
+            if minutes is not None and not (0 < minutes <= CLEAR_MAX_MINUTES):
+                minutes = None   # 시작 누락 / 예정보다 먼저 클리어 → 분포에 넣지 않음
+
+            conn.execute(
+                "INSERT INTO runs (guild_id, week, raid_col, raid_scope, composition, members, started_at, cleared_at, minutes) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (guild_id, week, raid_col) DO UPDATE SET "
+                "  raid_scope = excluded.raid_scope, composition = excluded.composition, members = excluded.members, "
+                "  started_at = excluded.started_at, cleared_at = excluded.cleared_at, minutes = excluded.minutes",
+                (gid, week, raid['col'], scope, comp, json.dumps([m['name'] for m in members], ensure_ascii=False),
+                 None if estimated else started, now, minutes)   # started_at = 실제 시작만
+            )
+            if minutes is not None and not estimated:
+                sketches = self._guild(gid)
+                for key in (('raid', scope), ('comp', f"{scope}|{comp}")):
+                    sketch = sketches.setdefault(key, DurationSketch())
+                    sketch.add(minutes)
+                    conn.execute(
+                        "INSERT OR REPLACE INTO duration_stats (guild_id, scope, key, sketch, updated_at) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (gid, key[0], key[1], sketch.dumps(), now)
+                    )
+                    self._global.pop(key, None)
+            conn.commit()
+            stats = self._stats_locked(gid, scope, comp)
+        return {'minutes': None if minutes is None else round(minutes, 1), 'estimated': estimated, **stats}
+
+    # ==================== 통계 조회 ====================
+
+    def _merged(self, gid: str, key: tuple[str, str]) -> Optional[DurationSketch]:
+        """길드 스케치, 표본이 부족하면 전체 길드 병합본 - _lock 안에서 호출"""
+        own = self._guild(gid).get(key)
+        if own and own.count >= CLEAR_STATS_MIN_SAMPLES:
+            return own
+        merged = self._global.get(key)
+        if merged is None:
+            merged = DurationSketch()
+            for r in self._connect().execute(
+                "SELECT sketch FROM duration_stats WHERE scope = ? AND key = ?", key
+            ).fetchall():
+                merged.merge(DurationSketch.loads(r["sketch"]))
+            self._global[key] = merged
+        return merged if merged.count else own
+
+    def _stats_locked(self, gid: str, scope: str, comp: str) -> dict:
+        out = {}
+        for name, key in (('raid', ('raid', scope)), ('comp', ('comp', f"{scope}|{comp}"))):
+            sketch = self._merged(gid, key)
+            out[name] = sketch.summary() if sketch and sketch.count else None
+        return out
+
+    def raid_stats(self, guild_id: int, raids: list[dict]) -> dict[int, dict]:
+        """
+        레이드 열별 소요 시간 통계 (표본 없으면 제외)
+
+        Returns:
+            { col: { count, mean, p50, p90 } }
+        """
+        gid = str(guild_id)
+        with self._lock:
+            out = {}
+            for raid in raids:
+                sketch = self._merged(gid, ('raid', raid_scope(raid)))
+                if sketch and sketch.count:
+                    out[raid['col']] = sketch.summary()
+        return out
+
+    def scope_stats(self, guild_id: int) -> list[dict]:
+        """길드의 레이드별 통계 전체 (클리어 수 내림차순) - /통계용"""
+        with self._lock:
+            sketches = self._guild(str(guild_id))
+            rows = [{'scope': key, **s.summary()} for (scope, key), s in sketches.items() if scope == 'raid' and s.count]
+        return sorted(rows, key=lambda r: (-r['count'], r['scope']))
+
+    def expected_durations(self, guild_id: int, raids: list[dict]) -> dict[int, int]:
+        """
+        스케줄링용 소요 시간 (분) - 표본이 CLEAR_STATS_MIN_SAMPLES 이상인 레이드만
+        p90을 30분 블록으로 올림
+        """
+        out = {}
+        for col, s in self.raid_stats(guild_id, raids).items():
+            if s['count'] >= CLEAR_STATS_MIN_SAMPLES:
+                out[col] = max(1, math.ceil(s['p90'] / BLOCK_MINUTES)) * BLOCK_MINUTES
+        return out
+
+
+clear_stats = ClearStats(HISTORY_DB)
@@ -0,0 +1,165 @@
+"""
+로일(LoIl) - 아이템 레벨 참여 가능 인덱스
+길드 로스터(roster.sqlite3) → 아이템 레벨 정렬 배열 + bisect 조회
+raids.json의 min_level과 연결해 "누가 갈 수 있나"를 즉시 계산
+
+흐름:
+1. 로스터 행을 아이템 레벨 오름차순으로 정렬 (levels 배열은 float로 미리 파싱)
+2. bisect_left(levels, min_level) 이후 구간 = 참여 가능 캐릭터
+3. 로스터가 바뀌면(개수/최종 갱신 시각) 인덱스 재생성
+"""
+
+import threading
+from bisect import bisect_left
+from typing import Optional
+
+from bot.config.settings import SUPPORTS_DATA
+from bot.utils.raid_meta import DIFFICULTY_ALIASES, find_raid
+from bot.utils.roster import roster_store
+
+# 서폿 가능 직업 (하이브리드 포함) - 로스터엔 각인 정보가 없어 직업 기준으로 분류
+SUPPORT_CLASSES = set(SUPPORTS_DATA.get("hybrid_support", {}).keys())
+
+
+# ==================== 레이드 요구 레벨 ====================
+
+def get_min_level(raid: str, difficulty: str = "normal") -> Optional[float]:
+    """
+    레이드 + 난이도 → 최소 아이템 레벨
+
+    Args:
+        raid:       레이드 키/한글명/영문명/약칭 (예: "kamen", "카멘", "아브렐 슈드", "쿠크")
+        difficulty: hard / normal / nightmare / solo (한글 가능)
+
+    Returns:
+        min_level 또는 None (raids.json에 없음)
+
+    Example:
+        >>> get_min_level("카멘", "하드")
+        1630
+    """
+    info = find_raid(raid)
+    if not info:
+        return None
+    diff = DIFFICULTY_ALIASES.get((difficulty or "").lower(), difficulty)
+    level = info["difficulties"].get(diff, {}).get("min_level")
+    return float(level) if level is not None else None
+
+
+# ==================== 인덱스 ====================
+
+class EligibilityIndex:
+    """아이템 레벨 오름차순 캐릭터 배열 + bisect 조회"""
+
+    def __init__(self, characters: list[dict]):
+        self.characters = sorted(characters, key=lambda c: c["item_level"])
+        self.levels     = [float(c["item_level"]) for c in self.characters]
+
+    def __len__(self) -> int:
+        return len(self.characters)
+
+    def eligible(self, min_level: float) -> list[dict]:
+        """min_level 이상 캐릭터 (레벨 내림차순)"""
+        start = bisect_left(self.levels, min_level)
+        return self.characters[start:][::-1]
+
+    def count_eligible(self, min_level: float) -> int:
+        """min_level 이상 캐릭터 수 (목록 생성 없이)"""
+        return len(self.levels) - bisect_left(self.levels, min_level)
+
+    def best_level(self, owner: str, class_name: Optional[str] = None) -> float:
+        """길드원(+직업)의 최고 아이템 레벨. 없으면 0.0"""
+        for c in reversed(self.characters):
+            if c["owner"] == owner and (class_name is None or c["class_name"] == class_name):
+                return c["item_level"]
+        return 0.0
+
+    def who_can_go(self, min_level: float) -> dict[str, dict[str, list[dict]]]:
+        """
+        참여 가능 캐릭터를 길드원 → 역할별로 묶기
+
+        Returns:
+            { owner: { "support": [...], "dps": [...] } }  (각 목록은 레벨 내림차순)
+        """
+        grouped: dict[str, dict[str, list[dict]]] = {}
+        for c in self.eligible(min_level):
+            role = "support" if c["class_name"] in SUPPORT_CLASSES else "dps"
+            grouped.setdefault(c["owner"], {"support": [], "dps": []})[role].append(c)
+        return grouped
+
+
+_indexes: dict[int, tuple] = {}   # {guild_id: (version, EligibilityIndex)}
+_index_lock = threading.Lock()
+
+
+def get_eligibility_index(guild_id: int) -> EligibilityIndex:
+    """길드 인덱스 (로스터가 바뀐 경우에만 재생성)"""
+    version = roster_store.version(guild_id)
+    with _index_lock:
+        cached = _indexes.get(guild_id)
+        if cached and cached[0] == version:
+            return cached[1]
+    index = EligibilityIndex(roster_store.get_roster(guild_id))
+    with _index_lock:
+        _indexes[guild_id] = (version, index)
+    return index
+
+
+# ==================== 조회 ====================
+
+def get_eligible_characters(guild_id: int, raid: str, difficulty: str = "normal") -> Optional[dict]:
+    """
+    레이드 참여 가능 캐릭터 (길드원/역할별)
+
+    Returns:
+        { owner: { "support": [...], "dps": [...] } } 또는 None (알 수 없는 레이드)
+
+    Example:
+        >>> by_owner = get_eligible_characters(guild_id, "에기르", "hard")
+        >>> for owner, roles in by_owner.items():
+        ...     print(owner, [c["name"] for c in roles["support"]])
+    """
+    min_level = get_min_level(raid, difficulty)
+    if min_level is None:
+        return None
+    return get_eligibility_index(guild_id).who_can_go(min_level)
+
+
+def validate_sheet_characters(guild_id: int, members: list[dict], raid: str,
+                              difficulty: str = "normal", col: Optional[int] = None) -> list[dict]:
+    """
+    시트에 적힌 캐릭터 사전 검증 (레벨 미달 찾기)
+
+    Args:
+        members: sheets.get_members() 결과
+        raid / difficulty: 대상 레이드
+        col: 레이드 열 (지정 시 해당 열 캐릭터만 검사)
+
+    Returns:
+        [{ member, job, item_level, min_level }]  - item_level 0.0 = 로스터에 없음
+        알 수 없는 레이드 / 로스터 동기화 전이면 빈 리스트
+    """
+    min_level = get_min_level(raid, difficulty)
+    if min_level is None:
+        return []
+
+    index = get_eligibility_index(guild_id)
+    if not len(index):
+        return []
+    issues = []
+    for m in members:
+        for c, char in m.get("characters", {}).items():
+            if col is not None and c != col:
+                continue
+            job = char.get("std_job")
+            if not job:
+                continue
+            level = index.best_level(m["name"], job)
+            if level < min_level:
+                issues.append({
+                    "member":     m["name"],
+                    "job":        job,
+                    "item_level": level,
+                    "min_level":  min_level,
+                })
+    return issues
@@ -2,152 +2,307 @@
 로일(LoIl) - Gemini AI 유틸
 dps_types, synergy_benefits 데이터를 프롬프트에 주입해
 정확한 파티 편성 추천 제공
+
+프롬프트 컨텍스트(딜러 유형/시너지/파티 규칙)는 시작 시 1회 컴파일,
+JSON 파일이 바뀐 경우(mtime → 내용 해시)에만 다시 빌드
+프롬프트에는 참여 직업 관련 항목만 넣고, 토큰 예산(GEMINI_PROMPT_TOKEN_BUDGET)을 넘으면
+중요도 낮은 섹션부터 제외
+
+on_partial / on_progress 콜백을 넘기면 응답을 스트리밍으로 받아 생성 중간 결과를 전달
+(디스코드 메시지 점진 수정용, 캐시 적중 시에는 호출되지 않음)
 """
 
+import asyncio
+import hashlib
 import json
-from typing import List
-import google.generativeai as genai
+import threading
+from typing import Awaitable, Callable, List, Optional
 
 from bot.config.settings import (
-    GEMINI_API_KEY,
-    GEMINI_MODEL,
+    GEMINI_MAX_TOKENS,
+    GEMINI_BATCH_MAX_TOKENS,
+    GEMINI_PROMPT_TOKEN_BUDGET,
     DPS_TYPES_DATA,
+    DPS_TYPES_JSON,
     SYNERGY_BENEFITS_DATA,
+    SYNERGY_BENEFITS_JSON,
     SYNERGIES_DATA,
+    load_json_data,
+)
+from bot.utils.ai_client import estimate_tokens
+from bot.utils.ai_router import ai_router
+from bot.utils.ai_cache import ai_cache, make_cache_key
+from bot.utils.party_schema import (
+    PARTY_SCHEMA_PROMPT, extract_json, parse_party_response, parse_batch_response,
+    preview_parties, preview_batch,
 )
 
-# ==================== 초기화 ====================
-
-def _get_model():
-    genai.configure(api_key=GEMINI_API_KEY)
-    return genai.GenerativeModel(GEMINI_MODEL)
-
-
-# ==================== 컨텍스트 빌더 ====================
-
-def _build_dps_context() -> str:
-    """dps_types.json 핵심 요약 (프롬프트 길이 최적화)"""
-    if not DPS_TYPES_DATA:
-        return ""
-
-    lines = ["[딜러 유형 분류]"]
-    jobs = DPS_TYPES_DATA.get("jobs", {})
-
-    for job_name, job_data in jobs.items():
-        engravings = job_data.get("engravings", {})
-        for eng_name, eng_data in engravings.items():
-            dps_type  = eng_data.get("dps_type", "")
-            stat_base = eng_data.get("stat_base", "")
-            abbrev    = eng_data.get("abbrev", "")
-            if dps_type:
-                lines.append(f"  {job_name}({abbrev}): {dps_type} / 특성:{stat_base}")
-
-    return "\n".join(lines)
-
-
-def _build_synergy_context() -> str:
-    """synergy_benefits.json 핵심 요약"""
-    if not SYNERGY_BENEFITS_DATA:
-        return ""
-
-    lines = ["[시너지 제공 직업]"]
-    synergy_types = SYNERGY_BENEFITS_DATA.get("synergy_types", {})
-
-    for syn_key, syn_data in synergy_types.items():
-        name      = syn_data.get("name", syn_key)
-        providers = syn_data.get("providers", {})
-        provider_list = []
-        for job, engs in providers.items():
-            eng_str = "/".join(engs) if isinstance(engs, list) else str(engs)
-            provider_list.append(f"{job}({eng_str})")
-        if provider_list:
-            lines.append(f"  {name}: {', '.join(provider_list)}")
-
-    lines.append("")
-    lines.append("[시너지 수혜 우선순위]")
-    priority = SYNERGY_BENEFITS_DATA.get("benefit_priority", {})
-    for syn_key, p_data in priority.items():
-        note = p_data.get("note", "")
-        if note:
-            lines.append(f"  {syn_key}: {note}")
-
-    lines.append("")
-    smite = SYNERGY_BENEFITS_DATA.get("smite_synergy_pairing", {})
-    if smite:
-        lines.append("[사멸 딜러 시너지 페어링]")
-        lines.append(f"  헤드사멸: {smite.get('head_smite_pairs', {}).get('preferred_synergy_providers', [])}")
-        lines.append(f"  백사멸: {smite.get('back_smite_pairs', {}).get('preferred_synergy_providers', [])}")
-        lines.append(f"  {smite.get('note', '')}")
-
-    return "\n".join(lines)
-
-
-def _build_party_rules() -> str:
-    """파티 구성 기본 규칙"""
-    rules = SYNERGY_BENEFITS_DATA.get("party_synergy_checklist", {}) if SYNERGY_BENEFITS_DATA else {}
-    lines = ["[파티 구성 규칙]"]
-
-    eight = rules.get("ideal_8man", {})
-    if eight:
-        lines.append("  8인 파티:")
-        for s in eight.get("must_have", []):
-            lines.append(f"    필수: {s}")
+# 스트리밍 콜백: 누적 응답 텍스트 / { 레이드명: [[배치된 이름, ...], ...] }
+PartialCallback  = Callable[[str], Awaitable[None]]
+ProgressCallback = Callable[[dict], Awaitable[None]]
+
+
+# ==================== 컨텍스트 캐시 ====================
+
+_CONTEXT_SOURCES = (DPS_TYPES_JSON, SYNERGY_BENEFITS_JSON)
+
+
+def _source_mtimes() -> tuple:
+    return tuple(p.stat().st_mtime if p.exists() else 0 for p in _CONTEXT_SOURCES)
+
+
+def _data_hash(*datasets: dict) -> str:
+    """JSON 내용 해시 (키 정렬 → 저장 순서와 무관)"""
+    raw = json.dumps(datasets, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:12]
+
+
+class PromptContext:
+    """컴파일된 프롬프트 조각 + 버전 해시"""
+
+    def __init__(self, dps_data: dict, benefits: dict, mtimes: tuple):
+        self.mtimes  = mtimes
+        self.version = _data_hash(dps_data, benefits)
+
+        # 직업 단위 조각 (참여 인원 기준 프롬프트용) - 직업당 1줄로 압축
+        self.dps_by_job: dict[str, str] = {}
+        for job_name, job_data in dps_data.get("jobs", {}).items():
+            parts = [
+                f"{e.get('abbrev', '')}={e['dps_type']}/{e.get('stat_base', '')}"
+                for e in job_data.get("engravings", {}).values() if e.get("dps_type")
+            ]
+            if parts:
+                self.dps_by_job[job_name] = f"  {job_name}: {', '.join(parts)}"
+
+        # [(시너지 키, 시너지명, {직업: "직업(각인/각인)"})]
+        self.synergy_providers: list[tuple[str, str, dict[str, str]]] = []
+        for syn_key, syn_data in benefits.get("synergy_types", {}).items():
+            providers = {
+                job: f"{job}({'/'.join(engs) if isinstance(engs, list) else engs})"
+                for job, engs in syn_data.get("providers", {}).items()
+            }
+            self.synergy_providers.append((syn_key, syn_data.get("name", syn_key), providers))
+
+        # {시너지 키: "  키: 설명"}
+        self.priority_notes = {
+            k: f"  {k}: {v['note']}" for k, v in benefits.get("benefit_priority", {}).items()
+            if isinstance(v, dict) and v.get("note")
+        }
+
+        smite = benefits.get("smite_synergy_pairing", {})
+        self.smite_lines = []
+        self.smite_jobs  = set()
+        if smite:
+            head = smite.get("head_smite_pairs", {})
+            back = smite.get("back_smite_pairs", {})
+            self.smite_lines = [
+                "[사멸 딜러 시너지 페어링]",
+                f"  헤드사멸: {head.get('preferred_synergy_providers', [])}",
+                f"  백사멸: {back.get('preferred_synergy_providers', [])}",
+                f"  {smite.get('note', '')}",
+            ]
+            self.smite_jobs = {
+                j.split("(")[0] for j in head.get("jobs", []) + back.get("jobs", [])
+            }
+
+        checklist = benefits.get("party_synergy_checklist", {})
+        self.rules_by_size = {
+            size: "\n".join(
+                [f"[파티 구성 규칙 - {size}인]"]
+                + [f"  필수: {r}" for r in checklist.get(key, {}).get("must_have", [])]
+            )
+            for size, key in ((8, "ideal_8man"), (4, "ideal_4man"))
+            if checklist.get(key)
+        }
+
+
+_context      = PromptContext(DPS_TYPES_DATA, SYNERGY_BENEFITS_DATA, _source_mtimes())
+_context_lock = threading.Lock()
+
+
+def get_prompt_context() -> PromptContext:
+    """
+    컴파일된 컨텍스트 반환
+    JSON 파일 mtime이 바뀌면 다시 읽고, 내용 해시까지 바뀐 경우에만 재빌드
+    """
+    global _context
+    mtimes = _source_mtimes()
+    if mtimes == _context.mtimes:
+        return _context
+
+    with _context_lock:
+        if mtimes != _context.mtimes:
+            dps_data = load_json_data(DPS_TYPES_JSON)
+            benefits = load_json_data(SYNERGY_BENEFITS_JSON)
+            if _data_hash(dps_data, benefits) == _context.version:
+                _context.mtimes = mtimes
+            else:
+                _context = PromptContext(dps_data, benefits, mtimes)
+                print(f"[gemini_ai] 프롬프트 컨텍스트 재빌드 (v{_context.version})")
+    return _context
+
+
+# ==================== 프롬프트 압축 ====================
+
+def build_scoped_context(jobs, party_size=8, budget: int = GEMINI_PROMPT_TOKEN_BUDGET,
+                         support_jobs=()) -> str:
+    """
+    참여 직업 관련 컨텍스트만 조립 + 토큰 예산 적용
 
-    four = rules.get("ideal_4man", {})
-    if four:
-        lines.append("  4인 파티:")
-        for s in four.get("must_have", []):
-            lines.append(f"    필수: {s}")
+    - 딜러 유형: 참여 직업만 (서폿 직업 제외)
+    - 시너지: 참여 직업이 제공하는 것만, 아무도 못 주는 시너지는 이름만 나열
+    - 수혜 우선순위: 파티에 있는 시너지만
+    - 사멸 페어링: 사멸 직업이 있을 때만
+    - 파티 규칙: 해당 인원(4/8인)만
+    예산 초과 시 수혜 우선순위 → 사멸 페어링 → 딜러 유형 순으로 제외
 
-    return "\n".join(lines)
+    Args:
+        jobs: 참여 직업명 목록 (표준 직업명)
+        party_size: 4 또는 8 (여러 레이드 묶음이면 (4, 8)처럼 여러 개)
+        budget: 컨텍스트에 허용할 최대 토큰 수
+        support_jobs: 서폿으로 참여하는 직업 (딜러 유형에서 제외)
+    """
+    ctx  = get_prompt_context()
+    jobs = {j for j in jobs if j}
+    dps_jobs = jobs - {j for j in support_jobs if j}
+
+    dps_lines = [ctx.dps_by_job[job] for job in sorted(dps_jobs) if job in ctx.dps_by_job]
+
+    synergy_lines, missing, provided = [], [], []
+    for key, name, providers in ctx.synergy_providers:
+        present = [text for job, text in providers.items() if job in jobs]
+        if present:
+            synergy_lines.append(f"  {name}: {', '.join(present)}")
+            provided.append(key)
+        else:
+            missing.append(name)
+    if missing:
+        synergy_lines.append(f"  (제공자 없음) {', '.join(missing)}")
+
+    sections = {
+        "rules":    "\n".join(
+            ctx.rules_by_size[size]
+            for size in sorted(set(party_size if isinstance(party_size, (list, tuple, set)) else (party_size,)))
+            if size in ctx.rules_by_size
+        ),
+        "synergy":  "\n".join(["[파티 내 시너지 제공]"] + synergy_lines),
+        "dps":      "\n".join(["[딜러 유형 분류]"] + dps_lines) if dps_lines else "",
+        "smite":    "\n".join(ctx.smite_lines) if jobs & ctx.smite_jobs else "",
+        "priority": "",
+    }
+    notes = [ctx.priority_notes[k] for k in provided if k in ctx.priority_notes]
+    if notes:
+        sections["priority"] = "\n".join(["[시너지 수혜 우선순위]"] + notes)
+    order = ("dps", "synergy", "priority", "smite", "rules")
+
+    def _join() -> str:
+        return "\n\n".join(sections[k] for k in order if sections[k])
+
+    text = _join()
+    for drop in ("priority", "smite", "dps"):
+        if estimate_tokens(text) <= budget:
+            break
+        sections[drop] = ""
+        text = _join()
+
+    if estimate_tokens(text) > budget:
+        print(f"[gemini_ai] 프롬프트 컨텍스트 예산 초과: {estimate_tokens(text)} > {budget}")
+    return text
 
 
 # ==================== 파티 추천 ====================
 
-def recommend_party(members: list, raid_name: str) -> str:
+def _format_members(members: list) -> str:
+    """참여 인원 → 프롬프트용 목록"""
+    member_lines = []
+    for m in members:
+        role    = "서폿" if m.get("is_support") else "딜러"
+        std_job = m.get("std_job") or m.get("job") or m.get("character", "")
+        char    = m.get("character", "")
+        alt_str = " (부캐)" if m.get("is_alt") else ""
+        member_lines.append(f"  - {m['name']}: {char} ({std_job}) [{role}]{alt_str}")
+    return "\n".join(member_lines)
+
+
+def _member_jobs(members: list) -> tuple[list, set]:
+    """(전체 직업 목록, 서폿으로만 참여하는 직업)"""
+    jobs     = [m.get("std_job") or m.get("job") for m in members]
+    sup_jobs = {j for j, m in zip(jobs, members) if m.get("is_support")}
+    dps_jobs = {j for j, m in zip(jobs, members) if not m.get("is_support")}
+    return jobs, sup_jobs - dps_jobs
+
+
+def _party_cache_key(members: list, raid_name: str, kind: str = "party") -> str:
+    """레이드 + 정렬된 (이름, 캐릭터, 직업, 역할, 부캐) + 컨텍스트 버전"""
+    roster = sorted(
+        (m.get("name", ""), m.get("character", ""), m.get("std_job") or m.get("job") or "",
+         bool(m.get("is_support")), bool(m.get("is_alt")))
+        for m in members
+    )
+    return make_cache_key(kind, {
+        "raid":    (raid_name or "").strip(),
+        "members": roster,
+        "context": get_prompt_context().version,
+    })
+
+
+async def _generate(prompt: str, api_key: Optional[str], guild_id: int,
+                    on_partial: Optional[PartialCallback] = None, **options) -> str:
+    """ai_router 호출. on_partial이 있으면 스트리밍으로 받아 조각마다 누적 텍스트 전달"""
+    if on_partial is None:
+        return await ai_router.generate(prompt, api_key, guild_id, **options)
+    parts = []
+    async for chunk in ai_router.stream(prompt, api_key, guild_id, **options):
+        parts.append(chunk)
+        await on_partial("".join(parts))
+    return "".join(parts)
+
+
+async def recommend_party(members: list, raid_name: str, api_key: Optional[str] = None,
+                          guild_id: int = 0, force_fresh: bool = False,
+                          on_partial: Optional[PartialCallback] = None) -> str:
     """
-    AI 파티 편성 추천
+    AI 파티 편성 추천 (같은 인원/레이드면 캐시된 응답 반환)
 
     Args:
         members: [{ name, character, std_job, is_support, is_alt, level }, ...]
         raid_name: 레이드 이름
+        api_key: 길드 Gemini 키 (없으면 기본 키)
+        guild_id: 길드 ID (동시 요청 제한 단위)
+        force_fresh: True면 캐시 무시하고 새로 요청
+        on_partial: 생성 중 누적 텍스트를 받을 콜백 (스트리밍)
 
     Returns:
         추천 결과 문자열
     """
-    if not GEMINI_API_KEY:
-        return "❌ Gemini API 키가 설정되지 않았습니다."
+    if not ai_router.available(api_key, guild_id):
+        return "❌ AI API 키가 설정되지 않았습니다."
 
-    try:
-        model = _get_model()
+    cache_key = _party_cache_key(members, raid_name)
+    if not force_fresh:
+        cached = ai_cache.get(cache_key)
+        if cached:
+            return cached
 
+    try:
         # 참여 인원 정리
-        member_lines = []
-        for m in members:
-            role    = "서폿" if m.get("is_support") else "딜러"
-            std_job = m.get("std_job") or m.get("job") or m.get("character", "")
-            char    = m.get("character", "")
-            alt_str = " (부캐)" if m.get("is_alt") else ""
-            member_lines.append(f"  - {m['name']}: {char} ({std_job}) [{role}]{alt_str}")
-
-        member_str  = "\n".join(member_lines)
+        member_str  = _format_members(members)
         total       = len(members)
         sup_cnt     = sum(1 for m in members if m.get("is_support"))
         dps_cnt     = total - sup_cnt
-        party_size  = "8인" if total >= 6 else "4인"
+        size        = 8 if total >= 6 else 4
+        party_size  = f"{size}인"
+        jobs, support_only = _member_jobs(members)
 
-        dps_context     = _build_dps_context()
-        synergy_context = _build_synergy_context()
-        party_rules     = _build_party_rules()
+        context = build_scoped_context(
+            jobs, size, GEMINI_PROMPT_TOKEN_BUDGET - estimate_tokens(member_str),
+            support_jobs=support_only
+        )
 
         prompt = f"""당신은 로스트아크 전문 파티 편성 어시스턴트입니다.
 아래 데이터를 참고해 최적의 파티를 편성해주세요.
 
-{dps_context}
-
-{synergy_context}
-
-{party_rules}
+{context}
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━
 [레이드] {raid_name}
@@ -173,40 +328,225 @@ def recommend_party(members: list, raid_name: str) -> str:
 
 답변은 간결하게, 500자 이내로 해주세요."""
 
-        response = model.generate_content(prompt)
-        return response.text
+        text = await _generate(prompt, api_key, guild_id, on_partial)
+        ai_cache.set(cache_key, text)
+        return text
+
+    except asyncio.TimeoutError:
+        return "❌ AI 응답 시간이 초과되었습니다. 잠시 후 다시 시도해주세요."
 
     except Exception as e:
         return f"❌ AI 추천 실패: {e}"
 
 
+# ==================== 구조화(JSON) 편성 ====================
+
+def _raid_block(i: int, raid_name: str, members: list, party_size: int) -> str:
+    sup_cnt = sum(1 for m in members if m.get("is_support"))
+    return (
+        f"[{i}] {raid_name} - 총 {len(members)}명 (서폿 {sup_cnt}명 / 딜러 {len(members) - sup_cnt}명), "
+        f"파티당 최대 {party_size}명\n{_format_members(members)}"
+    )
+
+
+def _structured_prompt(context: str, raid_str: str, schema: str, count: int) -> str:
+    target = "레이드의 파티를" if count == 1 else f"레이드 {count}개의 파티를 각각"
+    return f"""당신은 로스트아크 전문 파티 편성 어시스턴트입니다.
+아래 데이터를 참고해 {target} 편성해주세요.
+
+{context}
+
+━━━━━━━━━━━━━━━━━━━━━━━━━
+{raid_str}
+━━━━━━━━━━━━━━━━━━━━━━━━━
+
+규칙:
+- 모든 길드원을 정확히 한 번씩 배치 (이름은 목록 그대로)
+- 파티마다 서폿 1명 우선, 사멸 딜러는 헤드/백 시너지 제공자와 같은 파티
+- 설명 없이 아래 JSON만 출력
+
+{schema}"""
+
+
+def _compact_result(result: dict) -> str:
+    """검증된 편성 → 캐시 저장용 JSON (이름만)"""
+    return json.dumps({
+        "parties":       [{"members": [{"name": m["name"]} for m in p]} for p in result["parties"]],
+        "synergy_notes": result["synergy_notes"],
+    }, ensure_ascii=False)
+
+
+def _preview_results(results: dict) -> dict:
+    """완료된 편성 → 스트리밍 미리보기 형식 { raid_name: [[이름, ...]] }"""
+    return {name: [[m["name"] for m in party] for party in result["parties"]]
+            for name, result in results.items() if result}
+
+
+async def recommend_party_structured(members: list, raid_name: str, party_size: int = 4,
+                                     api_key: Optional[str] = None, guild_id: int = 0,
+                                     force_fresh: bool = False,
+                                     on_progress: Optional[ProgressCallback] = None) -> Optional[dict]:
+    """
+    AI 파티 편성 (JSON 모드) → 검증된 파티 목록
+    on_progress: 생성 중 { raid_name: [[배치된 이름, ...]] } 를 받을 콜백 (스트리밍)
+
+    Returns:
+        { parties: [[member_dict, ...]], synergy_notes: [str], repaired: bool }
+        실패/검증 불가 시 None → 호출 측에서 optimize_parties로 대체
+
+    Example:
+        >>> result = await recommend_party_structured(members, "카멘", 4)
+        >>> parties = result["parties"] if result else optimize_parties(members, 4)["parties"]
+    """
+    if not members or not ai_router.available(api_key, guild_id):
+        return None
+
+    cache_key = _party_cache_key(members, raid_name, kind="party_json")
+    if not force_fresh:
+        cached = ai_cache.get(cache_key)
+        parsed = parse_party_response(extract_json(cached), members, party_size) if cached else None
+        if parsed:
+            return parsed
+
+    raid_str = _raid_block(1, raid_name, members, party_size)
+    jobs, support_only = _member_jobs(members)
+    context = build_scoped_context(
+        jobs, 8 if len(members) >= 6 else 4,
+        GEMINI_PROMPT_TOKEN_BUDGET - estimate_tokens(raid_str), support_jobs=support_only
+    )
+    async def on_partial(text: str):
+        await on_progress({raid_name: preview_parties(text)})
+
+    try:
+        text = await _generate(_structured_prompt(context, raid_str, PARTY_SCHEMA_PROMPT, 1),
+                               api_key, guild_id, on_partial if on_progress else None)
+    except Exception as e:
+        print(f"[gemini_ai] 구조화 편성 실패 ({raid_name}): {e}")
+        return None
+
+    parsed = parse_party_response(extract_json(text), members, party_size)
+    if parsed is None:
+        print(f"[gemini_ai] 구조화 편성 응답 검증 실패 ({raid_name}) → 로컬 편성")
+        return None
+    ai_cache.set(cache_key, _compact_result(parsed))
+    return parsed
+
+
+async def recommend_parties_structured(raids: list[dict], api_key: Optional[str] = None,
+                                       guild_id: int = 0, force_fresh: bool = False,
+                                       on_progress: Optional[ProgressCallback] = None) -> dict[str, Optional[dict]]:
+    """
+    여러 레이드 JSON 편성을 요청 1회로 (공통 컨텍스트 1회 + 레이드별 인원)
+    실패/누락 레이드는 recommend_party_structured 병렬 호출, 그래도 안 되면 None
+
+    Args:
+        raids: [{ raid_name, members, party_size }, ...]
+        on_progress: 일괄 응답 생성 중 { raid_name: [[배치된 이름, ...]] } 를 받을 콜백
+                     (캐시 적중 레이드 포함, 스트리밍)
+
+    Returns:
+        { raid_name: recommend_party_structured 결과 또는 None }
+    """
+    results: dict[str, Optional[dict]] = {}
+    pending = []
+    for raid in raids:
+        if not raid.get("members"):
+            continue
+        size   = raid.get("party_size", 4)
+        cached = None if force_fresh else ai_cache.get(
+            _party_cache_key(raid["members"], raid["raid_name"], kind="party_json"))
+        parsed = parse_party_response(extract_json(cached), raid["members"], size) if cached else None
+        if parsed:
+            results[raid["raid_name"]] = parsed
+        else:
+            pending.append(raid)
+
+    if len(pending) > 1 and ai_router.available(api_key, guild_id):
+        all_members = [m for raid in pending for m in raid["members"]]
+        jobs, support_only = _member_jobs(all_members)
+        raid_str = "\n\n".join(
+            _raid_block(i, raid["raid_name"], raid["members"], raid.get("party_size", 4))
+            for i, raid in enumerate(pending, 1)
+        )
+        context = build_scoped_context(
+            jobs, tuple({8 if len(r["members"]) >= 6 else 4 for r in pending}),
+            GEMINI_PROMPT_TOKEN_BUDGET - estimate_tokens(raid_str), support_jobs=support_only
+        )
+        schema = '{ "raids": [ { "index": 레이드 번호, ' + PARTY_SCHEMA_PROMPT.strip()[1:-1].strip() + " } ] }"
+        done   = _preview_results(results)
+
+        async def on_partial(text: str):
+            streamed = {pending[i]["raid_name"]: parties
+                        for i, parties in preview_batch(text).items() if 0 <= i < len(pending)}
+            await on_progress({**done, **streamed})
+
+        try:
+            text = await _generate(
+                _structured_prompt(context, raid_str, schema, len(pending)), api_key, guild_id,
+                on_partial if on_progress else None,
+                max_output_tokens=min(GEMINI_MAX_TOKENS * len(pending), GEMINI_BATCH_MAX_TOKENS),
+            )
+            parsed = parse_batch_response(extract_json(text), pending)
+            for i, result in parsed.items():
+                raid = pending[i]
+                ai_cache.set(_party_cache_key(raid["members"], raid["raid_name"], kind="party_json"),
+                             _compact_result(result))
+                results[raid["raid_name"]] = result
+            pending = [raid for i, raid in enumerate(pending) if i not in parsed]
+            if pending:
+                print(f"[gemini_ai] 일괄 구조화 편성 누락 {len(pending)}개 → 개별 요청")
+        except Exception as e:
+            print(f"[gemini_ai] 일괄 구조화 편성 실패 → 개별 요청: {e}")
+
+    async def on_single(preview: dict):
+        await on_progress({**done_preview, **preview})
+
+    # 남은 레이드가 1개면 개별 요청도 스트리밍 (여러 개면 동시 응답이 섞이므로 생략)
+    done_preview = _preview_results(results)
+    single_progress = on_single if on_progress and len(pending) == 1 else None
+    singles = await asyncio.gather(*(
+        recommend_party_structured(raid["members"], raid["raid_name"], raid.get("party_size", 4),
+                                   api_key, guild_id, force_fresh=True, on_progress=single_progress)
+        for raid in pending
+    ))
+    for raid, result in zip(pending, singles):
+        results[raid["raid_name"]] = result
+    return results
+
+
 # ==================== 시너지 분석 ====================
 
-def analyze_synergy(jobs: List[str]) -> str:
+async def analyze_synergy(jobs: List[str], api_key: Optional[str] = None, guild_id: int = 0,
+                          force_fresh: bool = False) -> str:
     """
-    파티 시너지 분석
+    파티 시너지 분석 (같은 직업 조합이면 캐시된 응답 반환)
 
     Args:
         jobs: 직업 리스트 (예: ["홀리나이트", "소서리스", "리퍼", "블레이드"])
+        api_key / guild_id / force_fresh: recommend_party와 동일
 
     Returns:
         시너지 분석 결과
     """
-    if not GEMINI_API_KEY:
-        return "❌ Gemini API 키가 설정되지 않았습니다."
+    if not ai_router.available(api_key, guild_id):
+        return "❌ AI API 키가 설정되지 않았습니다."
+
+    cache_key = make_cache_key("synergy", {
+        "jobs":    sorted(j.strip() for j in jobs if j),
+        "context": get_prompt_context().version,
+    })
+    if not force_fresh:
+        cached = ai_cache.get(cache_key)
+        if cached:
+            return cached
 
     try:
-        model = _get_model()
-
-        synergy_context = _build_synergy_context()
-        dps_context     = _build_dps_context()
-        job_list_str    = "\n".join([f"  - {j}" for j in jobs])
+        job_list_str = "\n".join([f"  - {j}" for j in jobs])
+        context      = build_scoped_context(jobs, 8 if len(jobs) > 4 else 4)
 
         prompt = f"""당신은 로스트아크 시너지 분석 전문가입니다.
 
-{dps_context}
-
-{synergy_context}
+{context}
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━
 [분석할 파티 구성]
@@ -231,8 +571,12 @@ def analyze_synergy(jobs: List[str]) -> str:
 
 400자 이내로 간결하게."""
 
-        response = model.generate_content(prompt)
-        return response.text
+        text = await ai_router.generate(prompt, api_key, guild_id)
+        ai_cache.set(cache_key, text)
+        return text
+
+    except asyncio.TimeoutError:
+        return "❌ AI 응답 시간이 초과되었습니다. 잠시 후 다시 시도해주세요."
 
     except Exception as e:
         return f"❌ 시너지 분석 실패: {e}"
@@ -240,20 +584,21 @@ def analyze_synergy(jobs: List[str]) -> str:
 
 # ==================== 레이드 정보 ====================
 
-def get_raid_guide(raid_name: str) -> str:
+async def get_raid_guide(raid_name: str, api_key: Optional[str] = None, guild_id: int = 0) -> str:
     """레이드 공략 정보"""
-    if not GEMINI_API_KEY:
-        return "❌ Gemini API 키가 설정되지 않았습니다."
+    if not ai_router.available(api_key, guild_id):
+        return "❌ AI API 키가 설정되지 않았습니다."
 
     try:
-        model  = _get_model()
         prompt = f"""로스트아크 {raid_name} 레이드를 3~5줄로 요약해주세요.
 1. 레이드 특징
 2. 주의사항
 3. 추천 파티 구성"""
 
-        response = model.generate_content(prompt)
-        return response.text
+        return await ai_router.generate(prompt, api_key, guild_id)
+
+    except asyncio.TimeoutError:
+        return "❌ AI 응답 시간이 초과되었습니다. 잠시 후 다시 시도해주세요."
 
     except Exception as e:
         return f"❌ 레이드 정보 조회 실패: {e}"
@@ -261,16 +606,17 @@ def get_raid_guide(raid_name: str) -> str:
 
 # ==================== 간단 질문 ====================
 
-def ask_ai(question: str) -> str:
+async def ask_ai(question: str, api_key: Optional[str] = None, guild_id: int = 0) -> str:
     """로스트아크 관련 질문 답변"""
-    if not GEMINI_API_KEY:
-        return "❌ Gemini API 키가 설정되지 않았습니다."
+    if not ai_router.available(api_key, guild_id):
+        return "❌ AI API 키가 설정되지 않았습니다."
 
     try:
-        model  = _get_model()
         prompt = f"로스트아크 전문가로서 간략하게 답변해주세요.\n\n질문: {question}"
-        response = model.generate_content(prompt)
-        return response.text
+        return await ai_router.generate(prompt, api_key, guild_id)
+
+    except asyncio.TimeoutError:
+        return "❌ AI 응답 시간이 초과되었습니다. 잠시 후 다시 시도해주세요."
 
     except Exception as e:
         return f"❌ AI 응답 실패: {e}"
\ No newline at end of file
@@ -0,0 +1,292 @@
+"""
+로일(LoIl) - 주간 골드 수입 계산
+참여 행렬(WeekModel) → 캐릭터 / 길드원 / 길드 전체 골드 합계
+
+- 참여 1건(길드원 × 레이드 열) = 1행, 열 배열(array)로 보관: 캐릭터 번호, 레이드 열, 골드, 더보기
+  레이드 단위 값(raid_key, 관문별 보상, 클리어한 관문 수)은 레이드 표에 한 번만
+- 관문별 보상: raids.json rewards.gateN { gold, extra } (없으면 gold_total 1관문)
+- 캐릭터별 골드 규칙: 같은 레이드는 난이도 무관 1회, 골드 높은 순 WEEKLY_CHARACTER_RAID_LIMIT개
+  (클리어한 관문이 있는 레이드가 먼저 → 이미 받은 골드는 나중 배정에 밀리지 않음)
+- 더보기(셀 끝 +): 관문마다 extra 골드 차감 - 골드 레이드가 아니어도 비용은 나감
+- 셀 1칸 / 클리어 1건이 바뀌면 해당 캐릭터만 다시 계산해 길드원·길드·레이드 합계에 차이만 반영
+- 예상 골드 = 배정 전 관문 기준, 획득 골드 = 클리어한 관문만 (부분 클리어 포함)
+"""
+
+from array import array
+from typing import Optional
+
+from bot.config.settings import WEEKLY_CHARACTER_RAID_LIMIT
+from bot.utils.week_model import WeekModel
+
+
+def _rewards(raid: dict) -> tuple:
+    """레이드 → 관문별 (골드, 더보기 비용) (raids.json에 없으면 gold 1관문)"""
+    rewards = raid.get('rewards')
+    if rewards:
+        return tuple((int(g), int(e)) for g, e in rewards)
+    return ((int(raid.get('gold') or 0), 0),)
+
+
+def _cleared_gates(raid: dict, gates: int) -> int:
+    """클리어한 관문 수 (전체 클리어면 관문 수)"""
+    if raid.get('cleared'):
+        return gates
+    return max(0, min(int(raid.get('cleared_gates') or 0), gates))
+
+
+class GoldLedger:
+    """
+    길드 주간 골드 장부
+
+    Example:
+        >>> ledger = GoldLedger(WeekModel.from_sheet(data, guild_id))
+        >>> ledger.expected, ledger.earned
+        (123400, 45600)
+        >>> ledger.set_cell("거니", 7, None)   # 셀 비움 → 해당 캐릭터만 재계산
+        >>> ledger.set_gates(7, 1)             # 1관문까지 클리어
+    """
+
+    def __init__(self, model: WeekModel):
+        self.model = model
+        # 레이드 표: col → [raid_key, 골드 합계, 클리어한 관문 수, ((관문 골드, 더보기 비용), ...)]
+        self.raids: dict[int, list] = {}
+        for col, r in model.raids.items():
+            rewards = _rewards(r)
+            self.raids[col] = [r['key'], sum(g for g, _ in rewards), _cleared_gates(r, len(rewards)), rewards]
+
+        # 행 열 배열 (빈 행은 char = -1, 재사용)
+        self._char  = array('i')
+        self._col   = array('i')
+        self._gold  = array('i')
+        self._bonus = array('b')
+        self._free: list[int] = []
+        self._cell: dict[tuple[str, int], int] = {}         # (이름, col) → 행
+        self._raid_rows: dict[int, set[int]] = {col: set() for col in self.raids}
+
+        # 캐릭터 표: 번호 → 키 (이름, 직업, 부캐 여부)
+        self._char_keys: list[tuple] = []
+        self._char_index: dict[tuple, int] = {}
+        self._char_rows: list[set[int]] = []
+        self._paid: list[tuple] = []                         # 골드 받는 레이드 열
+        self._value: list[tuple] = []                        # (col, 예상 골드) - 행은 재사용되므로 값으로
+        self._char_expected = array('i')
+        self._char_earned   = array('i')
+
+        self.member_expected: dict[str, int] = {}
+        self.member_earned:   dict[str, int] = {}
+        self.raid_gold:       dict[int, int] = {col: 0 for col in self.raids}
+        self.expected = 0
+        self.earned   = 0
+
+        touched = set()
+        for name, chars in model.members.items():
+            for col, char in chars.items():
+                touched.add(self._insert(name, col, char))
+        for c in sorted(touched):
+            self._settle(c)
+
+    # ==================== 행 ====================
+
+    def _character(self, name: str, char: dict) -> int:
+        key = (name, char.get('std_job') or char.get('raw'), bool(char.get('is_alt')))
+        c = self._char_index.get(key)
+        if c is None:
+            c = self._char_index[key] = len(self._char_keys)
+            self._char_keys.append(key)
+            self._char_rows.append(set())
+            self._paid.append(())
+            self._value.append(())
+            self._char_expected.append(0)
+            self._char_earned.append(0)
+        return c
+
+    def _insert(self, name: str, col: int, char: dict) -> int:
+        c = self._character(name, char)
+        gold, bonus = self.raids[col][1], int(bool(char.get('bonus')))
+        if self._free:
+            row = self._free.pop()
+            self._char[row], self._col[row], self._gold[row], self._bonus[row] = c, col, gold, bonus
+        else:
+            row = len(self._char)
+            self._char.append(c)
+            self._col.append(col)
+            self._gold.append(gold)
+            self._bonus.append(bonus)
+        self._cell[(name, col)] = row
+        self._raid_rows[col].add(row)
+        self._char_rows[c].add(row)
+        return c
+
+    def _delete(self, name: str, col: int) -> Optional[int]:
+        row = self._cell.pop((name, col), None)
+        if row is None:
+            return None
+        c = self._char[row]
+        self._char_rows[c].discard(row)
+        self._raid_rows[col].discard(row)
+        self._char[row] = -1
+        self._free.append(row)
+        return c
+
+    # ==================== 정산 ====================
+
+    def _settle(self, c: int):
+        """캐릭터 1명의 골드 레이드를 다시 골라 합계에 차이만 반영"""
+        gold, cols, raids = self._gold, self._col, self.raids
+        rows = sorted(
+            (r for r in self._char_rows[c] if gold[r] > 0),
+            key=lambda r: (not raids[cols[r]][2], -gold[r], cols[r]),
+        )
+        paid, seen = set(), set()
+        for r in rows:
+            key = raids[cols[r]][0]
+            if key in seen:
+                continue
+            seen.add(key)
+            paid.add(r)
+            if len(paid) >= WEEKLY_CHARACTER_RAID_LIMIT:
+                break
+
+        # 행별 (예상, 획득): 골드 레이드면 관문 골드, 더보기면 관문마다 비용 차감
+        value, expected, earned = [], 0, 0
+        for r in sorted(self._char_rows[c]):
+            _, _, done, rewards = raids[cols[r]]
+            exp = earn = 0
+            for gate, (g, extra) in enumerate(rewards):
+                v = (g if r in paid else 0) - (extra if self._bonus[r] else 0)
+                exp += v
+                if gate < done:
+                    earn += v
+            if exp or earn:
+                value.append((cols[r], exp))
+            expected += exp
+            earned   += earn
+
+        for col, g in self._value[c]:
+            self.raid_gold[col] -= g
+        for col, g in value:
+            self.raid_gold[col] += g
+
+        name   = self._char_keys[c][0]
+        d_exp  = expected - self._char_expected[c]
+        d_earn = earned - self._char_earned[c]
+        self.member_expected[name] = self.member_expected.get(name, 0) + d_exp
+        self.member_earned[name]   = self.member_earned.get(name, 0) + d_earn
+        self.expected += d_exp
+        self.earned   += d_earn
+        self._char_expected[c], self._char_earned[c] = expected, earned
+        self._paid[c]  = tuple(sorted((cols[r] for r in paid), key=lambda col: -raids[col][1]))
+        self._value[c] = tuple(value)
+
+    # ==================== 증분 갱신 ====================
+
+    def set_cell(self, name: str, col: int, char: Optional[dict]):
+        """
+        참여 셀 1칸 변경 (None이면 비움)
+
+        Args:
+            char: WeekModel.members[이름][col] 형식 { raw, std_job, is_support, is_alt, ... }
+        """
+        if col not in self.raids:
+            return
+        touched = {self._delete(name, col)}
+        if char:
+            touched.add(self._insert(name, col, char))
+        for c in touched - {None}:
+            self._settle(c)
+
+    def set_cleared(self, col: int, cleared: bool):
+        """레이드 전체 클리어 여부 변경"""
+        if col in self.raids:
+            self.set_gates(col, len(self.raids[col][3]) if cleared else 0)
+
+    def set_gates(self, col: int, gates: int):
+        """클리어한 관문 수 변경 (부분 클리어) → 그 레이드에 참여한 캐릭터만 재계산"""
+        if col not in self.raids:
+            return
+        gates = max(0, min(gates, len(self.raids[col][3])))
+        if self.raids[col][2] == gates:
+            return
+        self.raids[col][2] = gates
+        for c in {self._char[r] for r in self._raid_rows[col]}:
+            self._settle(c)
+
+    def sync(self, model: WeekModel) -> bool:
+        """
+        새 모델과 비교해 바뀐 셀/클리어만 반영
+
+        Returns:
+            False → 레이드 구성(열, 레이드 키, 관문 보상)이 바뀌어 증분 불가 (새 장부를 만들어야 함)
+        """
+        if {col: (r['key'], _rewards(r)) for col, r in model.raids.items()} \
+                != {col: (v[0], v[3]) for col, v in self.raids.items()}:
+            return False
+        old = self.model.members
+        for name in old.keys() | model.members.keys():
+            before, after = old.get(name, {}), model.members.get(name, {})
+            if before == after:
+                continue
+            for col in before.keys() | after.keys():
+                if before.get(col) != after.get(col):
+                    self.set_cell(name, col, after.get(col))
+        for col, r in model.raids.items():
+            self.set_gates(col, _cleared_gates(r, len(self.raids[col][3])))
+        self.model = model
+        return True
+
+    # ==================== 조회 ====================
+
+    def summary(self) -> dict:
+        """
+        임베드 / 이미지용 요약
+
+        Returns:
+            {
+                'expected': int, 'earned': int,
+                'raids':    { col: 골드 (더보기 비용 차감) },
+                'members':  [ { name, expected, earned,
+                                characters: [ { std_job, is_alt, expected, earned, raids: [레이드명] } ] } ],
+            }
+        """
+        members: dict[str, list] = {}
+        for c, (name, job, is_alt) in enumerate(self._char_keys):
+            if not self._char_rows[c]:
+                continue
+            members.setdefault(name, []).append({
+                'std_job':  job,
+                'is_alt':   is_alt,
+                'expected': self._char_expected[c],
+                'earned':   self._char_earned[c],
+                'raids':    [self.model.raids[col].get('name', '') for col in self._paid[c]],
+            })
+        return {
+            'expected': self.expected,
+            'earned':   self.earned,
+            'raids':    dict(self.raid_gold),
+            'members':  sorted(
+                ({
+                    'name':       name,
+                    'expected':   self.member_expected.get(name, 0),
+                    'earned':     self.member_earned.get(name, 0),
+                    'characters': sorted(chars, key=lambda ch: (ch['is_alt'], -ch['expected'])),
+                } for name, chars in members.items()),
+                key=lambda m: (-m['expected'], m['name']),
+            ),
+        }
+
+
+# ==================== 길드별 장부 ====================
+
+_LEDGERS: dict[int, GoldLedger] = {}
+
+
+def get_gold_ledger(guild_id: int, model: WeekModel) -> GoldLedger:
+    """길드 장부를 새 모델에 맞춰 갱신 (바뀐 캐릭터만 재계산, 레이드 구성이 바뀌면 새로 생성)"""
+    ledger = _LEDGERS.get(guild_id)
+    if ledger is None or not ledger.sync(model):
+        ledger = _LEDGERS[guild_id] = GoldLedger(model)
+    return ledger
+
+
+def forget_gold_ledger(guild_id: int):
+    _LEDGERS.pop(guild_id, None)
@@ -0,0 +1,263 @@
+"""
+로일(LoIl) - 레이드 참여 기록
+주간 시트는 매주 덮어써지므로 WeekModel을 주차별로 SQLite에 스냅샷
+
+행 = (길드, 주차, 길드원, 레이드 열) → 캐릭터(직업, 부캐, 서폿), 레이드 키/난이도/골드, 클리어 여부, 시각
+- 같은 주차를 다시 스냅샷하면 바뀐 행만 UPSERT, 시트에서 빠진 행은 삭제
+- 처음 본 시각(recorded_at) 유지, 클리어로 바뀐 순간의 시각(cleared_at) 기록
+- 주차 표(weeks)로 출석률 분모(기록된 주 수)를 집계 없이 조회
+- 집계 쿼리는 (guild_id, ...) 복합 커버링 인덱스만 읽도록 구성 → 1년치도 ms 단위
+
+주차 키: 주간 초기화(수요일 06:00 KST) 기준 그 주 수요일 날짜 "YYYY-MM-DD"
+"""
+
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Optional
+
+from bot.config.settings import HISTORY_DB, HISTORY_DEFAULT_WEEKS
+from bot.utils.week_model import WeekModel
+
+KST = timezone(timedelta(hours=9))
+RESET_HOUR = 6   # 주간 초기화 (수요일 06:00 KST)
+
+
+def week_key(ts: Optional[float] = None) -> str:
+    """
+    시각 → 주차 키 (그 주 수요일 날짜)
+
+    Example:
+        >>> week_key(datetime(2026, 10, 20, 12, tzinfo=KST).timestamp())   # 화요일
+        '2026-10-14'
+    """
+    now = datetime.fromtimestamp(time.time() if ts is None else ts, KST) - timedelta(hours=RESET_HOUR)
+    return (now - timedelta(days=(now.weekday() - 2) % 7)).strftime("%Y-%m-%d")
+
+
+def _since(weeks: int, ts: Optional[float] = None) -> str:
+    """최근 weeks주 시작 주차 키 (이번 주 포함)"""
+    return week_key((time.time() if ts is None else ts) - (weeks - 1) * 7 * 86400)
+
+
+# ==================== 기록 테이블 ====================
+
+class HistoryStore:
+    """길드별 주간 레이드 참여 기록 (SQLite)"""
+
+    FIELDS = ("character", "is_alt", "is_support", "raid_name", "raid_key", "difficulty", "gold", "cleared")
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._lock   = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS weeks ("
+                "  guild_id    TEXT NOT NULL,"
+                "  week        TEXT NOT NULL,"
+                "  raids       INTEGER NOT NULL,"
+                "  members     INTEGER NOT NULL,"
+                "  updated_at  REAL NOT NULL,"
+                "  PRIMARY KEY (guild_id, week)"
+                ") WITHOUT ROWID"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS participation ("
+                "  guild_id    TEXT NOT NULL,"
+                "  week        TEXT NOT NULL,"
+                "  member      TEXT NOT NULL,"
+                "  raid_col    INTEGER NOT NULL,"
+                "  character   TEXT NOT NULL,"
+                "  is_alt      INTEGER NOT NULL,"
+                "  is_support  INTEGER NOT NULL,"
+                "  raid_name   TEXT NOT NULL,"
+                "  raid_key    TEXT NOT NULL,"
+                "  difficulty  TEXT,"
+                "  gold        INTEGER NOT NULL DEFAULT 0,"
+                "  cleared     INTEGER NOT NULL DEFAULT 0,"
+                "  recorded_at REAL NOT NULL,"
+                "  cleared_at  REAL,"
+                "  PRIMARY KEY (guild_id, week, member, raid_col)"
+                ") WITHOUT ROWID"
+            )
+            # 집계별 커버링 인덱스 (테이블 본문을 읽지 않음)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_history_member "
+                "ON participation (guild_id, member, week, cleared, is_support)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_history_raid "
+                "ON participation (guild_id, raid_key, difficulty, week, raid_col, cleared)"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    # ==================== 스냅샷 ====================
+
+    @staticmethod
+    def _rows(model: WeekModel) -> dict[tuple[str, int], dict]:
+        rows = {}
+        for name, chars in model.members.items():
+            for col, char in chars.items():
+                raid = model.raids[col]
+                rows[(name, col)] = {
+                    "character":  char.get("std_job") or char.get("raw") or "",
+                    "is_alt":     int(bool(char.get("is_alt"))),
+                    "is_support": int(bool(char.get("is_support"))),
+                    "raid_name":  raid.get("name", ""),
+                    "raid_key":   raid["key"],
+                    "difficulty": raid.get("difficulty"),
+                    "gold":       int(raid.get("gold") or 0),
+                    "cleared":    int(bool(raid.get("cleared"))),
+                }
+        return rows
+
+    def snapshot(self, guild_id: int, model: WeekModel, week: Optional[str] = None,
+                 now: Optional[float] = None) -> dict:
+        """
+        이번 주 모델 저장 - 변경된 행만 쓰기
+
+        Args:
+            week: 주차 키 (None이면 now 기준 이번 주)
+
+        Returns:
+            { week, inserted, updated, unchanged, removed }
+        """
+        gid    = str(guild_id)
+        now    = time.time() if now is None else now
+        week   = week or week_key(now)
+        rows   = self._rows(model)
+        result = {"week": week, "inserted": 0, "updated": 0, "unchanged": 0, "removed": 0}
+
+        with self._lock:
+            conn = self._connect()
+            existing = {
+                (r["member"], r["raid_col"]): r for r in conn.execute(
+                    "SELECT * FROM participation WHERE guild_id = ? AND week = ?", (gid, week)
+                ).fetchall()
+            }
+
+            inserts, updates = [], []
+            for (name, col), row in rows.items():
+                old = existing.get((name, col))
+                if old is None:
+                    result["inserted"] += 1
+                    inserts.append((gid, week, name, col, *(row[f] for f in self.FIELDS),
+                                    now, now if row["cleared"] else None))
+                elif all(old[f] == row[f] for f in self.FIELDS):
+                    result["unchanged"] += 1
+                else:
+                    result["updated"] += 1
+                    cleared_at = old["cleared_at"] if old["cleared"] else now
+                    updates.append((*(row[f] for f in self.FIELDS),
+                                    cleared_at if row["cleared"] else None, gid, week, name, col))
+            removed = [(gid, week, name, col) for name, col in existing.keys() - rows.keys()]
+            result["removed"] = len(removed)
+
+            conn.executemany(
+                "INSERT INTO participation "
+                "(guild_id, week, member, raid_col, " + ", ".join(self.FIELDS) + ", recorded_at, cleared_at) "
+                "VALUES (" + ", ".join("?" * (len(self.FIELDS) + 6)) + ")",
+                inserts
+            )
+            conn.executemany(
+                "UPDATE participation SET " + ", ".join(f"{f} = ?" for f in self.FIELDS) + ", cleared_at = ? "
+                "WHERE guild_id = ? AND week = ? AND member = ? AND raid_col = ?",
+                updates
+            )
+            conn.executemany(
+                "DELETE FROM participation WHERE guild_id = ? AND week = ? AND member = ? AND raid_col = ?",
+                removed
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO weeks (guild_id, week, raids, members, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (gid, week, len(model.raids), len(model.members), now)
+            )
+            conn.commit()
+        return result
+
+    # ==================== 집계 ====================
+
+    def _query(self, sql: str, params: tuple) -> list[dict]:
+        with self._lock:
+            rows = self._connect().execute(sql, params).fetchall()
+        return [dict(r) for r in rows]
+
+    def attendance(self, guild_id: int, weeks: int = HISTORY_DEFAULT_WEEKS,
+                   now: Optional[float] = None) -> list[dict]:
+        """
+        길드원별 출석률 (참여한 주 / 기록된 주)
+
+        Returns:
+            [ { member, attended, weeks, rate, signups, clears } ]  (출석률 내림차순)
+        """
+        gid, since = str(guild_id), _since(weeks, now)
+        total = self._query(
+            "SELECT COUNT(*) AS n FROM weeks WHERE guild_id = ? AND week >= ?", (gid, since)
+        )[0]["n"]
+        rows = self._query(
+            "SELECT member, COUNT(DISTINCT week) AS attended, COUNT(*) AS signups, SUM(cleared) AS clears "
+            "FROM participation INDEXED BY idx_history_member "
+            "WHERE guild_id = ? AND week >= ? GROUP BY member",
+            (gid, since)
+        )
+        for r in rows:
+            r["weeks"] = total
+            r["rate"]  = round(r["attended"] / total, 3) if total else 0.0
+        return sorted(rows, key=lambda r: (-r["rate"], -r["clears"], r["member"]))
+
+    def raid_clears(self, guild_id: int, weeks: int = HISTORY_DEFAULT_WEEKS,
+                    now: Optional[float] = None) -> list[dict]:
+        """
+        레이드(키, 난이도)별 클리어 집계
+
+        Returns:
+            [ { raid_key, difficulty, runs, cleared_runs, clears } ]
+            runs = 편성된 레이드 수(주차×열), clears = 클리어한 참여 건수
+        """
+        return self._query(
+            "SELECT raid_key, difficulty, "
+            "       COUNT(DISTINCT week || ':' || raid_col) AS runs, "
+            "       COUNT(DISTINCT CASE WHEN cleared THEN week || ':' || raid_col END) AS cleared_runs, "
+            "       SUM(cleared) AS clears "
+            "FROM participation INDEXED BY idx_history_raid "
+            "WHERE guild_id = ? AND week >= ? GROUP BY raid_key, difficulty "
+            "ORDER BY clears DESC, raid_key",
+            (str(guild_id), _since(weeks, now))
+        )
+
+    def role_share(self, guild_id: int, weeks: int = HISTORY_DEFAULT_WEEKS, member: Optional[str] = None,
+                   now: Optional[float] = None) -> dict:
+        """
+        서폿/딜러 참여 비율 (member가 있으면 그 길드원만)
+
+        Returns:
+            { support, dps, support_share }
+        """
+        sql    = "SELECT SUM(is_support) AS support, COUNT(*) AS total FROM participation INDEXED BY idx_history_member " \
+                 "WHERE guild_id = ? AND week >= ?"
+        params = (str(guild_id), _since(weeks, now))
+        if member is not None:
+            sql    += " AND member = ?"
+            params += (member,)
+        row     = self._query(sql, params)[0]
+        total   = row["total"] or 0
+        support = row["support"] or 0
+        return {
+            "support":       support,
+            "dps":           total - support,
+            "support_share": round(support / total, 3) if total else 0.0,
+        }
+
+
+history_store = HistoryStore(HISTORY_DB)
@@ -181,10 +181,12 @@ def render_my_schedule(nickname: str, schedule: list) -> BytesIO:
 
 # ==================== 이번주 레이드 이미지 (요일 카드형) ====================
 
-def render_weekly_raids(summary: list) -> BytesIO:
+def render_weekly_raids(summary: list, gold: dict = None, times: dict = None) -> BytesIO:
     """
     이번주-레이드 → 요일 카드형 이미지
     summary: get_weekly_summary() 반환값
+    gold:    GoldLedger.summary() 반환값 (있으면 헤더 합계 + 레이드별 골드 표시)
+    times:   ClearStats.raid_stats() 반환값 (있으면 예상 시간 대신 실측 중앙값 표시)
     """
     W = 680
     PAD = 24
@@ -219,7 +221,10 @@ def render_weekly_raids(summary: list) -> BytesIO:
     # 헤더
     draw.rectangle([0, 0, 6, HEADER_H], fill=_hex(C["accent"]))
     draw.text((PAD, 16), "📅  이번 주 레이드 일정", font=f_title, fill=_hex(C["text_white"]))
-    draw.text((PAD, 46), f"총 {total}개 레이드", font=f_meta, fill=_hex(C["text_gray"]))
+    sub = f"총 {total}개 레이드"
+    if gold:
+        sub += f"  ·  💰 예상 {gold['expected']:,}G  ·  획득 {gold['earned']:,}G"
+    draw.text((PAD, 46), sub, font=f_meta, fill=_hex(C["text_gray"]))
     draw.rectangle([PAD, HEADER_H - 2, W - PAD, HEADER_H], fill=_hex(C["divider"]))
 
     y = HEADER_H + PAD
@@ -237,6 +242,10 @@ def render_weekly_raids(summary: list) -> BytesIO:
             count     = r.get('member_count', 0)
             dur       = r.get('duration', 30)
             dur_str   = f"~{dur // 60}h" if dur >= 60 else f"~{dur}m"
+            stat      = (times or {}).get(r.get('col'))
+            if stat:
+                p50     = round(stat['p50'])
+                dur_str = f"⏱{p50 // 60}h{p50 % 60:02d}m" if p50 >= 60 else f"⏱{p50}m"
 
             # 시간
             draw.text((PAD + 14, y + 13), time_str, font=f_time, fill=_hex(C["gold"]))
@@ -244,7 +253,8 @@ def render_weekly_raids(summary: list) -> BytesIO:
             tx = PAD + 85
             draw.text((tx, y + 13), name, font=f_raid, fill=_hex(C["text_white"]))
             # 인원 + 시간 (우측)
-            meta = f"{count}명  ·  {dur_str}"
+            raid_gold = (gold or {}).get('raids', {}).get(r.get('col'), 0)
+            meta = f"{count}명  ·  {raid_gold:,}G  ·  {dur_str}" if raid_gold else f"{count}명  ·  {dur_str}"
             mw   = int(_text_w(draw, meta, f_meta))
             draw.text((W - PAD - mw - 10, y + 14), meta, font=f_meta, fill=_hex(C["text_gray"]))
 
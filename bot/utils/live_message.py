@@ -0,0 +1,71 @@
+"""
+로일(LoIl) - 스트리밍 진행 상황 메시지
+AI 응답이 생성되는 동안 디스코드 메시지 1개를 점진적으로 수정
+
+- 수정 간격 제한(AI_STREAM_EDIT_INTERVAL): 간격 안에 들어온 갱신은 마지막 것만 남김
+- 첫 갱신은 즉시 반영 → 첫 조각이 오는 대로 내용 표시
+- finish()는 간격과 무관하게 최종 내용으로 수정
+- 수정 실패(삭제된 메시지 등)는 로그만 남기고 무시 (편성 흐름을 막지 않음)
+"""
+
+import time
+from typing import Callable, Optional
+
+import discord
+
+from bot.config.settings import AI_STREAM_EDIT_INTERVAL
+
+MESSAGE_LIMIT = 2000
+
+
+class LiveMessage:
+    """
+    간격 제한이 있는 메시지 점진 수정기
+
+    Example:
+        >>> status = await thread.send("🤖 AI 파티 편성 중...")
+        >>> live = LiveMessage(status, render=_format_party_preview)
+        >>> results = await recommend_parties_structured(raids, on_progress=live.update)
+        >>> await live.finish("✅ AI 파티 편성 완료")
+    """
+
+    def __init__(self, message: discord.Message, render: Optional[Callable[[object], str]] = None,
+                 interval: float = AI_STREAM_EDIT_INTERVAL):
+        self.message   = message
+        self.render    = render or str
+        self.interval  = interval
+        self._latest   = None
+        self._shown    = message.content if message else None
+        self._last     = 0.0
+        self._editing  = False
+        self.edits     = 0
+
+    async def update(self, payload):
+        """진행 상황 갱신 (간격 안이면 보류, 다음 갱신/finish에서 반영)"""
+        self._latest = payload
+        if self._editing or time.monotonic() - self._last < self.interval:
+            return
+        await self._edit(self.render(payload))
+
+    async def finish(self, content: Optional[str] = None):
+        """최종 내용으로 수정 (None이면 마지막으로 받은 진행 상황)"""
+        if content is None:
+            if self._latest is None:
+                return
+            content = self.render(self._latest)
+        await self._edit(content)
+
+    async def _edit(self, content: str):
+        content = content[:MESSAGE_LIMIT]
+        if not self.message or not content or content == self._shown:
+            return
+        self._editing = True
+        self._last    = time.monotonic()
+        try:
+            await self.message.edit(content=content)
+            self._shown = content
+            self.edits += 1
+        except discord.HTTPException as e:
+            print(f"[live_message] 메시지 수정 실패: {e}")
+        finally:
+            self._editing = False
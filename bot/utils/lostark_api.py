@@ -3,23 +3,53 @@
 - Round-robin API 키 관리
 - 캐릭터 정보 조회
 - 원정대 정보 조회
-- 캐싱 시스템
+- 통합 아머리 조회 (filters로 여러 섹션 1회 요청)
+- 캐싱 시스템 (메모리 + SQLite 디스크, stale-while-revalidate)
 """
 
+import asyncio
+import random
+import re
 import requests
+import threading
 import time
+import unicodedata
+from collections import deque
 from datetime import datetime, timedelta
 from typing import Optional, Dict, List
-from bot.config.settings import LOSTARK_API_KEYS, LOSTARK_API_BASE_URL
+from bot.config.settings import (
+    LOSTARK_API_KEYS,
+    LOSTARK_API_BASE_URL,
+    LOSTARK_API_RATE_LIMIT,
+    LOSTARK_API_CACHE_MINUTES,
+    LOSTARK_API_CACHE_DB,
+    LOSTARK_API_STALE_MINUTES,
+    LOSTARK_API_MAINTENANCE_STALE_HOURS,
+    LOSTARK_API_NOT_FOUND_TTL_MINUTES,
+    LOSTARK_API_EMPTY_TTL_MINUTES,
+    LOSTARK_API_MAX_RETRIES,
+    LOSTARK_API_BACKOFF_BASE,
+    LOSTARK_API_BACKOFF_MAX,
+    LOSTARK_API_CIRCUIT_THRESHOLD,
+    LOSTARK_API_CIRCUIT_COOLDOWN,
+)
+from bot.utils.api_cache import PersistentCache
+from bot.utils.api_metrics import metrics
 
 # ==================== Round-robin API 키 관리 ====================
 
 class APIKeyManager:
-    """API 키 Round-robin 관리"""
+    """
+    API 키 Round-robin 관리 + 키별 분당 예산
+    키마다 최근 60초 사용 시각을 기록해 LOSTARK_API_RATE_LIMIT를 넘지 않게 배분
+    """
     
     def __init__(self):
         self.keys = LOSTARK_API_KEYS
         self.current_index = 0
+        self.rate_limit = LOSTARK_API_RATE_LIMIT
+        self._usage: Dict[str, deque] = {k: deque() for k in self.keys}
+        self._lock = threading.Lock()
     
     def get_next_key(self) -> str:
         """다음 API 키 반환 (Round-robin)"""
@@ -30,6 +60,43 @@ class APIKeyManager:
         self.current_index = (self.current_index + 1) % len(self.keys)
         return key
     
+    def _trim(self, key: str, now: float) -> deque:
+        """60초 지난 사용 기록 제거"""
+        usage = self._usage.setdefault(key, deque())
+        while usage and now - usage[0] >= 60:
+            usage.popleft()
+        return usage
+    
+    def acquire(self, timeout: float = 30) -> str:
+        """
+        예산이 남은 다음 키 반환 (Round-robin 순서 유지)
+        모든 키가 소진됐으면 가장 먼저 풀리는 시점까지 대기
+        
+        Raises:
+            ValueError:   키 미설정
+            TimeoutError: timeout 안에 예산이 돌아오지 않음
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now  = time.monotonic()
+                wait = 60.0
+                for _ in range(max(len(self.keys), 1)):
+                    key   = self.get_next_key()
+                    usage = self._trim(key, now)
+                    if len(usage) < self.rate_limit:
+                        usage.append(now)
+                        return key
+                    wait = min(wait, 60 - (now - usage[0]))
+            if now + wait > deadline:
+                raise TimeoutError("로스트아크 API 키 예산 소진")
+            time.sleep(max(wait, 0.05))
+    
+    def remaining(self, key: str) -> int:
+        """키의 이번 1분 남은 요청 수"""
+        with self._lock:
+            return max(self.rate_limit - len(self._trim(key, time.monotonic())), 0)
+    
     def get_total_keys(self) -> int:
         """전체 키 개수"""
         return len(self.keys)
@@ -58,79 +125,420 @@ class SimpleCache:
                 del self.cache[key]  # 만료된 캐시 삭제
         return None
     
-    def set(self, key: str, data: dict):
-        """캐시에 데이터 저장"""
-        expire_time = datetime.now() + self.ttl
+    def set(self, key: str, data: dict, ttl_seconds: Optional[float] = None):
+        """캐시에 데이터 저장 (ttl_seconds 지정 시 기본 TTL 대신 사용)"""
+        ttl = timedelta(seconds=ttl_seconds) if ttl_seconds is not None else self.ttl
+        expire_time = datetime.now() + ttl
         self.cache[key] = (data, expire_time)
     
-    def clear(self):
-        """캐시 전체 삭제"""
+    def clear(self) -> int:
+        """캐시 전체 삭제. 삭제 개수 반환"""
+        count = len(self.cache)
         self.cache.clear()
+        return count
+
+
+# 전역 캐시 (메모리 1차 + 디스크 2차)
+cache      = SimpleCache(ttl_minutes=LOSTARK_API_CACHE_MINUTES)
+disk_cache = PersistentCache(LOSTARK_API_CACHE_DB)
+
+# 네거티브 캐시: 없는 캐릭터/빈 응답을 짧게 기억 → 오타 반복 조회 방지
+# {endpoint: (kind, data)}  kind = "not_found" | "empty"
+negative_cache = SimpleCache(ttl_minutes=LOSTARK_API_NOT_FOUND_TTL_MINUTES)
+NOT_FOUND_SECONDS = LOSTARK_API_NOT_FOUND_TTL_MINUTES * 60
+EMPTY_SECONDS     = LOSTARK_API_EMPTY_TTL_MINUTES * 60
+
+FRESH_SECONDS       = LOSTARK_API_CACHE_MINUTES * 60
+STALE_SECONDS       = FRESH_SECONDS + LOSTARK_API_STALE_MINUTES * 60
+MAINTENANCE_SECONDS = LOSTARK_API_MAINTENANCE_STALE_HOURS * 3600
+
+# 백그라운드 갱신 중인 엔드포인트 (중복 갱신 방지)
+_refreshing: set[str] = set()
+_refresh_lock = threading.Lock()
+
+
+# ==================== 캐릭터명 정규화 ====================
+
+# 제로폭 문자 (시트/디스코드 복붙 시 섞여 들어옴)
+_ZERO_WIDTH = dict.fromkeys(map(ord, "\u200b\u200c\u200d\u2060\ufeff\u00ad"), None)
+# 로아 캐릭터명: 한글/영문/숫자만 허용
+_VALID_NAME = re.compile(r"^[0-9A-Za-z가-힣]{1,20}$")
+
+
+def normalize_character_name(character_name: str) -> str:
+    """
+    캐릭터명 정규화 (요청 전 처리)
+    - 유니코드 NFC 정규화 (자모 분리된 한글 결합)
+    - 제로폭 문자 / 모든 공백 제거
+    - 캐릭터명에 쓸 수 없는 문자가 있으면 빈 문자열
+
+    Example:
+        >>> normalize_character_name(" 빛쟁인\u200b거니 ")
+        '빛쟁인거니'
+    """
+    if not character_name:
+        return ""
+    name = unicodedata.normalize("NFC", str(character_name)).translate(_ZERO_WIDTH)
+    name = "".join(name.split())
+    return name if _VALID_NAME.match(name) else ""
 
 
-# 전역 캐시
-cache = SimpleCache(ttl_minutes=5)
+def _character_endpoint(path: str, character_name: str) -> Optional[str]:
+    """'{name}' 자리에 정규화된 캐릭터명을 넣은 엔드포인트. 잘못된 이름이면 None"""
+    name = normalize_character_name(character_name)
+    return path.format(name=name) if name else None
+
+
+# ==================== 응답 결과 타입 ====================
+
+class APIStatus:
+    """API 응답 분류"""
+    OK           = "ok"
+    NOT_FOUND    = "not_found"      # 없는 캐릭터 (404 또는 200 + null)
+    RATE_LIMITED = "rate_limited"   # 429 - 재시도 후에도 한도 초과
+    UNAVAILABLE  = "unavailable"    # 점검(503) / 5xx / 타임아웃 / 서킷 오픈
+    ERROR        = "error"          # 그 외 4xx (인증 실패, 잘못된 요청)
+
+
+class APIResult:
+    """
+    API 호출 결과
+    - status: APIStatus 값
+    - data:   응답 데이터 (실패 시에도 캐시 데이터가 있으면 채워짐)
+    - stale:  data가 신선 기간이 지난 캐시인지 여부
+    """
+
+    __slots__ = ("status", "data", "stale", "status_code")
+
+    def __init__(self, status: str, data=None, stale: bool = False, status_code: int = 0):
+        self.status      = status
+        self.data        = data
+        self.stale       = stale
+        self.status_code = status_code
+
+    @property
+    def ok(self) -> bool:
+        return self.status == APIStatus.OK
+
+    def __repr__(self) -> str:
+        return f"APIResult({self.status}, code={self.status_code}, stale={self.stale})"
+
+
+# ==================== 서킷 브레이커 ====================
+
+class CircuitBreaker:
+    """
+    API 장애 시 요청 폭주 방지
+    CLOSED    → 정상
+    OPEN      → 점검(503) 또는 연속 실패 시. cooldown 동안 요청 차단
+    HALF_OPEN → cooldown 후 프로브 1건만 허용, 성공하면 CLOSED
+                (판정 없이 끝난 프로브는 release()로 반납)
+    """
+
+    CLOSED    = "closed"
+    OPEN      = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, cooldown: float = 60):
+        self.failure_threshold = failure_threshold
+        self.cooldown          = cooldown
+        self.state             = self.CLOSED
+        self.failures          = 0
+        self.opened_at         = 0.0
+        self._probing          = False
+        self._probe_thread     = None
+        self._lock             = threading.Lock()
+
+    def allow(self) -> bool:
+        """요청 허용 여부 (HALF_OPEN에서는 프로브 1건만)"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.cooldown:
+                self.state = self.HALF_OPEN
+                self._probing = False
+            if self.state == self.HALF_OPEN and not self._probing:
+                self._probing      = True
+                self._probe_thread = threading.get_ident()
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self.state != self.CLOSED:
+                print("✅ 로스트아크 API 복구 - 서킷 닫힘")
+            self.state    = self.CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def release(self):
+        """프로브가 성공/실패 판정 없이 끝남 (429, 키 예산 소진) → 다음 요청이 다시 프로브"""
+        with self._lock:
+            if self.state == self.HALF_OPEN and self._probe_thread == threading.get_ident():
+                self._probing = False
+
+    def record_failure(self, maintenance: bool = False):
+        """실패 기록. 점검(503)이거나 프로브 실패면 즉시 OPEN"""
+        with self._lock:
+            self.failures += 1
+            if maintenance or self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    print(f"⛔ 로스트아크 API 서킷 오픈 ({int(self.cooldown)}초 차단)")
+                self.state     = self.OPEN
+                self.opened_at = time.monotonic()
+                self._probing  = False
+
+
+circuit = CircuitBreaker(
+    failure_threshold=LOSTARK_API_CIRCUIT_THRESHOLD,
+    cooldown=LOSTARK_API_CIRCUIT_COOLDOWN,
+)
 
 
 # ==================== API 호출 ====================
 
-def _make_request(endpoint: str, use_cache: bool = True) -> Optional[dict]:
+_TRANSIENT_STATUSES = {0, 429, 500, 502, 504}
+
+
+def _backoff(attempt: int, retry_after: Optional[float] = None) -> float:
+    """지수 백오프 + full jitter (Retry-After 헤더가 있으면 우선)"""
+    if retry_after is not None:
+        return min(retry_after, LOSTARK_API_BACKOFF_MAX)
+    ceiling = min(LOSTARK_API_BACKOFF_BASE * (2 ** attempt), LOSTARK_API_BACKOFF_MAX)
+    return random.uniform(0, ceiling)
+
+
+def _fetch(endpoint: str) -> tuple[int, Optional[dict], Optional[float]]:
     """
-    API 요청 (내부 함수)
-    
-    Args:
-        endpoint: API 엔드포인트 (예: /armories/characters/빛쟁인거니/profiles)
-        use_cache: 캐시 사용 여부
-    
+    실제 HTTP 요청 1회 (캐시/재시도 없음)
+
     Returns:
-        API 응답 데이터 또는 None
+        (status_code, data, retry_after) - 네트워크 오류/타임아웃은 status_code 0
     """
-    # 캐시 확인
-    if use_cache:
-        cached_data = cache.get(endpoint)
-        if cached_data:
-            return cached_data
-    
-    # API 호출
     url = f"{LOSTARK_API_BASE_URL}{endpoint}"
-    api_key = key_manager.get_next_key()
+    try:
+        api_key = key_manager.acquire()
+    except TimeoutError:
+        print(f"⚠️ API 키 예산 소진 - 요청 보류: {endpoint}")
+        return 429, None, None
     
     headers = {
         'accept': 'application/json',
         'authorization': f'bearer {api_key}'
     }
     
+    key_index = key_manager.keys.index(api_key) if api_key in key_manager.keys else -1
+    started   = time.perf_counter()
     try:
         response = requests.get(url, headers=headers, timeout=10)
+        metrics.record_request(endpoint, response.status_code, (time.perf_counter() - started) * 1000)
+        metrics.record_key_remaining(key_index, _header_int(response, 'X-RateLimit-Remaining'))
         
         if response.status_code == 200:
-            data = response.json()
-            # 캐시 저장
-            if use_cache:
-                cache.set(endpoint, data)
-            return data
+            return 200, response.json(), None
         
-        elif response.status_code == 503:
+        retry_after = None
+        if response.status_code == 503:
             print(f"⚠️ 로스트아크 API 점검 중")
-            return None
         
         elif response.status_code == 429:
             print(f"⚠️ Rate Limit 도달 - API 키: {api_key[:20]}...")
-            return None
+            try:
+                retry_after = float(response.headers.get('Retry-After', ''))
+            except (TypeError, ValueError):
+                retry_after = None
         
-        else:
+        elif response.status_code != 404:
             print(f"⚠️ API 에러 {response.status_code}: {endpoint}")
-            return None
+        return response.status_code, None, retry_after
     
     except requests.exceptions.Timeout:
+        metrics.record_request(endpoint, 0, (time.perf_counter() - started) * 1000)
         print(f"⚠️ API 타임아웃: {endpoint}")
-        return None
+        return 0, None, None
     
     except Exception as e:
+        metrics.record_request(endpoint, 0, (time.perf_counter() - started) * 1000)
         print(f"❌ API 호출 에러: {e}")
+        return 0, None, None
+
+
+def _header_int(response, name: str) -> Optional[int]:
+    """응답 헤더 정수값 (없거나 파싱 불가면 None)"""
+    try:
+        return int(response.headers.get(name, ''))
+    except (AttributeError, TypeError, ValueError):
         return None
 
 
+def _store(endpoint: str, data):
+    """메모리 + 디스크 캐시 저장"""
+    cache.set(endpoint, data)
+    disk_cache.set(endpoint, data)
+
+
+def _request_network(endpoint: str, store: bool = True) -> APIResult:
+    """
+    재시도 + 서킷 브레이커를 거친 API 호출 (캐시 조회 없음)
+
+    - 429 / 5xx / 타임아웃: 지수 백오프 + jitter로 최대 LOSTARK_API_MAX_RETRIES회 재시도
+    - 503 점검: 재시도 없이 서킷 오픈
+    - 서킷 오픈 중: 호출 없이 UNAVAILABLE
+    - 백오프 / 키 예산 대기는 time.sleep → 이벤트 루프에서는 asyncio.to_thread로 호출
+    """
+    _ensure_off_loop()
+    if not circuit.allow():
+        return APIResult(APIStatus.UNAVAILABLE, status_code=503)
+    try:
+        return _request_with_retry(endpoint, store)
+    finally:
+        circuit.release()
+
+
+def _ensure_off_loop():
+    """이벤트 루프 스레드에서 직접 호출 방지 (블로킹 sleep이 봇 전체를 멈춤)"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    raise RuntimeError("로스트아크 API는 블로킹 호출 - asyncio.to_thread로 실행하세요")
+
+
+def _request_with_retry(endpoint: str, store: bool) -> APIResult:
+    status = 0
+    for attempt in range(LOSTARK_API_MAX_RETRIES + 1):
+        status, data, retry_after = _fetch(endpoint)
+
+        if status == 200:
+            circuit.record_success()
+            if data is None:
+                return APIResult(APIStatus.NOT_FOUND, status_code=200)
+            if store and data:
+                _store(endpoint, data)
+            return APIResult(APIStatus.OK, data, status_code=200)
+
+        if status == 503:
+            circuit.record_failure(maintenance=True)
+            return APIResult(APIStatus.UNAVAILABLE, status_code=503)
+
+        if status not in _TRANSIENT_STATUSES:
+            circuit.record_success()  # API 자체는 응답 중
+            if status == 404:
+                return APIResult(APIStatus.NOT_FOUND, status_code=404)
+            return APIResult(APIStatus.ERROR, status_code=status)
+
+        if attempt < LOSTARK_API_MAX_RETRIES:
+            metrics.record_retry()
+            time.sleep(_backoff(attempt, retry_after))
+
+    if status == 429:
+        return APIResult(APIStatus.RATE_LIMITED, status_code=429)
+
+    circuit.record_failure()
+    return APIResult(APIStatus.UNAVAILABLE, status_code=status)
+
+
+def _refresh_in_background(endpoint: str):
+    """스테일 캐시 반환 후 백그라운드에서 재조회 (엔드포인트당 1개만)"""
+    with _refresh_lock:
+        if endpoint in _refreshing:
+            return
+        _refreshing.add(endpoint)
+
+    def _run():
+        try:
+            _request_network(endpoint, store=True)
+        finally:
+            with _refresh_lock:
+                _refreshing.discard(endpoint)
+
+    threading.Thread(target=_run, name="loa-api-refresh", daemon=True).start()
+
+
+def request_api(endpoint: Optional[str], use_cache: bool = True) -> APIResult:
+    """
+    API 요청 (결과 타입 포함)
+    
+    캐시 흐름:
+        0. 잘못된 캐릭터명(endpoint=None) → 요청 없이 NOT_FOUND
+        1. 메모리 캐시 → 바로 반환
+        2. 디스크 캐시 신선(5분 이내) → 메모리에 올리고 반환
+        3. 디스크 캐시 스테일(+30분 이내) → 즉시 반환 + 백그라운드 갱신
+        4. 네거티브 캐시 (없는 캐릭터 10분 / 빈 응답 2분) → 요청 없이 반환
+        5. API 호출 (재시도/서킷 브레이커)
+        6. 실패(점검/한도/장애) 시 디스크 캐시(72시간 이내)를 data에 담아 반환
+    
+    Args:
+        endpoint: API 엔드포인트 (예: /armories/characters/빛쟁인거니/profiles)
+        use_cache: 캐시 사용 여부
+    
+    Returns:
+        APIResult
+    """
+    if not endpoint:
+        return APIResult(APIStatus.NOT_FOUND)
+
+    # 캐시 확인
+    if use_cache:
+        cached_data = cache.get(endpoint)
+        if cached_data:
+            metrics.record_cache("memory")
+            return APIResult(APIStatus.OK, cached_data, status_code=200)
+
+        entry = disk_cache.get(endpoint, max_age=STALE_SECONDS)
+        if entry:
+            data, age = entry
+            if age < FRESH_SECONDS:
+                metrics.record_cache("disk")
+                cache.set(endpoint, data, ttl_seconds=FRESH_SECONDS - age)
+                return APIResult(APIStatus.OK, data, status_code=200)
+            metrics.record_cache("stale")
+            _refresh_in_background(endpoint)
+            return APIResult(APIStatus.OK, data, stale=True, status_code=200)
+
+        negative = negative_cache.get(endpoint)
+        if negative:
+            metrics.record_cache("negative")
+            kind, data = negative
+            if kind == "empty":
+                return APIResult(APIStatus.OK, data, status_code=200)
+            return APIResult(APIStatus.NOT_FOUND, status_code=200)
+    
+        metrics.record_cache("miss")
+    
+    # API 호출
+    result = _request_network(endpoint, store=use_cache)
+
+    if result.status == APIStatus.NOT_FOUND:
+        negative_cache.set(endpoint, ("not_found", None), ttl_seconds=NOT_FOUND_SECONDS)
+    elif result.ok and not result.data:
+        negative_cache.set(endpoint, ("empty", result.data), ttl_seconds=EMPTY_SECONDS)
+    elif result.status in (APIStatus.UNAVAILABLE, APIStatus.RATE_LIMITED):
+        # 점검/장애 → 오래된 캐시라도 반환 (UI는 캐시 데이터로 표시)
+        entry = disk_cache.get(endpoint, max_age=MAINTENANCE_SECONDS)
+        if entry:
+            data, age = entry
+            print(f"💾 API 불가 - 캐시 사용 ({int(age // 60)}분 전 데이터): {endpoint}")
+            result.data  = data
+            result.stale = True
+
+    return result
+
+
+def _make_request(endpoint: Optional[str], use_cache: bool = True) -> Optional[dict]:
+    """
+    API 요청 (내부 함수) - 데이터만 반환하는 기존 인터페이스
+    
+    Args:
+        endpoint: API 엔드포인트 (예: /armories/characters/빛쟁인거니/profiles)
+        use_cache: 캐시 사용 여부
+    
+    Returns:
+        API 응답 데이터 또는 None
+    """
+    return request_api(endpoint, use_cache).data
+
+
 # ==================== 캐릭터 정보 ====================
 
 def get_character_info(character_name: str, use_cache: bool = True) -> Optional[dict]:
@@ -158,7 +566,7 @@ def get_character_info(character_name: str, use_cache: bool = True) -> Optional[
         >>> print(info['CharacterClassName'])
         홀리나이트
     """
-    endpoint = f"/armories/characters/{character_name}/profiles"
+    endpoint = _character_endpoint("/armories/characters/{name}/profiles", character_name)
     return _make_request(endpoint, use_cache)
 
 
@@ -188,10 +596,31 @@ def get_siblings(character_name: str, use_cache: bool = True) -> Optional[List[d
         >>> for char in siblings:
         ...     print(f"{char['CharacterName']} - {char['CharacterClassName']}")
     """
-    endpoint = f"/characters/{character_name}/siblings"
+    endpoint = _character_endpoint("/characters/{name}/siblings", character_name)
     return _make_request(endpoint, use_cache)
 
 
+def get_character_result(character_name: str, use_cache: bool = True) -> APIResult:
+    """
+    캐릭터 프로필 조회 (결과 타입 포함)
+    없는 캐릭터 / 한도 초과 / API 불가를 구분해야 할 때 사용
+
+    Example:
+        >>> result = get_character_result("빛쟁인거니")
+        >>> if result.status == APIStatus.NOT_FOUND:
+        ...     print("캐릭터 없음")
+    """
+    return request_api(_character_endpoint("/armories/characters/{name}/profiles", character_name), use_cache)
+
+
+def get_siblings_result(character_name: str, use_cache: bool = True) -> APIResult:
+    """원정대 캐릭터 목록 조회 (결과 타입 포함). 빈 원정대는 NOT_FOUND"""
+    result = request_api(_character_endpoint("/characters/{name}/siblings", character_name), use_cache)
+    if result.ok and not result.data:
+        result.status = APIStatus.NOT_FOUND
+    return result
+
+
 def get_character_equipment(character_name: str, use_cache: bool = True) -> Optional[dict]:
     """
     캐릭터 장비 정보 조회
@@ -203,7 +632,7 @@ def get_character_equipment(character_name: str, use_cache: bool = True) -> Opti
     Returns:
         장비 정보 딕셔너리 또는 None
     """
-    endpoint = f"/armories/characters/{character_name}/equipment"
+    endpoint = _character_endpoint("/armories/characters/{name}/equipment", character_name)
     return _make_request(endpoint, use_cache)
 
 
@@ -218,12 +647,117 @@ def get_character_engravings(character_name: str, use_cache: bool = True) -> Opt
     Returns:
         각인 정보 딕셔너리 또는 None
     """
-    endpoint = f"/armories/characters/{character_name}/engravings"
+    endpoint = _character_endpoint("/armories/characters/{name}/engravings", character_name)
     return _make_request(endpoint, use_cache)
 
 
+# ==================== 통합 아머리 조회 ====================
+
+# filters 파라미터 값 → 통합 응답 키
+ARMORY_SECTIONS = {
+    'profiles':      'ArmoryProfile',
+    'equipment':     'ArmoryEquipment',
+    'avatars':       'ArmoryAvatars',
+    'combat-skills': 'ArmorySkills',
+    'engravings':    'ArmoryEngraving',
+    'cards':         'ArmoryCard',
+    'gems':          'ArmoryGem',
+    'colosseums':    'ColosseumInfo',
+    'collectibles':  'Collectibles',
+    'arkpassive':    'ArkPassive',
+}
+
+
+def _cached_fresh(endpoint: str):
+    """메모리/디스크 캐시 중 신선한 데이터만 반환 (백그라운드 갱신 없음)"""
+    data = cache.get(endpoint)
+    if data:
+        metrics.record_cache("memory")
+        return data
+    entry = disk_cache.get(endpoint, max_age=FRESH_SECONDS)
+    if entry:
+        data, age = entry
+        metrics.record_cache("disk")
+        cache.set(endpoint, data, ttl_seconds=FRESH_SECONDS - age)
+        return data
+    metrics.record_cache("miss")
+    return None
+
+
+def get_character_armory(character_name: str, parts: Optional[List[str]] = None,
+                         use_cache: bool = True) -> Dict[str, Optional[dict]]:
+    """
+    캐릭터 아머리 통합 조회 (/armories/characters/{name}?filters=...)
+    여러 섹션을 요청 1회(= rate limit 1회)로 가져오고,
+    응답을 섹션별 캐시(/profiles, /equipment, ...)에 나눠 저장
+    → 이후 get_character_info 등은 캐시에서 바로 반환
+    
+    Args:
+        character_name: 캐릭터명
+        parts: 조회할 섹션 (ARMORY_SECTIONS 키). 기본: profiles, equipment, engravings
+        use_cache: 캐시 사용 여부 (캐시에 있는 섹션은 요청에서 제외)
+    
+    Returns:
+        { 섹션: 데이터 또는 None }
+    
+    Example:
+        >>> armory = get_character_armory("빛쟁인거니", parts=["profiles", "engravings"])
+        >>> print(armory["profiles"]["ItemAvgLevel"])
+    """
+    parts = parts or ['profiles', 'equipment', 'engravings']
+    unknown = [p for p in parts if p not in ARMORY_SECTIONS]
+    if unknown:
+        raise ValueError(f"알 수 없는 아머리 섹션: {unknown}")
+    
+    base = _character_endpoint("/armories/characters/{name}", character_name)
+    if not base or (use_cache and negative_cache.get(base)):
+        return {part: None for part in parts}
+    
+    result  = {}
+    missing = []
+    for part in parts:
+        data = _cached_fresh(f"{base}/{part}") if use_cache else None
+        if data:
+            result[part] = data
+        else:
+            missing.append(part)
+    
+    if not missing:
+        return result
+    
+    combined = _request_network(f"{base}?filters={'+'.join(missing)}", store=False)
+    if combined.status == APIStatus.NOT_FOUND:
+        negative_cache.set(base, ("not_found", None), ttl_seconds=NOT_FOUND_SECONDS)
+    for part in missing:
+        endpoint = f"{base}/{part}"
+        section  = combined.data.get(ARMORY_SECTIONS[part]) if combined.ok else None
+        if section:
+            if use_cache:
+                _store(endpoint, section)
+            result[part] = section
+            continue
+        # 실패 시 섹션별 오래된 캐시로 대체
+        entry = disk_cache.get(endpoint, max_age=MAINTENANCE_SECONDS) if not combined.ok else None
+        result[part] = entry[0] if entry else None
+    
+    return result
+
+
 # ==================== 유틸리티 함수 ====================
 
+def parse_item_level(value) -> float:
+    """
+    아이템 레벨 문자열 → float
+    "1,763.33" → 1763.33 / 파싱 불가 → 0.0
+    """
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(str(value).replace(',', '')) if value else 0.0
+    except ValueError:
+        return 0.0
+
+
 def get_character_item_level(character_name: str) -> Optional[float]:
     """
     캐릭터 아이템 레벨만 빠르게 조회
@@ -241,12 +775,8 @@ def get_character_item_level(character_name: str) -> Optional[float]:
     """
     info = get_character_info(character_name)
     if info and 'ItemAvgLevel' in info:
-        try:
-            # "1,763.33" → 1763.33
-            level_str = info['ItemAvgLevel'].replace(',', '')
-            return float(level_str)
-        except (ValueError, AttributeError):
-            return None
+        level = parse_item_level(info['ItemAvgLevel'])
+        return level if level else None
     return None
 
 
@@ -270,23 +800,16 @@ def get_account_characters(character_name: str, min_level: float = 0) -> List[di
     if not siblings:
         return []
     
-    filtered = []
-    for char in siblings:
-        try:
-            level_str = char.get('ItemAvgLevel', '0').replace(',', '')
-            level = float(level_str) if level_str else 0
-            
-            if level >= min_level:
-                filtered.append(char)
-        except (ValueError, AttributeError):
-            continue
-    
-    return filtered
+    return [
+        char for char in siblings
+        if parse_item_level(char.get('ItemAvgLevel', '0')) >= min_level
+    ]
 
 
-def clear_cache():
-    """캐시 전체 삭제"""
-    cache.clear()
+def clear_cache() -> int:
+    """캐시 전체 삭제 (메모리 + 디스크 + 네거티브). 삭제 개수 반환"""
+    negative_cache.clear()
+    return max(cache.clear(), disk_cache.clear())
 
 
 def get_api_stats() -> dict:
@@ -297,13 +820,23 @@ def get_api_stats() -> dict:
         {
             'total_keys': int,
             'current_key_index': int,
-            'cache_size': int
+            'cache_size': int,
+            'disk_cache_size': int,
+            'negative_cache_size': int,
+            'circuit_state': str,  # closed / open / half_open
+            'key_budget': [int],   # 키별 이번 1분 남은 요청 수 (봇 자체 예산 기준)
+            'metrics': dict        # api_metrics.APIMetrics.snapshot()
         }
     """
     return {
         'total_keys': key_manager.get_total_keys(),
         'current_key_index': key_manager.current_index,
-        'cache_size': len(cache.cache)
+        'cache_size': len(cache.cache),
+        'disk_cache_size': disk_cache.size(),
+        'negative_cache_size': len(negative_cache.cache),
+        'circuit_state': circuit.state,
+        'key_budget': [key_manager.remaining(k) for k in key_manager.keys],
+        'metrics': metrics.snapshot()
     }
 
 
@@ -71,6 +71,10 @@ def is_linked(guild_id: int, user_id: int) -> bool:
     """멤버 연결 여부"""
     return get_sheet_name(guild_id, user_id) is not None
 
+def get_linked_members(guild_id: int) -> dict[str, str]:
+    """연결된 전체 멤버 {discord_user_id: 시트탭이름}"""
+    return dict(_guild_data(guild_id).get("members", {}))
+
 
 # ==================== 불참 관리 ====================
 
@@ -0,0 +1,220 @@
+"""
+로일(LoIl) - 파티 최적화 프로세스 풀
+optimize_parties / reoptimize_parties를 이벤트 루프 밖(ProcessPoolExecutor)에서 실행
+
+- 문제는 작은 튜플로 직렬화 (길드원 = (이름, 캐릭터, 표준 직업, 서폿 여부)), 결과는 인덱스 분할
+  → 호출 측 원본 길드원 dict로 되돌림 (추가 키 보존)
+- 길드별 동시 작업 수 제한 (OPTIMIZER_GUILD_CONCURRENCY) → 수요일 몰림에도 길드 간 공정
+- 작업별 기한 (OPTIMIZER_DEADLINE): 넘기면 작업 취소 후 인라인 계산으로 대체
+- owner(스레드 id 등)별 취소: 뷰를 닫으면 진행 중인 작업을 버림 (결과 None)
+  owner의 작업이 모두 끝나면 취소 표시도 지움 (owner id 재사용 / 표시 누적 방지)
+- 풀 생성/실행 실패 시 인라인 계산 (스레드로 → 이벤트 루프를 막지 않음, 봇 기능은 풀 없이도 동작)
+"""
+
+import asyncio
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+from bot.config.settings import OPTIMIZER_WORKERS, OPTIMIZER_DEADLINE, OPTIMIZER_GUILD_CONCURRENCY
+from bot.utils.party_optimizer import optimize_parties, reoptimize_parties
+
+
+# ==================== 직렬화 ====================
+
+def _pack_members(members: list) -> tuple:
+    return tuple((m['name'], m.get('character') or '', m.get('std_job'), bool(m.get('is_support')))
+                 for m in members)
+
+
+def _unpack_members(packed: tuple) -> list[dict]:
+    return [{'name': n, 'character': c, 'std_job': j, 'is_support': s} for n, c, j, s in packed]
+
+
+def _pack_parties(members: list, parties) -> tuple:
+    """멤버 dict/이름 분할 → 인덱스 분할"""
+    index = {m['name']: i for i, m in enumerate(members)}
+    return tuple(
+        tuple(index[n] for n in (p if isinstance(p, str) else p['name'] for p in party) if n in index)
+        for party in parties
+    )
+
+
+def _indices_of(members: list, parties: list) -> list[list[int]]:
+    index = {m['name']: i for i, m in enumerate(members)}
+    return [[index[m['name']] for m in party] for party in parties]
+
+
+def _solve(kind: str, packed: tuple, args: dict) -> dict:
+    """워커 진입점 (모듈 최상위 → 피클 가능)"""
+    members = _unpack_members(packed)
+    if kind == "optimize":
+        result = optimize_parties(members, **args)
+        result['alternatives'] = [{'parties': _indices_of(members, alt['parties']), 'score': alt['score']}
+                                  for alt in result['alternatives']]
+    else:
+        parties = [[members[i] for i in party] for party in args.pop('parties')]
+        exclude = [[[members[i] for i in party] for party in parts] for parts in args.pop('exclude', ())]
+        result  = reoptimize_parties(members, parties, exclude=exclude, **args)
+    result['parties'] = _indices_of(members, result['parties'])
+    return result
+
+
+def _restore(members: list, result: dict) -> dict:
+    """인덱스 결과 → 원본 길드원 dict"""
+    result['parties'] = [[members[i] for i in party] for party in result['parties']]
+    for alt in result.get('alternatives', []):
+        alt['parties'] = [[members[i] for i in party] for party in alt['parties']]
+    return result
+
+
+def _warmup() -> int:
+    return 0
+
+
+# ==================== 풀 ====================
+
+class OptimizerPool:
+    """
+    길드별 대기열 + 기한 + 취소가 있는 최적화 프로세스 풀
+
+    Example:
+        >>> result = await optimizer_pool.optimize(guild_id, members, 4, owner=thread.id)
+        >>> optimizer_pool.cancel(thread.id)   # 뷰를 닫을 때
+    """
+
+    def __init__(self, workers: int = OPTIMIZER_WORKERS, deadline: float = OPTIMIZER_DEADLINE,
+                 guild_concurrency: int = OPTIMIZER_GUILD_CONCURRENCY):
+        self.workers           = max(workers, 1)
+        self.deadline          = deadline
+        self.guild_concurrency = guild_concurrency
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._guild_slots: dict[int, asyncio.Semaphore] = {}
+        self._owned: dict[int, set[Future]] = {}
+        self._active: dict[int, int] = {}      # owner → 진행 중인 작업 수
+        self._cancelled: set[int] = set()
+        self.stats = {'pool': 0, 'inline': 0, 'timeout': 0, 'cancelled': 0}
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        if self._executor is None:
+            try:
+                # spawn: 디스코드 클라이언트 스레드가 있는 프로세스를 fork하지 않음
+                self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+            except (OSError, ValueError, NotImplementedError) as e:
+                print(f"[optimizer_pool] 프로세스 풀 생성 실패, 인라인 계산: {e}")
+                return None
+        return self._executor
+
+    def _slot(self, guild_id: int) -> asyncio.Semaphore:
+        slot = self._guild_slots.get(guild_id)
+        if slot is None:
+            slot = self._guild_slots[guild_id] = asyncio.Semaphore(self.guild_concurrency)
+        return slot
+
+    async def start(self):
+        """워커 미리 띄우기 (첫 요청의 spawn 지연 제거)"""
+        executor = self._get_executor()
+        if executor:
+            loop = asyncio.get_running_loop()
+            await asyncio.gather(*(loop.run_in_executor(executor, _warmup) for _ in range(self.workers)),
+                                 return_exceptions=True)
+
+    async def _run(self, guild_id: int, kind: str, members: list, args: dict,
+                   owner: Optional[int]) -> Optional[dict]:
+        if owner is None:
+            return await self._execute(guild_id, kind, members, args, owner)
+        self._active[owner] = self._active.get(owner, 0) + 1
+        try:
+            return await self._execute(guild_id, kind, members, args, owner)
+        finally:
+            self._active[owner] -= 1
+            if not self._active[owner]:
+                del self._active[owner]
+                self._cancelled.discard(owner)
+
+    async def _execute(self, guild_id: int, kind: str, members: list, args: dict,
+                     owner: Optional[int]) -> Optional[dict]:
+        async with self._slot(guild_id):
+            if owner is not None and owner in self._cancelled:
+                self.stats['cancelled'] += 1
+                return None
+            executor = self._get_executor()
+            if executor is not None:
+                future = None
+                try:
+                    future = executor.submit(_solve, kind, _pack_members(members), dict(args))
+                    if owner is not None:
+                        self._owned.setdefault(owner, set()).add(future)
+                    result = await asyncio.wait_for(asyncio.wrap_future(future), self.deadline)
+                    if owner is not None and owner in self._cancelled:
+                        self.stats['cancelled'] += 1
+                        return None
+                    self.stats['pool'] += 1
+                    return _restore(members, result)
+                except asyncio.TimeoutError:
+                    self.stats['timeout'] += 1
+                    print(f"[optimizer_pool] 기한 초과({self.deadline}초), 인라인 계산")
+                except asyncio.CancelledError:
+                    # cancel()로 대기 중 작업이 취소된 경우만 None, 호출 태스크 자체 취소는 전파
+                    if future is not None and future.cancelled() and owner in self._cancelled:
+                        self.stats['cancelled'] += 1
+                        return None
+                    raise
+                except BrokenProcessPool as e:
+                    print(f"[optimizer_pool] 워커 비정상 종료, 풀 재생성: {e}")
+                    self.shutdown()
+                except Exception as e:
+                    print(f"[optimizer_pool] 최적화 실패, 인라인 계산: {e}")
+                finally:
+                    if future is not None:
+                        future.cancel()
+                        if owner is not None:
+                            self._owned.get(owner, set()).discard(future)
+
+        if owner is not None and owner in self._cancelled:
+            return None
+        self.stats['inline'] += 1
+        result = await asyncio.to_thread(_solve, kind, _pack_members(members), dict(args))
+        if owner is not None and owner in self._cancelled:
+            self.stats['cancelled'] += 1
+            return None
+        return _restore(members, result)
+
+    # ==================== 작업 ====================
+
+    async def optimize(self, guild_id: int, members: list, party_size: int = 4,
+                       owner: Optional[int] = None, **options) -> Optional[dict]:
+        """optimize_parties 결과 (owner가 취소됐으면 None)"""
+        if not members:
+            return optimize_parties(members, party_size)
+        return await self._run(guild_id, "optimize", members, {'party_size': party_size, **options}, owner)
+
+    async def reoptimize(self, guild_id: int, members: list, parties: list, party_size: int = 4,
+                         owner: Optional[int] = None, exclude=(), **options) -> Optional[dict]:
+        """reoptimize_parties 결과 (owner가 취소됐으면 None)"""
+        args = {
+            'parties':    [list(p) for p in _pack_parties(members, parties)],
+            'exclude':    [[list(p) for p in _pack_parties(members, e)] for e in exclude],
+            'party_size': party_size,
+            **options,
+        }
+        for key in ('locked', 'swap_out'):
+            if key in args:
+                args[key] = list(args[key])
+        return await self._run(guild_id, "reoptimize", members, args, owner)
+
+    def cancel(self, owner: int):
+        """owner의 진행 중 작업 취소 (대기 중이면 건너뜀, 실행 중이면 결과만 버림)"""
+        if owner in self._active:
+            self._cancelled.add(owner)
+        for future in self._owned.pop(owner, set()):
+            future.cancel()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+optimizer_pool = OptimizerPool()
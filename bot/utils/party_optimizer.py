@@ -0,0 +1,330 @@
+"""
+로일(LoIl) - 시너지 기반 파티 최적화 (로컬, AI 호출 없음)
+synergy_benefits.json / dps_types.json 지식 베이스로 파티 분할에 점수를 매기고
+교환(swap) 언덕 오르기 + 재시작으로 최적 분할과 상위 대안을 찾음
+
+점수 (파티별 합, 높을수록 좋음 / 계산은 synergy_kernel.PartyKernel):
+- 시너지 커버리지: 파티원 시너지 비트마스크 OR의 가중치 합
+  (8인 필수 시너지 3 / 권장 2 / 그 외 1)
+- 중복 시너지: 같은 시너지 중복 제공 1건마다 감점 (비트 수 합 - OR 비트 수)
+- 사멸 페어링: 헤드/백 사멸 딜러와 선호 제공자(워로드/블레이드)가 같은 파티면 가점
+  (각인을 모르면 절반)
+- 서폿 분배: 파티당 서폿 1명에서 벗어난 만큼 큰 감점
+
+결정성: 재시작용 난수는 입력 이름으로 시드 → 같은 입력이면 같은 결과
+시간 예산(PARTY_OPTIMIZER_BUDGET_MS)은 안전장치, 보통 인원에선 재시작 횟수가 먼저 끝남
+"""
+
+import math
+import random
+import time
+import zlib
+from typing import Optional
+
+from bot.config.settings import (
+    PARTY_OPTIMIZER_BUDGET_MS,
+    PARTY_OPTIMIZER_RESTARTS,
+    PARTY_OPTIMIZER_TOP_K,
+)
+from bot.utils.synergy_kernel import PartyKernel, bits_of
+
+
+# ==================== 탐색 ====================
+
+class _Search:
+    """
+    교환 언덕 오르기 + 재시작
+    파티는 멤버 인덱스 비트셋(int)으로 표현 → 교환은 비트 연산, 파티 점수는 커널이 키별로 메모
+    찾은 분할은 정렬된 키 튜플(순서 무관)로 점수와 함께 기록
+    """
+
+    def __init__(self, kernel: PartyKernel, sizes: list[int], deadline: float):
+        self.kernel   = kernel
+        self.feats    = kernel.feats
+        self.score    = kernel.score
+        self.sizes    = sizes
+        self.deadline = deadline
+        self.seen: dict[tuple, float] = {}
+
+    def record(self, keys: list[int]) -> float:
+        total = sum(self.score(k) for k in keys)
+        self.seen.setdefault(tuple(sorted(keys)), total)
+        return total
+
+    def greedy(self) -> list[int]:
+        """서폿 → 사멸 딜러 → 나머지 순으로, 점수가 가장 오르는 빈 파티에 배치"""
+        order = sorted(range(len(self.feats)),
+                       key=lambda i: (not self.feats[i].support, self.feats[i].smite is None, i))
+        keys   = [0] * len(self.sizes)
+        counts = [0] * len(self.sizes)
+        for i in order:
+            best, best_gain = None, -math.inf
+            for p, key in enumerate(keys):
+                if counts[p] >= self.sizes[p]:
+                    continue
+                gain = self.score(key | 1 << i) - self.score(key)
+                if gain > best_gain:
+                    best, best_gain = p, gain
+            keys[best] |= 1 << i
+            counts[best] += 1
+        return keys
+
+    def moves(self, keys: list[int], frozen: frozenset = frozenset(), banned: Optional[dict] = None):
+        """
+        교환 1회 이웃 (a, b, 새 a 키, 새 b 키)
+
+        Args:
+            frozen: 건드리지 않을 파티 위치
+            banned: { 멤버 인덱스: 들어가면 안 되는 파티 위치 }
+        """
+        banned = banned or {}
+        for a in range(len(keys)):
+            if a in frozen:
+                continue
+            for b in range(a + 1, len(keys)):
+                if b in frozen:
+                    continue
+                for x in bits_of(keys[a]):
+                    if banned.get(x) == b:
+                        continue
+                    for y in bits_of(keys[b]):
+                        if banned.get(y) == a:
+                            continue
+                        swap = 1 << x | 1 << y
+                        yield a, b, keys[a] ^ swap, keys[b] ^ swap
+
+    def climb(self, keys: list[int], frozen: frozenset = frozenset(),
+              banned: Optional[dict] = None) -> tuple[list[int], float]:
+        """가장 좋은 교환을 반복 적용 (개선 없거나 시간 초과 시 종료)"""
+        keys = list(keys)
+        while time.perf_counter() < self.deadline:
+            moves = list(self.moves(keys, frozen, banned))
+            left  = self.kernel.score_many(m[2] for m in moves)
+            right = self.kernel.score_many(m[3] for m in moves)
+            base  = self.kernel.score_many(keys)
+            best, best_gain = None, 1e-9
+            for move, sa, sb in zip(moves, left, right):
+                gain = sa + sb - base[move[0]] - base[move[1]]
+                if gain > best_gain:
+                    best, best_gain = move, gain
+            if best is None:
+                break
+            a, b, keys[a], keys[b] = best
+            self.record(keys)
+        return keys, self.record(keys)
+
+    def neighbours(self, keys: list[int]):
+        """교환 1회 이웃 전부 기록 (대안 후보)"""
+        for a, b, ka, kb in self.moves(keys):
+            moved = list(keys)
+            moved[a], moved[b] = ka, kb
+            self.record(moved)
+
+
+def _party_sizes(count: int, party_size: int) -> list[int]:
+    """인원을 파티 수에 고르게 분배 (6명/4인 → [3, 3])"""
+    parties = math.ceil(count / party_size)
+    return [count // parties + (1 if i < count % parties else 0) for i in range(parties)]
+
+
+def _to_members(members: list, keys) -> list[list[dict]]:
+    """파티 키 → 멤버 dict (파티 내 딜러 먼저, 서폿 마지막 / 파티는 첫 멤버 순)"""
+    parties = sorted((bits_of(k) for k in keys), key=lambda p: p[0])
+    return [[members[i] for i in sorted(p, key=lambda i: (bool(members[i].get("is_support")), i))]
+            for p in parties]
+
+
+def optimize_parties(members: list, party_size: int = 4, top_k: int = PARTY_OPTIMIZER_TOP_K,
+                     time_budget_ms: float = PARTY_OPTIMIZER_BUDGET_MS) -> dict:
+    """
+    시너지 점수 기반 파티 분할
+
+    Args:
+        members: [{ name, character, std_job, is_support, ... }]
+        party_size: 파티당 최대 인원
+        top_k: 최적안 외 대안 개수
+        time_budget_ms: 탐색 시간 상한
+
+    Returns:
+        {
+            'parties': [[member_dict, ...], ...],
+            'score': float,
+            'alternatives': [{ 'parties': [...], 'score': float }, ...],  (점수 내림차순)
+            'notes': [str]   (파티별 시너지 요약)
+        }
+
+    Example:
+        >>> result = optimize_parties(members, 4)
+        >>> render_party_result("카멘", result["parties"])
+    """
+    if not members:
+        return {"parties": [], "score": 0.0, "alternatives": [], "notes": []}
+
+    search = _Search(PartyKernel(members), _party_sizes(len(members), max(party_size, 1)),
+                     time.perf_counter() + time_budget_ms / 1000)
+
+    best, best_score = search.climb(search.greedy())
+    rng     = random.Random(zlib.crc32("\x00".join(sorted(m["name"] for m in members)).encode("utf-8")))
+    indices = list(range(len(members)))
+    for _ in range(PARTY_OPTIMIZER_RESTARTS):
+        if time.perf_counter() >= search.deadline:
+            break
+        rng.shuffle(indices)
+        keys, start = [], 0
+        for size in search.sizes:
+            keys.append(sum(1 << i for i in indices[start:start + size]))
+            start += size
+        keys, score = search.climb(keys)
+        if score > best_score + 1e-9:
+            best, best_score = keys, score
+    if len(search.seen) <= top_k:
+        search.neighbours(best)
+
+    canonical = tuple(sorted(best))
+    ranked = sorted((item for item in search.seen.items() if item[0] != canonical),
+                    key=lambda kv: (-kv[1], kv[0]))
+    return {
+        "parties":      _to_members(members, best),
+        "score":        round(best_score, 2),
+        "alternatives": [{"parties": _to_members(members, k), "score": round(s, 2)} for k, s in ranked[:top_k]],
+        "notes":        explain_parties(members, [bits_of(k) for k in sorted(best, key=lambda k: k & -k)]),
+    }
+
+
+def _partition_key(index: dict, parties) -> frozenset:
+    """멤버 dict/이름 분할 → 순서 무관 비교용 키"""
+    return frozenset(
+        frozenset(index[p if isinstance(p, str) else p["name"]] for p in party
+                  if (p if isinstance(p, str) else p["name"]) in index)
+        for party in parties
+    ) - {frozenset()}
+
+
+def reoptimize_parties(members: list, parties: list, party_size: int = 4, locked=(), swap_out=(),
+                       exclude=(), diversity: bool = False,
+                       time_budget_ms: float = PARTY_OPTIMIZER_BUDGET_MS) -> dict:
+    """
+    현재 편성을 출발점으로 국소 개선 (재편성 버튼 / 길드원 변경)
+
+    - 로스터 변경: members에 없는 파티원은 빠지고, 새 길드원은 잠기지 않은 파티 중 점수가 가장 오르는 자리에
+    - locked 파티는 그대로 둠
+    - swap_out 길드원은 지금 파티에서 반드시 나감 (손해가 가장 적은 교환 후 그 파티로 복귀 금지)
+    - exclude 분할(이전에 보여준 안 등)은 결과로 내지 않음
+    - swap_out/exclude/diversity가 없으면 결과 점수는 입력 이상 (개선이 없으면 입력 그대로)
+      diversity=True면 입력 자체도 제외 → 개선이 없을 때 가장 덜 나빠지는 다른 안
+
+    Args:
+        parties: 현재 편성 [[member_dict, ...], ...]
+        locked: 고정할 파티 위치 (0부터)
+        swap_out: 파티를 옮길 길드원 이름
+        exclude: 제외할 분할 목록 (멤버 dict 또는 이름 분할)
+
+    Returns:
+        {
+            'parties': [[member_dict, ...], ...],   (파티 위치 유지 → 고정 파티는 같은 번호)
+            'score': float,
+            'previous_score': float,   (로스터 변경 반영 후 입력 편성 점수)
+            'changed': bool,
+            'notes': [str]
+        }
+
+    Example:
+        >>> result = reoptimize_parties(members, current, locked={0}, swap_out={"길드원A"})
+    """
+    index  = {m["name"]: i for i, m in enumerate(members)}
+    kernel = PartyKernel(members)
+    keys   = [sum(1 << index[m["name"]] for m in party if m["name"] in index) for party in parties]
+    frozen = frozenset(p for p in locked if 0 <= p < len(keys))
+
+    placed = 0
+    for key in keys:
+        placed |= key
+    for i in range(len(members)):
+        if placed >> i & 1:
+            continue
+        open_parties = [p for p, key in enumerate(keys) if p not in frozen and bin(key).count("1") < party_size]
+        if not open_parties:
+            keys.append(0)
+            open_parties = [len(keys) - 1]
+        best = max(open_parties, key=lambda p: (kernel.score(keys[p] | 1 << i) - kernel.score(keys[p]), -p))
+        keys[best] |= 1 << i
+
+    search   = _Search(kernel, [bin(k).count("1") for k in keys], time.perf_counter() + time_budget_ms / 1000)
+    start    = list(keys)
+    baseline = search.record(start)
+
+    # 지정 길드원 강제 이동
+    banned = {}
+    for name in swap_out:
+        x = index.get(name)
+        origin = next((p for p, key in enumerate(keys) if x is not None and key >> x & 1), None)
+        if origin is None or origin in frozen:
+            continue
+        moves = [(kernel.score(keys[origin] ^ (1 << x | 1 << y)) + kernel.score(keys[p] ^ (1 << x | 1 << y)), p, y)
+                 for p, key in enumerate(keys) if p != origin and p not in frozen
+                 for y in bits_of(key) if banned.get(y) != origin]
+        if not moves:
+            continue
+        _, p, y = max(moves, key=lambda m: (m[0], -m[1], -m[2]))
+        swap = 1 << x | 1 << y
+        keys[origin] ^= swap
+        keys[p] ^= swap
+        banned[x] = origin
+
+    keys, score = search.climb(keys, frozen, banned)
+
+    excluded = {_partition_key(index, e) for e in exclude}
+    if diversity:
+        excluded.add(frozenset(frozenset(bits_of(k)) for k in start if k))
+    if frozenset(frozenset(bits_of(k)) for k in keys if k) in excluded:
+        best, best_score = None, -math.inf
+        for a, b, ka, kb in search.moves(keys, frozen, banned):
+            moved = list(keys)
+            moved[a], moved[b] = ka, kb
+            total = sum(kernel.score_many(moved))
+            if total > best_score and frozenset(frozenset(bits_of(k)) for k in moved if k) not in excluded:
+                best, best_score = moved, total
+        if best is not None:
+            keys, score = best, best_score
+
+    if not banned and not excluded and score < baseline:
+        keys, score = start, baseline
+    keys = [k for k in keys if k]
+    return {
+        "parties":        [[members[i] for i in sorted(bits_of(k), key=lambda i: (bool(members[i].get("is_support")), i))]
+                           for k in keys],
+        "score":          round(score, 2),
+        "previous_score": round(baseline, 2),
+        "changed":        keys != [k for k in start if k],
+        "notes":          explain_parties(members, [bits_of(k) for k in keys]),
+    }
+
+
+def explain_parties(members: list, parties) -> list[str]:
+    """
+    파티별 시너지 요약
+
+    Args:
+        parties: 인덱스 분할 또는 멤버 dict 분할
+
+    Example:
+        >>> explain_parties(members, result["parties"])
+        ['1파티: 방어력 감소 · 받는 피해 증가 · 공격력 증가 | 헤드 사멸 페어 1', ...]
+    """
+    kernel = PartyKernel(members)
+    index  = {m["name"]: i for i, m in enumerate(members)}
+    notes  = []
+    for n, party in enumerate(parties, 1):
+        key   = sum(1 << (p if isinstance(p, int) else index[p["name"]]) for p in party)
+        parts = [" · ".join(kernel.model.describe(kernel.coverage(key))) or "시너지 없음"]
+        pairs = {"head": 0, "back": 0}
+        for i in kernel.smite_pairs(key):
+            pairs[kernel.feats[i].smite] += 1
+        if pairs["head"] or pairs["back"]:
+            parts.append(" ".join(f"{'헤드' if k == 'head' else '백'} 사멸 페어 {v}"
+                                  for k, v in pairs.items() if v))
+        duplicates = kernel.duplicates(key)
+        if duplicates:
+            parts.append(f"중복 {duplicates}")
+        notes.append(f"{n}파티: " + " | ".join(parts))
+    return notes
@@ -0,0 +1,274 @@
+"""
+로일(LoIl) - AI 파티 편성 JSON 스키마 / 파서
+AI 응답(JSON) → 검증 + 보정 → render_party_result / save_party_result가 바로 쓰는 형식
+
+스키마 (레이드 1개):
+{
+  "parties": [
+    { "members": [ { "name": "길드원", "character": "시트 표기", "role": "support|dps" } ] }
+  ],
+  "synergy_notes": ["시너지 설명", ...]
+}
+일괄(여러 레이드): { "raids": [ { "index": 1, "parties": [...], "synergy_notes": [...] } ] }
+
+보정:
+- 코드블록(```json) / 앞뒤 설명 제거, 끝 쉼표·스마트 따옴표 수정
+- 길드원은 입력 목록 기준으로만 인정 (모르는 이름 제외, 중복 제거)
+- 파티 인원 초과분 / 빠진 길드원은 인원이 적은 파티부터 채움
+- 서폿 분배: 입력 is_support 기준 (응답 role은 참고만, 틀리면 보정 표시)
+  파티별 서폿 수 차이가 2 이상이면 서폿 ↔ 딜러 교환 (시너지 점수가 가장 높은 교환)
+- 인식된 길드원이 절반 미만이면 실패(None) → 호출 측에서 로컬 편성
+
+미리보기(preview_*): 스트리밍 중인 미완성 JSON에서 지금까지 배치된 이름만 추출 (검증 없음)
+"""
+
+import json
+import re
+from typing import Optional
+
+from bot.utils.synergy_kernel import PartyKernel
+
+PARTY_SCHEMA_PROMPT = """{
+  "parties": [
+    { "members": [ { "name": "길드원 이름", "character": "캐릭터(시트 표기 그대로)", "role": "support 또는 dps" } ] }
+  ],
+  "synergy_notes": ["파티별 시너지 설명 (한 줄씩, 최대 4개)"]
+}"""
+
+_FENCE          = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL)
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+_SMART_QUOTES   = str.maketrans({"“": '"', "”": '"', "‘": "'", "’": "'"})
+_INDEX_KEY      = re.compile(r'"index"\s*:\s*(\d+)')
+_NAME_VALUE     = re.compile(r'"name"\s*:\s*"([^"]+)"')
+
+
+# ==================== JSON 추출 ====================
+
+def extract_json(text: str):
+    """
+    응답 텍스트 → JSON 객체 (보정 포함). 실패 시 None
+    최상위가 배열이면 {"parties": 배열}로 감쌈
+    """
+    if not text:
+        return None
+    fenced = _FENCE.search(text)
+    body   = (fenced.group(1) if fenced else text).translate(_SMART_QUOTES).strip()
+
+    starts = [i for i in (body.find("{"), body.find("[")) if i >= 0]
+    if not starts:
+        return None
+    start = min(starts)
+    end   = body.rfind("}" if body[start] == "{" else "]")
+    if end <= start:
+        return None
+    body = body[start:end + 1]
+
+    for candidate in (body, _TRAILING_COMMA.sub(r"\1", body)):
+        try:
+            data = json.loads(candidate)
+            break
+        except json.JSONDecodeError:
+            continue
+    else:
+        if '"' in body:
+            return None
+        # 작은따옴표 JSON (파이썬 dict 표기)
+        try:
+            data = json.loads(_TRAILING_COMMA.sub(r"\1", body.replace("'", '"')))
+        except json.JSONDecodeError:
+            return None
+
+    if isinstance(data, list):
+        data = {"parties": data}
+    return data if isinstance(data, dict) else None
+
+
+# ==================== 검증 / 보정 ====================
+
+def _entry_name(entry) -> str:
+    if isinstance(entry, str):
+        return entry.strip()
+    if isinstance(entry, dict):
+        return str(entry.get("name") or entry.get("character") or "").strip()
+    return ""
+
+
+def normalize_parties(raw_parties, members: list, party_size: int = 4) -> Optional[dict]:
+    """
+    AI 파티 목록 → 입력 길드원 dict로 구성된 파티 목록
+
+    Args:
+        raw_parties: 응답의 "parties" 값
+        members: 편성 대상 길드원 [{ name, character, is_support, ... }]
+        party_size: 파티당 최대 인원
+
+    Returns:
+        { parties: [[member_dict, ...], ...], repaired: bool } 또는 None (인식 절반 미만)
+    """
+    if not isinstance(raw_parties, list) or not members:
+        return None
+
+    by_name = {m["name"]: m for m in members}
+    by_char = {m.get("character"): m for m in members if m.get("character")}
+    placed: set[str] = set()
+    parties: list[list] = []
+    overflow: list[dict] = []
+    repaired = False
+
+    for raw in raw_parties:
+        entries = raw.get("members", []) if isinstance(raw, dict) else raw
+        if not isinstance(entries, list):
+            repaired = True
+            continue
+        party = []
+        for entry in entries:
+            name   = _entry_name(entry)
+            member = by_name.get(name) or by_char.get(name)
+            if member is None or member["name"] in placed:
+                repaired = True
+                continue
+            placed.add(member["name"])
+            role = entry.get("role") if isinstance(entry, dict) else None
+            if role in ("support", "dps") and (role == "support") != bool(member.get("is_support")):
+                repaired = True
+            if len(party) < party_size:
+                party.append(member)
+            else:
+                overflow.append(member)
+                repaired = True
+        if party:
+            parties.append(party)
+
+    if len(placed) * 2 < len(members):
+        return None
+
+    missing = [m for m in members if m["name"] not in placed]
+    if missing:
+        repaired = True
+    for member in overflow + missing:
+        open_parties = [p for p in parties if len(p) < party_size]
+        if open_parties:
+            min(open_parties, key=len).append(member)
+        else:
+            parties.append([member])
+
+    if _balance_supports(parties, members, party_size):
+        repaired = True
+    return {"parties": parties, "repaired": repaired}
+
+
+def _balance_supports(parties: list[list], members: list, party_size: int) -> bool:
+    """
+    파티별 서폿 수를 고르게 (차이 1 이하) - 제자리 수정
+
+    서폿이 가장 많은 파티 → 가장 적은 파티로: 빈자리가 있으면 이동, 없으면 딜러와 교환
+    (후보 중 두 파티 시너지 점수 합이 가장 높은 것)
+
+    Returns:
+        수정했는지 여부
+    """
+    if len(parties) < 2:
+        return False
+    kernel  = PartyKernel(members)
+    index   = {m["name"]: i for i, m in enumerate(members)}
+    changed = False
+
+    def key(party) -> int:
+        return sum(1 << index[m["name"]] for m in party)
+
+    def supports(party) -> int:
+        return sum(1 for m in party if m.get("is_support"))
+
+    for _ in range(len(members)):
+        rich = max(parties, key=supports)
+        poor = min(parties, key=supports)
+        if supports(rich) - supports(poor) < 2:
+            break
+        options = []
+        for sup in (m for m in rich if m.get("is_support")):
+            if len(poor) < party_size:
+                options.append((sup, None))
+            options.extend((sup, d) for d in poor if not d.get("is_support"))
+        if not options:
+            break
+
+        def gain(option) -> float:
+            sup, dealer = option
+            a = [m for m in rich if m is not sup] + ([dealer] if dealer else [])
+            b = [m for m in poor if m is not dealer] + [sup]
+            return kernel.score(key(a)) + kernel.score(key(b))
+
+        sup, dealer = max(options, key=gain)
+        rich.remove(sup)
+        poor.append(sup)
+        if dealer:
+            poor.remove(dealer)
+            rich.append(dealer)
+        changed = True
+    return changed
+
+
+def parse_party_response(data, members: list, party_size: int = 4) -> Optional[dict]:
+    """
+    단일 레이드 JSON(dict) 검증
+
+    Returns:
+        { parties, synergy_notes: [str], repaired } 또는 None
+    """
+    if not isinstance(data, dict):
+        return None
+    result = normalize_parties(data.get("parties"), members, party_size)
+    if result is None:
+        return None
+    notes = data.get("synergy_notes") or data.get("notes") or []
+    if isinstance(notes, str):
+        notes = [notes]
+    result["synergy_notes"] = [str(n).strip() for n in notes if str(n).strip()][:8]
+    return result
+
+
+def parse_batch_response(data, raids: list[dict], party_size: int = 4) -> dict[int, dict]:
+    """
+    일괄 JSON 검증 → { 레이드 순번(0부터): parse_party_response 결과 }
+    index가 없으면 배열 순서 사용. 검증 실패한 레이드는 결과에서 빠짐
+    """
+    if not isinstance(data, dict) or not isinstance(data.get("raids"), list):
+        return {}
+    results = {}
+    for pos, item in enumerate(data["raids"]):
+        if not isinstance(item, dict):
+            continue
+        try:
+            idx = int(item.get("index", pos + 1)) - 1
+        except (TypeError, ValueError):
+            idx = pos
+        if not 0 <= idx < len(raids) or idx in results:
+            continue
+        parsed = parse_party_response(item, raids[idx]["members"], raids[idx].get("party_size", party_size))
+        if parsed:
+            results[idx] = parsed
+    return results
+
+
+# ==================== 스트리밍 미리보기 ====================
+
+def preview_parties(text: str) -> list[list[str]]:
+    """
+    미완성 JSON(단일 레이드) → 지금까지 나온 파티별 이름
+
+    Example:
+        >>> preview_parties('{"parties": [{"members": [{"name": "A"}, {"name": "B"}]}, {"members": [{"na')
+        [['A', 'B'], []]
+    """
+    return [_NAME_VALUE.findall(segment) for segment in (text or "").split('"members"')[1:]]
+
+
+def preview_batch(text: str) -> dict[int, list[list[str]]]:
+    """미완성 일괄 JSON → { 레이드 순번(0부터): preview_parties 결과 }"""
+    text    = text or ""
+    matches = list(_INDEX_KEY.finditer(text))
+    preview = {}
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        preview[int(match.group(1)) - 1] = preview_parties(text[match.end():end])
+    return preview
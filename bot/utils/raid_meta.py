@@ -0,0 +1,223 @@
+"""
+로일(LoIl) - 레이드 메타데이터 해석
+시트의 자유 형식 레이드명("종막(노)", "카멘 하드 2팀", "4막 하드") → raids.json 항목
+
+- 난이도 토큰(하드/노말/나메/싱글, 괄호 약어 (하)/(노)/(나)/(싱))을 떼고
+  붙여 쓴 한 글자 난이도 + 줄임말("하기르", "노브", "하2막")도 분리
+- 별칭 색인으로 레이드를 찾음: 정확히 일치 → 막 이름 → 가장 긴 접두 별칭 → 가장 긴 포함 별칭
+  (별칭 = 레이드 키, 한글명, 영문명, 카제로스 막 이름, 자주 쓰는 약칭)
+- 결과는 길드별로 메모 → 같은 이름은 두 번째부터 dict 조회 1회
+
+반환 메타 (찾지 못하면 None):
+    key, name, category, category_name, difficulty, capacity(레이드 전체 인원),
+    party_size(파티당 인원), gates, min_level, gold, rewards(관문별 (골드, 더보기 비용)), act, difficulties
+"""
+
+import re
+from typing import Optional
+
+from bot.config.settings import RAIDS_DATA
+
+PARTY_MAX = 4   # 로스트아크 파티당 최대 인원 (8인 레이드 = 4인 파티 2개)
+
+DIFFICULTY_ALIASES = {
+    "hard": "hard", "하드": "hard", "하": "hard",
+    "normal": "normal", "노말": "normal", "노": "normal",
+    "nightmare": "nightmare", "나이트메어": "nightmare", "나메": "nightmare", "나": "nightmare",
+    "solo": "solo", "싱글": "solo", "솔로": "solo", "싱": "solo",
+}
+
+# raids.json에 없는 자주 쓰는 약칭
+SHORT_ALIASES = {
+    "쿠크":   "kakul_saydon",
+    "비아":   "vykas",
+    "일리":   "iliacan",
+    "카양":   "kayangel",
+    "상아탑": "ivory_tower",
+    "베히":   "behemoth",
+    "에키":   "echidna",
+    "카제":   "kazeros",
+    "아르모": "armoche",
+    "아브렐": "brelshaza",   # 띄어 쓴 "아브렐 슈드"(2막)는 원문 비교에서 먼저 잡힘
+    "브렐":   "brelshaza",
+}
+
+# 한 글자 난이도 뒤에 붙여 쓰는 줄임말 ("하기르" = 에기르 하드, "노브" = 아브렐슈드 노말)
+PREFIX_STEMS = {
+    "기르": "aegir",
+    "브":   "brelshaza",
+    "멘":   "kamen",
+    "탄":   "valtan",
+    "비":   "vykas",
+    "칸":   "iliacan",
+    "양":   "kayangel",
+}
+
+# 괄호 안 난이도 약어 또는 단어 난이도 (긴 것부터)
+_DIFF_WORDS = sorted((k for k in DIFFICULTY_ALIASES if len(k) > 1), key=len, reverse=True)
+_DIFF_PATTERN = re.compile(
+    r"\((" + "|".join(map(re.escape, DIFFICULTY_ALIASES)) + r")\)"
+    r"|(" + "|".join(map(re.escape, _DIFF_WORDS)) + r")",
+    re.IGNORECASE,
+)
+
+
+def _normalize(text: str) -> str:
+    return (text or "").lower().replace(" ", "")
+
+
+# ==================== 색인 ====================
+
+def _build_index() -> tuple[dict[str, dict], dict[str, dict], list[str]]:
+    """띄어쓰기 유지 이름 → 레이드 정보, 별칭 → 레이드 정보, 별칭 목록(긴 것부터)"""
+    spaced: dict[str, dict] = {}
+    exact: dict[str, dict] = {}
+    by_key: dict[str, dict] = {}
+    for cat_key, cat in RAIDS_DATA.get("raid_categories", {}).items():
+        for raid_key, raid in cat.get("raids", {}).items():
+            info = {
+                "key":           raid_key,
+                "name":          raid.get("name", raid_key),
+                "category":      cat_key,
+                "category_name": cat.get("name", cat_key),
+                "capacity":      cat.get("party_size", PARTY_MAX * 2),
+                "act":           raid.get("act"),
+                "difficulties":  raid.get("difficulties", {}),
+            }
+            by_key[raid_key] = info
+            # 띄어쓰기만 다른 이름(아브렐슈드 군단장 / 아브렐 슈드 2막)은 원문 그대로 먼저 비교
+            for alias in (raid_key, raid.get("name"), raid.get("name_en"), raid.get("act")):
+                if alias:
+                    spaced.setdefault(alias.lower(), info)
+                    exact.setdefault(_normalize(alias), info)
+    for alias, raid_key in SHORT_ALIASES.items():
+        if raid_key in by_key:
+            exact.setdefault(alias, by_key[raid_key])
+    return spaced, exact, sorted(exact, key=len, reverse=True)
+
+
+_SPACED, _EXACT, _ALIASES = _build_index()
+_ACTS = sorted((_normalize(i["act"]) for i in _EXACT.values() if i["act"]), key=len, reverse=True)
+_MEMO: dict[int, dict[str, Optional[dict]]] = {}
+
+
+def find_raid(name: str) -> Optional[dict]:
+    """레이드명(난이도 없이) → raids.json 레이드 정보"""
+    text = _normalize(name)
+    if not text:
+        return None
+    info = _SPACED.get(" ".join((name or "").lower().split())) or _EXACT.get(text)
+    if info:
+        return info
+    # 막 이름이 있으면 우선 ("아브렐슈드 2막" → 카제로스 2막)
+    alias = next((a for a in _ACTS if a in text), None) \
+        or next((a for a in _ALIASES if text.startswith(a)), None) \
+        or next((a for a in _ALIASES if a in text), None)
+    return _EXACT[alias] if alias else None
+
+
+_STEMS = sorted(PREFIX_STEMS, key=len, reverse=True)
+
+
+def _split_prefix(text: str) -> tuple[Optional[dict], Optional[str]]:
+    """ "하기르" / "노브 2팀" / "하2막" → (레이드 정보, 난이도), 아니면 (None, None)"""
+    t = _normalize(text)
+    if len(t) < 2 or t[0] not in DIFFICULTY_ALIASES or any(t.startswith(a) for a in _ALIASES):
+        return None, None
+    rest = t[1:]
+    stem = next((s for s in _STEMS if rest.startswith(s)), None)
+    info = _EXACT.get(PREFIX_STEMS[stem]) if stem else find_raid(rest)
+    return (info, DIFFICULTY_ALIASES[t[0]]) if info else (None, None)
+
+
+def _split_difficulty(name: str) -> tuple[str, Optional[str]]:
+    """ "종막(노)" → ("종막", "normal") """
+    difficulty = None
+    match = _DIFF_PATTERN.search(name)
+    if match:
+        difficulty = DIFFICULTY_ALIASES.get((match.group(1) or match.group(2)).lower())
+        name = name[:match.start()] + name[match.end():]
+    return name, difficulty
+
+
+def gate_rewards(difficulty: dict) -> list[tuple[int, int]]:
+    """
+    난이도 항목 → 관문 순서대로 (클리어 골드, 더보기 비용)
+    관문별 보상이 없으면 gold_total 1관문으로
+
+    Example:
+        >>> gate_rewards(find_raid("발탄")["difficulties"]["hard"])
+        [(700, 450), (1100, 600)]
+    """
+    rewards = difficulty.get("rewards") or {}
+    gates   = sorted(rewards, key=lambda g: int(re.sub(r"\D", "", g) or 0))
+    if not gates:
+        return [(int(difficulty.get("gold_total") or 0), 0)] if difficulty.get("gold_total") else []
+    return [(int(rewards[g].get("gold") or 0), int(rewards[g].get("extra") or 0)) for g in gates]
+
+
+def _resolve(name: str) -> Optional[dict]:
+    rest, difficulty = _split_difficulty(name or "")
+    info = None
+    if difficulty is None:
+        info, difficulty = _split_prefix(rest)
+    info = info or find_raid(rest)   # 팀 번호("2팀", "B")는 접두 별칭 매칭에서 자연히 무시
+    if not info:
+        return None
+
+    diffs = info["difficulties"]
+    if difficulty not in diffs:
+        difficulty = "normal" if "normal" in diffs else next(iter(diffs), None)
+    diff = diffs.get(difficulty, {})
+    return {
+        **info,
+        "difficulty": difficulty,
+        "party_size": min(PARTY_MAX, info["capacity"]),
+        "gates":      diff.get("gates"),
+        "min_level":  diff.get("min_level"),
+        "gold":       diff.get("gold_total"),
+        "rewards":    gate_rewards(diff),
+    }
+
+
+def resolve_raid(name: str, guild_id: int = 0) -> Optional[dict]:
+    """
+    시트 레이드명 → 메타데이터 (길드별 메모)
+
+    Example:
+        >>> resolve_raid("종막(노)")["key"], resolve_raid("종막(노)")["difficulty"]
+        ('kazeros', 'normal')
+        >>> resolve_raid("카멘 하드 2팀")["capacity"]
+        8
+    """
+    memo = _MEMO.setdefault(guild_id, {})
+    if name not in memo:
+        memo[name] = _resolve(name)
+    return memo[name]
+
+
+def raid_fields(name: str, guild_id: int = 0) -> dict:
+    """시트 레이드 dict에 덧붙일 필드 (못 찾으면 빈 dict → 기존 기본값 유지)"""
+    meta = resolve_raid(name, guild_id)
+    if not meta:
+        return {}
+    return {
+        "raid_key":   meta["key"],
+        "raid_name":  meta["name"],
+        "category":   meta["category"],
+        "difficulty": meta["difficulty"],
+        "capacity":   meta["capacity"],
+        "party_size": meta["party_size"],
+        "gates":      meta["gates"],
+        "min_level":  meta["min_level"],
+        "gold":       meta["gold"],
+        "rewards":    meta["rewards"],
+        "act":        meta["act"],
+    }
+
+
+def clear_memo(guild_id: Optional[int] = None):
+    if guild_id is None:
+        _MEMO.clear()
+    else:
+        _MEMO.pop(guild_id, None)
@@ -68,28 +68,33 @@ def parse_cell(cell_value: str) -> dict:
     예: "홀나(폿)" → { raw, job, suffix, is_support, is_alt }
         "배마(부)"  → { raw, job, suffix, is_support, is_alt }
         "워로드"    → { raw, job, suffix=None, is_support=False, is_alt=False }
+        "바드+"     → { ..., bonus=True }  (끝의 + = 더보기 구매)
         "미참여"    → { raw, job=None, absent=True }
 
     Args:
         cell_value: 시트 셀 원본 값
 
     Returns:
-        dict with keys: raw, job, suffix, is_support, is_alt, absent
+        dict with keys: raw, job, suffix, is_support, is_alt, bonus, absent
     """
     raw = cell_value.strip()
 
     # 불참 처리
     if raw.lower() in ["미참여", "x", "", "none", "-"]:
         return {"raw": raw, "job": None, "suffix": None,
-                "is_support": False, "is_alt": False, "absent": True}
+                "is_support": False, "is_alt": False, "bonus": False, "absent": True}
+
+    # 더보기 표시: 바드+ / 홀나(폿)+
+    bonus = raw.endswith("+") and len(raw) > 1
+    body  = raw.rstrip("+").strip() if bonus else raw
 
     # 괄호 추출: 홀나(폿) → job=홀나, suffix=폿
-    match = re.match(r"^(.+?)\((.+?)\)$", raw)
+    match = re.match(r"^(.+?)\((.+?)\)$", body)
     if match:
         job_part    = match.group(1).strip()
         suffix_part = match.group(2).strip()
     else:
-        job_part    = raw
+        job_part    = body
         suffix_part = None
 
     # 서폿/딜/부캐 판별
@@ -107,6 +112,7 @@ def parse_cell(cell_value: str) -> dict:
         "suffix":      suffix_part,
         "is_support":  is_support,
         "is_alt":      is_alt,
+        "bonus":       bonus,
         "absent":      False,
     }
 
@@ -0,0 +1,253 @@
+"""
+로일(LoIl) - 길드 로스터 동기화
+연결된 길드원(member_link) + 시트 캐릭터 → 원정대/프로필 일괄 조회
+정규화된 로스터 테이블(SQLite)에 변경된 항목만 반영
+
+흐름:
+1. 연결된 길드원 시트 탭 이름 = 대표 캐릭터명으로 원정대(siblings) 조회
+2. 시트에 적힌 직업과 같은 직업 캐릭터만 프로필 재조회 (정확한 아이템 레벨)
+3. (이름, 직업, 아이템 레벨, 서버) 비교 후 바뀐 행만 UPSERT
+
+동시 요청 수는 ROSTER_SYNC_CONCURRENCY, 키별 분당 예산은 APIKeyManager가 제한
+"""
+
+import asyncio
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Optional
+
+from bot.config.settings import ROSTER_DB, ROSTER_SYNC_CONCURRENCY
+from bot.utils.lostark_api import (
+    APIStatus, get_siblings_result, get_character_info, parse_item_level
+)
+from bot.utils.member_link import get_linked_members, load_settings
+
+ProgressCallback = Callable[[str, int, int], Awaitable[None]]
+
+
+# ==================== 로스터 테이블 ====================
+
+class RosterStore:
+    """길드별 캐릭터 로스터 (SQLite)"""
+
+    FIELDS = ("owner", "class_name", "item_level", "server", "in_sheet")
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._lock   = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS roster ("
+                "  guild_id   TEXT NOT NULL,"
+                "  name       TEXT NOT NULL,"
+                "  owner      TEXT NOT NULL,"
+                "  class_name TEXT NOT NULL,"
+                "  item_level REAL NOT NULL,"
+                "  server     TEXT NOT NULL,"
+                "  in_sheet   INTEGER NOT NULL DEFAULT 0,"
+                "  updated_at REAL NOT NULL,"
+                "  PRIMARY KEY (guild_id, name)"
+                ")"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_roster_owner ON roster (guild_id, owner)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get_roster(self, guild_id: int) -> list[dict]:
+        """길드 전체 로스터 (아이템 레벨 내림차순)"""
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT * FROM roster WHERE guild_id = ? ORDER BY item_level DESC",
+                (str(guild_id),)
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+    def version(self, guild_id: int) -> tuple:
+        """로스터 변경 감지용 (행 수, 최종 갱신 시각) - 인덱스 재생성 판단"""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT COUNT(*), COALESCE(MAX(updated_at), 0) FROM roster WHERE guild_id = ?",
+                (str(guild_id),)
+            ).fetchone()
+        return tuple(row)
+
+    def apply(self, guild_id: int, entries: list[dict], owners: set[str]) -> dict:
+        """
+        동기화 결과 반영 - 변경된 행만 쓰기
+
+        Args:
+            entries: 정규화된 캐릭터 목록
+            owners:  이번에 조회 성공한 길드원 (이 길드원의 사라진 캐릭터만 삭제)
+
+        Returns:
+            { inserted, updated, unchanged, removed }
+        """
+        gid    = str(guild_id)
+        now    = time.time()
+        result = {"inserted": 0, "updated": 0, "unchanged": 0, "removed": 0}
+
+        with self._lock:
+            conn = self._connect()
+            existing = {
+                r["name"]: r for r in conn.execute(
+                    "SELECT * FROM roster WHERE guild_id = ?", (gid,)
+                ).fetchall()
+            }
+
+            seen = set()
+            for e in entries:
+                seen.add(e["name"])
+                old = existing.get(e["name"])
+                if old is None:
+                    result["inserted"] += 1
+                elif all(old[f] == e[f] for f in self.FIELDS):
+                    result["unchanged"] += 1
+                    continue
+                else:
+                    result["updated"] += 1
+                conn.execute(
+                    "INSERT OR REPLACE INTO roster "
+                    "(guild_id, name, owner, class_name, item_level, server, in_sheet, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (gid, e["name"], e["owner"], e["class_name"], e["item_level"],
+                     e["server"], e["in_sheet"], now)
+                )
+
+            for name, old in existing.items():
+                if name not in seen and old["owner"] in owners:
+                    conn.execute("DELETE FROM roster WHERE guild_id = ? AND name = ?", (gid, name))
+                    result["removed"] += 1
+
+            conn.commit()
+        return result
+
+
+roster_store = RosterStore(ROSTER_DB)
+
+
+# ==================== 시트 캐릭터 ====================
+
+def _sheet_jobs_by_member(guild_id: int) -> dict[str, set[str]]:
+    """시트 길드원별 표준 직업 집합 {시트이름: {직업, ...}}"""
+    url = load_settings().get(str(guild_id), {}).get("sheet_url", "")
+    if not url:
+        return {}
+
+    from bot.utils.sheets import get_all_data, get_members
+
+    data = get_all_data(url)
+    jobs: dict[str, set[str]] = {}
+    for m in get_members(data, guild_id):
+        jobs[m["name"]] = {
+            c["std_job"] for c in m["characters"].values() if c.get("std_job")
+        }
+    return jobs
+
+
+def _normalize(owner: str, char: dict, sheet_jobs: set[str]) -> dict:
+    """API 캐릭터 정보 → 로스터 행"""
+    class_name = char.get("CharacterClassName", "") or ""
+    return {
+        "name":       char.get("CharacterName", ""),
+        "owner":      owner,
+        "class_name": class_name,
+        "item_level": parse_item_level(char.get("ItemAvgLevel") or char.get("ItemMaxLevel")),
+        "server":     char.get("ServerName", "") or "",
+        "in_sheet":   int(class_name in sheet_jobs),
+    }
+
+
+# ==================== 동기화 ====================
+
+async def sync_guild_roster(guild_id: int, progress: Optional[ProgressCallback] = None) -> dict:
+    """
+    길드 로스터 일괄 동기화
+
+    Args:
+        guild_id: 길드 ID
+        progress: async (stage, done, total) 콜백 - 진행 상황 보고용
+
+    Returns:
+        { members, characters, inserted, updated, unchanged, removed,
+          failed: ["시트이름 (사유)"], stale: ["시트이름"] (API 불가로 캐시 데이터 사용 - 실패 아님) }
+    """
+    owners     = sorted(set(get_linked_members(guild_id).values()))
+    sheet_jobs = await asyncio.to_thread(_sheet_jobs_by_member, guild_id)
+    semaphore  = asyncio.Semaphore(ROSTER_SYNC_CONCURRENCY)
+
+    async def _limited(func, *args):
+        async with semaphore:
+            return await asyncio.to_thread(func, *args)
+
+    async def _run_stage(stage: str, jobs: list) -> list:
+        """동시 실행 + 완료될 때마다 진행률 보고"""
+        results = [None] * len(jobs)
+        done    = 0
+
+        async def _one(i, coro):
+            nonlocal done
+            results[i] = await coro
+            done += 1
+            if progress:
+                await progress(stage, done, len(jobs))
+
+        await asyncio.gather(*(_one(i, c) for i, c in enumerate(jobs)))
+        return results
+
+    # 1단계: 원정대 조회
+    siblings_list = await _run_stage(
+        "원정대", [_limited(get_siblings_result, owner, False) for owner in owners]
+    )
+
+    entries: dict[str, dict] = {}
+    ok_owners: set[str] = set()
+    failed: list[str] = []
+    stale:  list[str] = []
+    for owner, result in zip(owners, siblings_list):
+        siblings = result.data
+        if not siblings:
+            reason = "캐릭터 없음" if result.status == APIStatus.NOT_FOUND else "API 불가"
+            failed.append(f"{owner} ({reason})")
+            continue
+        if result.stale:
+            stale.append(owner)
+        ok_owners.add(owner)
+        jobs = sheet_jobs.get(owner, set())
+        for char in siblings:
+            entry = _normalize(owner, char, jobs)
+            if entry["name"]:
+                entries[entry["name"]] = entry
+
+    # 2단계: 시트 직업과 일치하는 캐릭터만 프로필 재조회
+    targets  = [e for e in entries.values() if e["in_sheet"]]
+    profiles = await _run_stage(
+        "프로필", [_limited(get_character_info, e["name"], False) for e in targets]
+    )
+    for entry, profile in zip(targets, profiles):
+        if profile:
+            level = parse_item_level(profile.get("ItemAvgLevel"))
+            if level:
+                entry["item_level"] = level
+
+    result = await asyncio.to_thread(roster_store.apply, guild_id, list(entries.values()), ok_owners)
+    return {
+        "members":    len(owners),
+        "characters": len(entries),
+        "failed":     failed,
+        "stale":      stale,
+        **result,
+    }
+
+
+def get_guild_roster(guild_id: int) -> list[dict]:
+    """저장된 로스터 조회"""
+    return roster_store.get_roster(guild_id)
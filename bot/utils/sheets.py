@@ -9,6 +9,7 @@ from typing import Optional
 from datetime import datetime
 from bot.config.settings import GOOGLE_CREDENTIALS_PATH
 from bot.utils.resolver import normalize_character, is_support
+from bot.utils.raid_meta import raid_fields
 
 SCOPE = [
     'https://spreadsheets.google.com/feeds',
@@ -54,10 +55,22 @@ def get_sheet_info(url: str) -> Optional[dict]:
 
 # ==================== 레이드 파싱 ====================
 
+def _parse_cleared(value) -> tuple[bool, int]:
+    """
+    클리어 칸 → (전체 클리어, 클리어한 관문 수)
+    TRUE → 전체, 숫자 n → n관문까지 (부분 클리어), 그 외 → 미클리어
+    """
+    text = str(value).strip().upper()
+    if text == "TRUE":
+        return True, 0
+    return False, int(text) if text.isdigit() else 0
+
+
 def parse_raids(data: list, guild_id: int = 0) -> list[dict]:
     """
     레이드 컬럼 파싱 (scheduled=TRUE인 것만)
-    Row 1=요일, 2=시간, 3=분, 4=예정여부, 5=클리어, 6=레이드명, 7=예상시간
+    Row 1=요일, 2=시간, 3=분, 4=예정여부, 5=클리어(TRUE / 관문 수), 6=레이드명, 7=예상시간
+    레이드명은 raid_meta로 raids.json과 연결 (category, difficulty, capacity, party_size, gold 등)
     """
     if not data or len(data) < 7:
         return []
@@ -83,7 +96,7 @@ def parse_raids(data: list, guild_id: int = 0) -> list[dict]:
         day     = row_day[col]     if col < len(row_day)     else "미정"
         hr_raw  = row_hour[col]    if col < len(row_hour)    else "0"
         mn_raw  = row_min[col]     if col < len(row_min)     else ":00"
-        cleared = str(row_cleared[col]).upper() == "TRUE" if col < len(row_cleared) else False
+        cleared, cleared_gates = _parse_cleared(row_cleared[col] if col < len(row_cleared) else "")
         dur_raw = row_duration[col] if col < len(row_duration) else "1"
 
         try:
@@ -106,7 +119,9 @@ def parse_raids(data: list, guild_id: int = 0) -> list[dict]:
             'time_str':  f"{hour}:{minute:02d}",
             'scheduled': scheduled,
             'cleared':   cleared,
+            'cleared_gates': cleared_gates,
             'duration':  dur_min,
+            **raid_fields(name, guild_id),
         })
 
     day_order = {'수':0,'목':1,'금':2,'토':3,'일':4,'월':5,'화':6,'미정':7}
@@ -137,7 +152,7 @@ def parse_all_raids(data: list, guild_id: int = 0) -> list[dict]:
         hr_raw  = row_hour[col]    if col < len(row_hour)    else "0"
         mn_raw  = row_min[col]     if col < len(row_min)     else ":00"
         scheduled = str(row_sched[col]).upper() == "TRUE" if col < len(row_sched) else False
-        cleared = str(row_cleared[col]).upper() == "TRUE" if col < len(row_cleared) else False
+        cleared, cleared_gates = _parse_cleared(row_cleared[col] if col < len(row_cleared) else "")
         dur_raw = row_duration[col] if col < len(row_duration) else "1"
 
         try:
@@ -160,7 +175,9 @@ def parse_all_raids(data: list, guild_id: int = 0) -> list[dict]:
             'time_str':  f"{hour}:{minute:02d}",
             'scheduled': scheduled,
             'cleared':   cleared,
+            'cleared_gates': cleared_gates,
             'duration':  dur_min,
+            **raid_fields(name, guild_id),
         })
 
     day_order = {'수':0,'목':1,'금':2,'토':3,'일':4,'월':5,'화':6,'미정':7}
@@ -204,6 +221,7 @@ def get_members(data: list, guild_id: int = 0) -> list[dict]:
                     "std_job":    parsed["std_job"],
                     "is_support": parsed["is_support"],
                     "is_alt":     parsed["is_alt"],
+                    "bonus":      parsed.get("bonus", False),
                     "display":    parsed["display"],
                 }
 
@@ -0,0 +1,264 @@
+"""
+로일(LoIl) - 시너지 점수 커널
+synergy_benefits.json / dps_types.json / supports.json 지식 베이스를 정수 비트마스크로 컴파일
+
+- 직업/각인 → 제공 시너지 비트마스크, 파티 커버리지 = 비트 OR
+- 마스크 → 가중치 합 표 (시너지 종류가 적어 전체 표를 미리 계산)
+- PartyKernel: 후보 길드원 목록을 한 번 컴파일 → 파티(멤버 인덱스 비트셋) 점수를 비트 연산으로 계산
+  · 서폿 수 = popcount(파티 & 서폿 비트셋)
+  · 사멸 페어링 = 길드원 쌍 호환 행렬 (행 i = i의 사멸을 받쳐주는 길드원 비트셋)
+  · score_many()로 후보 파티 묶음을 한 번에 평가 (키별 메모)
+
+party_optimizer / week_scheduler / synergy_ui 공용
+"""
+
+import re
+from typing import Iterable, Optional
+
+from bot.config.settings import ALIASES_DATA, DPS_TYPES_DATA, SUPPORTS_DATA, SYNERGY_BENEFITS_DATA
+
+SUPPORT_PENALTY   = 10.0  # 파티 서폿 수가 1에서 벗어난 만큼
+DUPLICATE_PENALTY = 1.0   # 중복 시너지 1건
+SMITE_BONUS       = 2.0   # 사멸 딜러 + 선호 제공자 같은 파티
+
+MUST_HAVE_WEIGHT  = 3.0
+NICE_WEIGHT       = 2.0
+BASE_WEIGHT       = 1.0
+
+_SUFFIX = re.compile(r"\((.+?)\)\s*$")
+_KEY_IN_PARENS = re.compile(r"\(([a-z_]+)\)")
+
+
+# ==================== 지식 베이스 컴파일 ====================
+
+class SynergyModel:
+    """시너지 키 → 비트, 직업/각인 → 시너지 마스크, 사멸 페어링 규칙"""
+
+    def __init__(self, benefits: dict, dps_data: dict, aliases: dict, supports: Optional[dict] = None):
+        types = benefits.get("synergy_types", {})
+        self.keys  = list(types)
+        self.names = [types[k].get("name", k) for k in self.keys]
+        self.bits  = {k: 1 << i for i, k in enumerate(self.keys)}
+
+        # 각인 약어/별명 → 정식 각인명
+        self.engravings: dict[str, str] = {}
+        for job in dps_data.get("jobs", {}).values():
+            for full, eng in job.get("engravings", {}).items():
+                self.engravings[full] = full
+                if eng.get("abbrev"):
+                    self.engravings[eng["abbrev"]] = full
+        for full, data in aliases.get("engravings", {}).items():
+            self.engravings[full] = full
+            for alias in (data.get("aliases", []) if isinstance(data, dict) else []):
+                self.engravings[alias] = full
+
+        # 직업 → 마스크 (각인 무관 합집합), (직업, 각인) → 마스크
+        self.job_mask: dict[str, int] = {}
+        self.engraving_mask: dict[tuple, int] = {}
+        for key, data in types.items():
+            for job, engs in data.get("providers", {}).items():
+                self.job_mask[job] = self.job_mask.get(job, 0) | self.bits[key]
+                for eng in (engs if isinstance(engs, list) else [engs]):
+                    pair = (job, self._engraving(eng))
+                    self.engraving_mask[pair] = self.engraving_mask.get(pair, 0) | self.bits[key]
+
+        # (직업, 서폿 여부) → 각인 (supports.json 하이브리드 직업)
+        # 시트엔 "홀나(폿)/(딜)"처럼 역할만 있어 시너지 표에 있는 역할 각인으로 좁힘
+        self.role_engravings: dict[tuple, str] = {}
+        for job, data in (supports or {}).get("hybrid_support", {}).items():
+            for support, field in ((True, "support_engravings"), (False, "dps_engravings")):
+                engs = [e for e in map(self._engraving, data.get(field, [])) if (job, e) in self.engraving_mask]
+                if len(engs) == 1:
+                    self.role_engravings[(job, support)] = engs[0]
+
+        # 마스크 → 가중치 합 (시너지 종류가 적어 전체 표를 미리 계산)
+        weights = self._weights(benefits.get("party_synergy_checklist", {}), types)
+        self.mask_weight = [
+            sum(w for i, w in enumerate(weights) if mask >> i & 1)
+            for mask in range(1 << len(self.keys))
+        ]
+
+        # 사멸 페어링: { "head"|"back": { jobs: [(직업, 각인 집합|None)], providers: [...] } }
+        smite = benefits.get("smite_synergy_pairing", {})
+        self.smite = {
+            kind: {
+                "jobs":      [self._job_rule(j) for j in smite.get(f"{kind}_smite_pairs", {}).get("jobs", [])],
+                "providers": [self._job_rule(j) for j in
+                              smite.get(f"{kind}_smite_pairs", {}).get("preferred_synergy_providers", [])],
+            }
+            for kind in ("head", "back")
+        }
+
+    def _engraving(self, name: str) -> str:
+        return self.engravings.get(name.strip(), name.strip())
+
+    def _job_rule(self, text: str) -> tuple[str, Optional[set]]:
+        """ "워로드(고독한 기사)" / "블레이드(버스트/잔재)" / "슬레이어" → (직업, 각인 집합 또는 None) """
+        match = _SUFFIX.search(text)
+        if not match:
+            return text.strip(), None
+        return text[:match.start()].strip(), {self._engraving(e) for e in match.group(1).split("/")}
+
+    def _weights(self, checklist: dict, types: dict) -> list[float]:
+        """8인 체크리스트 필수/권장 → 시너지별 가중치 ("이름 (key)" 형식, 괄호 없으면 이름으로 매칭)"""
+        def keys_of(entries) -> set:
+            found = set()
+            for entry in entries:
+                match = _KEY_IN_PARENS.search(entry)
+                if match and match.group(1) in self.bits:
+                    found.add(match.group(1))
+                    continue
+                found |= {k for k, d in types.items() if d.get("name") and d["name"] in entry}
+            return found
+
+        ideal = checklist.get("ideal_8man", {})
+        must  = keys_of(ideal.get("must_have", []))
+        nice  = keys_of(ideal.get("nice_to_have", []))
+        return [MUST_HAVE_WEIGHT if k in must else NICE_WEIGHT if k in nice else BASE_WEIGHT
+                for k in self.keys]
+
+    @staticmethod
+    def _matches(rule: tuple, job: str, engraving: Optional[str]) -> Optional[float]:
+        """규칙 일치도: 1.0(확실) / 0.5(각인 모름) / None(불일치)"""
+        rule_job, engs = rule
+        if rule_job != job:
+            return None
+        if engs is None:
+            return 1.0
+        if engraving is None:
+            return 0.5
+        return 1.0 if engraving in engs else None
+
+    def features(self, member: dict) -> "MemberFeatures":
+        job = member.get("std_job") or member.get("job") or ""
+        match = _SUFFIX.search(member.get("character") or "")
+        engraving = self.engravings.get(match.group(1).strip()) if match else None
+        engraving = member.get("engraving") or engraving
+        support   = bool(member.get("is_support"))
+        if engraving is None:
+            engraving = self.role_engravings.get((job, support))
+
+        if engraving and (job, engraving) in self.engraving_mask:
+            mask = self.engraving_mask[(job, engraving)]
+        elif engraving and any(j == job for j, _ in self.engraving_mask):
+            mask = 0   # 각인을 아는데 시너지 제공 각인이 아님
+        else:
+            mask = self.job_mask.get(job, 0)
+
+        smite_kind, smite_weight, provides = None, 0.0, set()
+        for kind, rules in self.smite.items():
+            if not support and smite_kind is None:
+                for rule in rules["jobs"]:
+                    weight = self._matches(rule, job, engraving)
+                    if weight:
+                        smite_kind, smite_weight = kind, weight
+                        break
+            if any(self._matches(rule, job, engraving) for rule in rules["providers"]):
+                provides.add(kind)
+
+        return MemberFeatures(mask, popcount(mask), support, smite_kind, smite_weight, provides)
+
+    def describe(self, mask: int) -> list[str]:
+        return [self.names[i] for i in bits_of(mask)]
+
+    def keys_of(self, mask: int) -> list[str]:
+        return [self.keys[i] for i in bits_of(mask)]
+
+
+class MemberFeatures:
+    """파티원 1명의 점수 계산용 특성"""
+
+    __slots__ = ("mask", "count", "support", "smite", "smite_weight", "provides")
+
+    def __init__(self, mask: int, count: int, support: bool, smite: Optional[str],
+                 smite_weight: float, provides: set):
+        self.mask         = mask
+        self.count        = count
+        self.support      = support
+        self.smite        = smite
+        self.smite_weight = smite_weight
+        self.provides     = provides
+
+
+_MODEL = SynergyModel(SYNERGY_BENEFITS_DATA, DPS_TYPES_DATA, ALIASES_DATA, SUPPORTS_DATA)
+
+
+def get_synergy_model() -> SynergyModel:
+    return _MODEL
+
+
+# ==================== 파티 점수 ====================
+
+def popcount(value: int) -> int:
+    return bin(value).count("1")
+
+
+def bits_of(key: int) -> list[int]:
+    """비트셋 → 켜진 비트 인덱스 목록"""
+    out = []
+    while key:
+        low = key & -key
+        out.append(low.bit_length() - 1)
+        key ^= low
+    return out
+
+
+class PartyKernel:
+    """
+    후보 길드원 목록 컴파일본 (파티 = 멤버 인덱스 비트셋 int)
+
+    Example:
+        >>> kernel = PartyKernel(members)
+        >>> kernel.score(0b1011)                  # 0, 1, 3번 길드원 파티
+        >>> kernel.score_many([0b0111, 0b1110])
+    """
+
+    def __init__(self, members: list, model: Optional[SynergyModel] = None):
+        self.model    = model or get_synergy_model()
+        self.feats    = [self.model.features(m) for m in members]
+        self.masks    = [f.mask for f in self.feats]
+        self.counts   = [f.count for f in self.feats]
+        self.supports = sum(1 << i for i, f in enumerate(self.feats) if f.support)
+        # 쌍 호환 행렬 (비트셋 행): partners[i]의 j 비트 = j가 i의 사멸 시너지 제공자
+        self.partners = [
+            sum(1 << j for j, g in enumerate(self.feats) if j != i and f.smite in g.provides) if f.smite else 0
+            for i, f in enumerate(self.feats)
+        ]
+        self.smite_gain = [SMITE_BONUS * f.smite_weight for f in self.feats]
+        self.smiters    = sum(1 << i for i, row in enumerate(self.partners) if row)
+        self.memo: dict[int, float] = {}
+
+    def coverage(self, key: int) -> int:
+        """파티 시너지 마스크 (OR)"""
+        mask = 0
+        for i in bits_of(key):
+            mask |= self.masks[i]
+        return mask
+
+    def duplicates(self, key: int) -> int:
+        """중복 제공 시너지 수 (비트 수 합 - OR 비트 수)"""
+        return sum(self.counts[i] for i in bits_of(key)) - popcount(self.coverage(key))
+
+    def smite_pairs(self, key: int) -> list[int]:
+        """파티 안에 사멸 제공자가 있는 사멸 딜러 인덱스"""
+        return [i for i in bits_of(key & self.smiters) if self.partners[i] & key]
+
+    def score(self, key: int) -> float:
+        value = self.memo.get(key)
+        if value is not None:
+            return value
+        mask = provided = 0
+        for i in bits_of(key):
+            mask     |= self.masks[i]
+            provided += self.counts[i]
+        value = self.model.mask_weight[mask] - DUPLICATE_PENALTY * (provided - popcount(mask))
+        value -= SUPPORT_PENALTY * abs(popcount(key & self.supports) - 1)
+        for i in bits_of(key & self.smiters):
+            if self.partners[i] & key:
+                value += self.smite_gain[i]
+        self.memo[key] = value
+        return value
+
+    def score_many(self, keys: Iterable[int]) -> list[float]:
+        """후보 파티 묶음 평가"""
+        return [self.score(k) for k in keys]
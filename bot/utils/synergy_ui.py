@@ -7,7 +7,8 @@ synergy_benefits.json 기반으로 클래스별 직업/각인 선택
 """
 
 import discord
-from bot.config.settings import SYNERGY_BENEFITS_DATA, JOBS_DATA
+from bot.config.settings import SYNERGY_BENEFITS_DATA, JOBS_DATA, ENGRAVINGS_DATA
+from bot.utils.synergy_kernel import get_synergy_model
 
 # ==================== 직업 선택지 생성 ====================
 
@@ -40,6 +41,32 @@ ENGRAVING_LABELS = {
     "aeromancer":   [("기상술사(질풍)", "wind_fury"),     ("기상술사(이슬)", "drizzle")],
 }
 
+# 선택지 각인 키 → 정식 각인명 (engravings.json 키/이름과 다른 것만)
+ENGRAVING_KEY_NAMES = {
+    "blessing_aura":   "은총의 오라",
+    "emperor":         "황제의 칙령",
+    "empress":         "황후의 은총",
+    "second_identity": "두 번째 동료",
+    "tactical_reload": "전술탄환",
+    "handgunner":      "핸드거너",
+}
+
+
+def _engraving_names() -> dict:
+    """engravings.json → { (직업키, 각인키): 각인명 }"""
+    names = {}
+    for class_data in ENGRAVINGS_DATA.values():
+        if not isinstance(class_data, dict):
+            continue
+        for job_key, job_data in class_data.get("jobs", {}).items():
+            for eng_key, eng in job_data.get("engravings", {}).items():
+                names[(job_key, eng_key)] = eng.get("name", eng_key)
+    return names
+
+
+ENGRAVING_NAMES = _engraving_names()
+
+
 def get_class_job_options() -> dict:
     """
     클래스별 선택지 생성
@@ -84,45 +111,43 @@ def get_synergies_for_selection(selected_values: list[str]) -> dict:
     반환: { synergy_type: { name, jobs: [label, ...], description } }
     """
     benefits  = SYNERGY_BENEFITS_DATA.get("synergy_types", {})
+    model     = get_synergy_model()
     result    = {}
 
-    # 선택값 → 표시명 역매핑
+    # 선택값 → 표시명 / 직업키 → 정식 직업명
     label_map = {}
     for class_data in CLASS_JOB_OPTIONS.values():
         for label, val in class_data["jobs"]:
             label_map[val] = label
+    job_names = {
+        job_key: job_data.get("name", job_key)
+        for class_data in JOBS_DATA.get("classes", {}).values()
+        for job_key, job_data in class_data.get("jobs", {}).items()
+    }
 
     for val in selected_values:
-        label = label_map.get(val, val)
-        job_key = val.split(":")[0]
-
-        # job_name 원본
-        job_name_raw = label.split("(")[0].strip()
-
-        # synergy_benefits providers 체크
-        for syn_key, syn_data in benefits.items():
-            providers = syn_data.get("providers", {})
-            matched   = False
-
-            # providers가 dict인 경우 (직업명: [각인들])
-            if isinstance(providers, dict):
-                for prov_job, prov_engs in providers.items():
-                    if prov_job in label or prov_job == job_name_raw:
-                        matched = True
-                        break
-            # providers가 list인 경우
-            elif isinstance(providers, list):
-                if job_name_raw in providers:
-                    matched = True
-
-            if matched:
-                if syn_key not in result:
-                    result[syn_key] = {
-                        "name":        syn_data.get("name", syn_key),
-                        "description": syn_data.get("description", ""),
-                        "jobs":        [],
-                    }
-                result[syn_key]["jobs"].append(label)
+        label    = label_map.get(val, val)
+        job_key, _, eng_key = val.partition(":")
+        job_name = job_names.get(job_key, label.split("(")[0].strip())
+
+        # 선택값 각인 키(holyknight:judgment) → 정식 각인명, 시너지 표에 없으면
+        # 표시명 괄호 안 각인 약어(고기/전태...), 그것도 모르면 직업 전체 마스크
+        member = {"std_job": job_name, "character": label}
+        if eng_key:
+            name = ENGRAVING_KEY_NAMES.get(eng_key) or ENGRAVING_NAMES.get((job_key, eng_key))
+            name = model.engravings.get(name, name)
+            if (job_name, name) in model.engraving_mask:
+                member["engraving"] = name
+        mask = model.features(member).mask
+        for syn_key in model.keys_of(mask):
+            syn_data = benefits.get(syn_key, {})
+            if syn_key not in result:
+                result[syn_key] = {
+                    "name":        syn_data.get("name", syn_key),
+                    "description": syn_data.get("description", ""),
+                    "jobs":        [],
+                }
+            result[syn_key]["jobs"].append(label)
 
     return result
 
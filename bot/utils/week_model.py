@@ -0,0 +1,140 @@
+"""
+로일(LoIl) - 주간 레이드 모델
+시트(주간레이드) → 레이드 시간대 + 길드원별 열 캐릭터
+week_scheduler의 입력. 레이드/길드원별 지문으로 바뀐 부분만 찾아 증분 재계산에 사용
+
+시간: 주 시작(수요일 0시)부터의 분 단위 [start, end)
+요일이 "미정"인 레이드는 시간 정보가 없어 겹침 판정에서 제외
+소요 시간: 클리어 기록이 충분하면 시트 값 대신 실측 p90 (clear_stats.expected_durations)
+"""
+
+import hashlib
+import json
+import re
+from typing import Iterable, Optional
+
+from bot.config.settings import SCHEDULER_RAID_CAPACITY
+from bot.utils.sheets import get_members, parse_all_raids
+
+DAY_ORDER = {'수': 0, '목': 1, '금': 2, '토': 3, '일': 4, '월': 5, '화': 6}
+
+_GROUP_SUFFIX = re.compile(r"\s*(\d+\s*(팀|파티|조|공대)?|[A-Za-z])$")
+
+
+def _fingerprint(value) -> str:
+    raw = json.dumps(value, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:12]
+
+
+def raid_key(name: str) -> str:
+    """
+    같은 레이드 판별용 키 (팀 번호 제거) - raids.json에 없는 레이드명용
+    "카멘 하드 1팀" / "카멘 하드 2" → "카멘하드"
+    """
+    return _GROUP_SUFFIX.sub("", (name or "").strip()).replace(" ", "").lower()
+
+
+class WeekModel:
+    """
+    주간 레이드 + 길드원 캐릭터
+
+    Attributes:
+        raids:   { col: { col, name, day, hour, minute, duration, start, end, capacity, key, ... } }
+        members: { 길드원명: { col: { raw, job, std_job, is_support, is_alt, display } } }
+    """
+
+    def __init__(self, raids: list[dict], members: list[dict], absences: Iterable[str] = (),
+                 durations: Optional[dict[int, int]] = None):
+        """
+        Args:
+            durations: { col: 분 } 시트 소요 시간 대신 쓸 값 (실측 통계)
+        """
+        absent    = set(absences)
+        durations = durations or {}
+        self.raids: dict[int, dict] = {}
+        for raid in raids:
+            day      = DAY_ORDER.get(raid.get('day'))
+            start    = None if day is None else day * 1440 + raid.get('hour', 0) * 60 + raid.get('minute', 0)
+            duration = durations.get(raid['col'], raid.get('duration', 30))
+            self.raids[raid['col']] = {
+                **raid,
+                'start':    start,
+                'end':      None if start is None else start + max(duration, 1),
+                'capacity': raid.get('capacity') or SCHEDULER_RAID_CAPACITY,
+                'key':      raid.get('raid_key') or raid_key(raid.get('name', '')),
+            }
+
+        self.members: dict[str, dict[int, dict]] = {}
+        for m in members:
+            if m.get('absent') or m['name'] in absent:
+                continue
+            chars = {col: c for col, c in m.get('characters', {}).items() if col in self.raids}
+            if chars:
+                self.members[m['name']] = chars
+
+    @classmethod
+    def from_sheet(cls, data: list, guild_id: int = 0, cols: Optional[Iterable[int]] = None,
+                   absences: Iterable[str] = ()) -> "WeekModel":
+        """
+        시트 데이터 → 모델
+
+        Args:
+            cols: 포함할 레이드 열 (None이면 전체)
+            absences: 이번 주 불참 길드원
+        """
+        from bot.utils.clear_stats import clear_stats
+
+        raids = parse_all_raids(data, guild_id)
+        if cols is not None:
+            wanted = set(cols)
+            raids  = [r for r in raids if r['col'] in wanted]
+        return cls(raids, get_members(data, guild_id), absences,
+                   durations=clear_stats.expected_durations(guild_id, raids))
+
+    # ==================== 제약 조회 ====================
+
+    def overlaps(self, a: int, b: int) -> bool:
+        """두 레이드 시간대가 겹치는지 (시간 미정이면 False)"""
+        ra, rb = self.raids[a], self.raids[b]
+        if ra['start'] is None or rb['start'] is None:
+            return False
+        return ra['start'] < rb['end'] and rb['start'] < ra['end']
+
+    def character_key(self, name: str, col: int) -> tuple:
+        """같은 캐릭터 판별 (길드원, 직업, 부캐 여부) - 시트엔 캐릭터명이 없어 직업 기준"""
+        char = self.members[name][col]
+        return name, char.get('std_job') or char.get('raw'), bool(char.get('is_alt'))
+
+    def member_entry(self, name: str, col: int) -> dict:
+        """편성용 길드원 dict (party_optimizer / gemini_ai 입력 형식)"""
+        char = self.members[name][col]
+        return {
+            'name':       name,
+            'character':  char['raw'],
+            'std_job':    char.get('std_job'),
+            'is_support': char['is_support'],
+            'is_alt':     char.get('is_alt', False),
+        }
+
+    # ==================== 변경 감지 ====================
+
+    def fingerprints(self) -> dict[tuple, str]:
+        """{ ("raid", col) | ("member", 이름): 지문 }"""
+        prints = {("raid", col): _fingerprint({k: r.get(k) for k in ('name', 'start', 'end', 'capacity')})
+                  for col, r in self.raids.items()}
+        prints.update({("member", name): _fingerprint(chars) for name, chars in self.members.items()})
+        return prints
+
+    def diff(self, other: "WeekModel") -> dict[str, set]:
+        """
+        다른 모델과 달라진 부분
+
+        Returns:
+            { 'raids': {col}, 'members': {이름} }  (추가/삭제/변경 모두 포함)
+        """
+        mine, theirs = self.fingerprints(), other.fingerprints()
+        changed = {k for k in mine.keys() | theirs.keys() if mine.get(k) != theirs.get(k)}
+        return {
+            'raids':   {k[1] for k in changed if k[0] == "raid"},
+            'members': {k[1] for k in changed if k[0] == "member"},
+        }
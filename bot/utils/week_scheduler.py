@@ -0,0 +1,283 @@
+"""
+로일(LoIl) - 주간 멀티 레이드 배정 (중복 배정 방지)
+선택한 레이드 전체를 한 번에 풀어 길드원을 레이드별로 배정
+
+제약 (어기는 배정은 만들지 않음):
+- 같은 길드원은 시간이 겹치는 두 레이드에 못 들어감
+- 같은 캐릭터는 같은 레이드(팀 번호 무시)를 한 번만, 주간 WEEKLY_CHARACTER_RAID_LIMIT회까지
+- 레이드 정원 (capacity)
+
+점수 (높을수록 좋음):
+- 배정 1건당 ASSIGN_GAIN → 가능한 한 많이 배정하는 것이 최우선
+- 서폿 수가 4인당 1명에서 벗어난 만큼 감점
+- 레이드 전체 시너지 커버리지 (synergy_kernel의 마스크 가중치)
+- 이전 결과와 같은 배정 유지 시 가점 (재계산 시 결과가 크게 흔들리지 않게)
+
+탐색: 한계 이득 순 탐욕 배정 → 막힌 배정을 위해 기존 배정을 빼는 개선 이동 → 다시 채우기
+증분: 길드별 마지막 모델/결과를 보관, 입력이 같으면 그대로 반환하고
+      바뀌었으면 바뀌지 않은 레이드·길드원의 기존 배정을 출발점으로 다시 풂
+"""
+
+import math
+import time
+from typing import Optional
+
+from bot.config.settings import WEEKLY_CHARACTER_RAID_LIMIT, SCHEDULER_BUDGET_MS
+from bot.utils.synergy_kernel import get_synergy_model
+from bot.utils.week_model import WeekModel
+
+ASSIGN_GAIN     = 10.0  # 배정 1건
+SUPPORT_PENALTY = 4.0   # 서폿 수가 ceil(인원/4)에서 벗어난 만큼
+SYNERGY_WEIGHT  = 0.5   # 시너지 커버리지 가중치 합에 곱함
+STABILITY_BONUS = 1.0   # 이전 결과와 같은 배정
+
+REASONS = {
+    'overlap':  "시간 겹침",
+    'repeat':   "같은 레이드 중복",
+    'limit':    "주간 횟수 초과",
+    'capacity': "정원 초과",
+}
+
+
+# ==================== 풀이 상태 ====================
+
+class _State:
+    """배정 상태 + 레이드별 점수 캐시"""
+
+    def __init__(self, model: WeekModel, previous: Optional[dict] = None):
+        self.model    = model
+        self.previous = previous or {}
+        self.synergy  = get_synergy_model()
+        self.feats    = {
+            (name, col): self.synergy.features(model.member_entry(name, col))
+            for name, chars in model.members.items() for col in chars
+        }
+        self.raid_members: dict[int, set] = {col: set() for col in model.raids}
+        self.member_raids: dict[str, set] = {name: set() for name in model.members}
+        self.char_raids:   dict[tuple, set] = {}
+        self.raid_score:   dict[int, float] = {col: 0.0 for col in model.raids}
+
+    # ── 점수 ──
+
+    def score_of(self, col: int, names) -> float:
+        if not names:
+            return 0.0
+        mask = supports = 0
+        for name in names:
+            f = self.feats[(name, col)]
+            mask     |= f.mask
+            supports += f.support
+        kept  = len(self.previous.get(col, set()) & set(names))
+        score = ASSIGN_GAIN * len(names) + STABILITY_BONUS * kept
+        score -= SUPPORT_PENALTY * abs(supports - math.ceil(len(names) / 4))
+        return score + SYNERGY_WEIGHT * self.synergy.mask_weight[mask]
+
+    @property
+    def total(self) -> float:
+        return sum(self.raid_score.values())
+
+    # ── 제약 ──
+
+    def blockers(self, name: str, col: int) -> tuple[Optional[str], set]:
+        """
+        (name → col) 배정을 막는 사유와 원인 레이드
+
+        Returns:
+            (None, ∅) 배정 가능 / ('capacity', ∅) / (사유, 빼야 하는 기존 배정 열)
+        """
+        if name in self.raid_members[col]:
+            return 'assigned', set()
+        model = self.model
+        ckey  = model.character_key(name, col)
+        key   = model.raids[col]['key']
+        for other in self.member_raids[name]:
+            if model.overlaps(col, other):
+                return 'overlap', {o for o in self.member_raids[name] if model.overlaps(col, o)}
+        same = {o for o in self.char_raids.get(ckey, ()) if model.raids[o]['key'] == key}
+        if same:
+            return 'repeat', same
+        if len(self.char_raids.get(ckey, ())) >= WEEKLY_CHARACTER_RAID_LIMIT:
+            return 'limit', set(self.char_raids[ckey])
+        if len(self.raid_members[col]) >= model.raids[col]['capacity']:
+            return 'capacity', set()
+        return None, set()
+
+    def gain(self, name: str, col: int) -> float:
+        return self.score_of(col, self.raid_members[col] | {name}) - self.raid_score[col]
+
+    # ── 변경 ──
+
+    def add(self, name: str, col: int):
+        self.raid_members[col].add(name)
+        self.member_raids[name].add(col)
+        self.char_raids.setdefault(self.model.character_key(name, col), set()).add(col)
+        self.raid_score[col] = self.score_of(col, self.raid_members[col])
+
+    def remove(self, name: str, col: int):
+        self.raid_members[col].discard(name)
+        self.member_raids[name].discard(col)
+        self.char_raids.get(self.model.character_key(name, col), set()).discard(col)
+        self.raid_score[col] = self.score_of(col, self.raid_members[col])
+
+    def candidates(self):
+        """아직 배정되지 않은 (길드원, 레이드) 쌍"""
+        for name, chars in self.model.members.items():
+            for col in chars:
+                if col not in self.member_raids[name]:
+                    yield name, col
+
+
+# ==================== 탐색 ====================
+
+def _fill(state: _State, deadline: float):
+    """한계 이득이 가장 큰 배정부터 더 이상 이득이 없을 때까지"""
+    while time.perf_counter() < deadline:
+        best, best_gain = None, 0.0
+        for name, col in state.candidates():
+            if state.blockers(name, col)[0] is not None:
+                continue
+            gain = state.gain(name, col)
+            if gain > best_gain or (gain == best_gain and best and (col, name) < (best[1], best[0])):
+                best, best_gain = (name, col), gain
+        if best is None:
+            return
+        state.add(*best)
+
+
+def _improve(state: _State, deadline: float) -> bool:
+    """
+    막힌 배정 1건을 위해 원인 배정을 빼고 넣은 뒤 다시 채워 총점이 오르면 유지
+    정원 초과는 해당 레이드의 다른 길드원 1명과 맞바꿈
+    """
+    improved = False
+    for name, col in list(state.candidates()):
+        if time.perf_counter() >= deadline:
+            break
+        reason, drop = state.blockers(name, col)
+        if reason in (None, 'assigned'):
+            continue
+        if reason == 'capacity':
+            options = [{(other, col)} for other in sorted(state.raid_members[col])]
+        elif reason == 'limit':
+            options = [{(name, o)} for o in sorted(drop)]
+        else:
+            options = [{(name, o) for o in drop}]
+
+        for removals in options:
+            before = state.total
+            snapshot = {c: set(m) for c, m in state.raid_members.items()}
+            for n, c in removals:
+                state.remove(n, c)
+            if state.blockers(name, col)[0] is None:
+                state.add(name, col)
+                _fill(state, deadline)
+                if state.total > before + 1e-9:
+                    improved = True
+                    break
+            _restore(state, snapshot)
+    return improved
+
+
+def _restore(state: _State, snapshot: dict):
+    for col in list(state.raid_members):
+        for name in state.raid_members[col] - snapshot[col]:
+            state.remove(name, col)
+    for col, names in snapshot.items():
+        for name in names - state.raid_members[col]:
+            state.add(name, col)
+
+
+def _warm_start(state: _State, previous: dict, model: WeekModel, changed: dict):
+    """이전 배정 중 바뀌지 않은 레이드·길드원, 아직 유효한 것만 다시 넣음"""
+    for col in sorted(previous):
+        if col not in model.raids or col in changed['raids']:
+            continue
+        for name in sorted(previous[col]):
+            if name in changed['members'] or col not in model.members.get(name, {}):
+                continue
+            if state.blockers(name, col)[0] is None:
+                state.add(name, col)
+
+
+# ==================== 스케줄러 ====================
+
+class WeekScheduler:
+    """
+    길드별 주간 배정기 (마지막 결과 보관 → 증분 재계산)
+
+    Example:
+        >>> model  = WeekModel.from_sheet(data, guild_id, cols=[r['col'] for r in selected])
+        >>> result = week_scheduler.solve(guild_id, model)
+        >>> result['assignments'][col]   # [{name, character, std_job, is_support, is_alt}, ...]
+    """
+
+    def __init__(self):
+        self._last: dict[int, tuple[WeekModel, dict, dict]] = {}
+
+    def solve(self, guild_id: int, model: WeekModel, time_budget_ms: float = SCHEDULER_BUDGET_MS) -> dict:
+        """
+        선택한 레이드 전체 배정
+
+        Returns:
+            {
+                'assignments': { col: [길드원 dict, ...] },
+                'unassigned':  { col: [(이름, 사유), ...] },
+                'score':       float,
+                'changes':     { col: {'added': [이름], 'removed': [이름]} },  # 이전 결과 대비
+                'reused':      bool,   # 입력이 같아 이전 결과를 그대로 반환
+            }
+        """
+        last = self._last.get(guild_id)
+        if last:
+            changed = model.diff(last[0])
+            if not changed['raids'] and not changed['members']:
+                return {**last[2], 'changes': {}, 'reused': True}
+            previous = last[1]
+        else:
+            changed, previous = {'raids': set(), 'members': set()}, {}
+
+        deadline = time.perf_counter() + time_budget_ms / 1000
+        state    = _State(model, previous)
+        _warm_start(state, previous, model, changed)
+        _fill(state, deadline)
+        while time.perf_counter() < deadline and _improve(state, deadline):
+            pass
+
+        assigned = {col: set(names) for col, names in state.raid_members.items()}
+        result   = {
+            'assignments': {
+                col: [model.member_entry(n, col) for n in sorted(names)]
+                for col, names in assigned.items()
+            },
+            'unassigned':  self._unassigned(state),
+            'score':       round(state.total, 2),
+            'changes':     {},
+            'reused':      False,
+        }
+        if last:
+            result['changes'] = {
+                col: {'added': sorted(names - previous.get(col, set())),
+                      'removed': sorted(previous.get(col, set()) - names)}
+                for col, names in assigned.items()
+                if names != previous.get(col, set())
+            }
+        self._last[guild_id] = (model, assigned, result)
+        return result
+
+    @staticmethod
+    def _unassigned(state: _State) -> dict[int, list[tuple[str, str]]]:
+        """배정되지 못한 길드원과 사유 (시간 겹침이면 겹친 레이드명 포함)"""
+        out: dict[int, list] = {}
+        for name, col in sorted(state.candidates(), key=lambda p: (p[1], p[0])):
+            reason, drop = state.blockers(name, col)
+            text = REASONS.get(reason, "점수 미달")
+            if drop:
+                text += ": " + ", ".join(state.model.raids[c].get('name', '') for c in sorted(drop))
+            out.setdefault(col, []).append((name, text))
+        return out
+
+    def forget(self, guild_id: int):
+        self._last.pop(guild_id, None)
+
+
+week_scheduler = WeekScheduler()